@@ -0,0 +1,269 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Times the cirq protocols of the gates in openfermioncirq.gates.
+
+Usage:
+    python -m dev_tools.benchmark_gates [--output results.json]
+        [--compare baseline.json] [--threshold 1.25] [--repeat 3]
+        [--filter substring]
+
+Each benchmark calls one protocol (unitary, decompose, resolve_parameters,
+eigen_components or circuit_diagram_info) on one gate, either with concrete
+values or with sympy symbols, and records the best time per call over
+several repetitions. Some gates cache the results of these protocols in
+module-level functools.lru_caches. For those gates, the caches are cleared
+before every timed call, which gives the "cold" timing, and the call is also
+timed with the caches left in place, which gives a separate "warm" entry.
+The results are written as JSON together with the git commit and the
+versions of the main dependencies, so that runs of different commits can be
+compared with --compare. The exit code is nonzero if any benchmark is slower
+than the baseline by more than the threshold.
+"""
+
+from typing import (Any, Callable, Dict, Iterator, List, Optional, Tuple,
+                    Type)
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+import numpy
+import sympy
+
+import cirq
+import openfermioncirq as ofc
+from openfermioncirq.gates.fermionic_simulation import (
+    InteractionOperatorFermionicGate)
+
+# The default number of times each benchmark is timed; the fastest time is
+# kept.
+REPEAT = 3
+
+
+def gate_instances() -> Iterator[Tuple[str, str, cirq.Gate]]:
+    """Yields (gate name, input kind, gate) for every public gate class.
+
+    The input kind is 'concrete' or 'parameterized', the latter meaning that
+    the exponent is a sympy symbol.
+    """
+    t = sympy.Symbol('t')
+    weights = {
+        ofc.QuadraticFermionicSimulationGate: (0.3 + 0.2j, -0.7),
+        ofc.CubicFermionicSimulationGate: (0.1j, -0.4 + 0.5j, 0.2),
+        ofc.QuarticFermionicSimulationGate: (0.3 + 0.1j, -0.6, 0.5j),
+    }  # type: Dict[Type[InteractionOperatorFermionicGate], Tuple]
+    for gate_type in (ofc.FSwapPowGate, ofc.XXYYPowGate, ofc.YXXYPowGate,
+                      ofc.CXXYYPowGate, ofc.CYXXYPowGate,
+                      ofc.DoubleExcitationGate):
+        yield gate_type.__name__, 'concrete', gate_type(exponent=0.37)
+        yield gate_type.__name__, 'parameterized', gate_type(exponent=t)
+    for gate_type, concrete_weights in weights.items():
+        yield (gate_type.__name__, 'concrete',
+               gate_type(concrete_weights, exponent=0.37))
+        yield (gate_type.__name__, 'parameterized',
+               gate_type(concrete_weights, exponent=t))
+
+
+def protocol_calls(gate: cirq.Gate) -> Iterator[Tuple[str, Callable[[], Any]]]:
+    """Yields (protocol name, call) for the protocols the gate supports."""
+    qubits = cirq.LineQubit.range(gate.num_qubits())
+    parameterized = cirq.is_parameterized(gate)
+    if not parameterized:
+        yield 'unitary', lambda: cirq.unitary(gate)
+    if cirq.decompose_once_with_qubits(gate, qubits, None) is not None:
+        yield 'decompose', lambda: cirq.decompose_once_with_qubits(
+            gate, qubits)
+    if parameterized:
+        resolver = cirq.ParamResolver({'t': 0.37})
+        yield 'resolve_parameters', lambda: cirq.resolve_parameters(
+            gate, resolver)
+    if isinstance(gate, cirq.EigenGate):
+        # pylint: disable=protected-access
+        yield 'eigen_components', gate._eigen_components
+    args = cirq.CircuitDiagramInfoArgs(known_qubits=qubits,
+                                       known_qubit_count=len(qubits),
+                                       use_unicode_characters=True,
+                                       precision=3,
+                                       qubit_map=None)
+    yield 'circuit_diagram_info', lambda: cirq.circuit_diagram_info(gate, args)
+
+
+def gate_caches(gate: cirq.Gate) -> List[Callable[[], None]]:
+    """The cache_clear methods of the caches in the gate's module."""
+    module = sys.modules[type(gate).__module__]
+    return [
+        value.cache_clear
+        for value in vars(module).values()
+        if callable(getattr(value, 'cache_clear', None))
+    ]
+
+
+def time_call(call: Callable[[], Any],
+              repeat: int = REPEAT,
+              clear_caches: Optional[List[Callable[[], None]]] = None
+             ) -> Tuple[float, int]:
+    """Returns the best time per call in seconds and the calls per repeat.
+
+    If cache_clear methods are given, they are called before every call, and
+    the time spent clearing the caches is not counted.
+    """
+    if not clear_caches:
+        timer = timeit.Timer(call)
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=repeat, number=number))
+        return best / number, number
+
+    def cold_time(number: int) -> float:
+        total = 0.
+        for _ in range(number):
+            for cache_clear in clear_caches:
+                cache_clear()
+            start = time.perf_counter()
+            call()
+            total += time.perf_counter() - start
+        return total
+
+    # Choose the number of calls as timeit.Timer.autorange does
+    number = 1
+    while True:
+        for factor in (1, 2, 5):
+            if cold_time(number * factor) >= 0.2:
+                number *= factor
+                break
+        else:
+            number *= 10
+            continue
+        break
+    best = min(cold_time(number) for _ in range(repeat))
+    return best / number, number
+
+
+def run_benchmarks(name_filter: str = '',
+                   repeat: int = REPEAT) -> List[Dict[str, Any]]:
+    """Times every protocol of every gate whose name contains the filter."""
+    results = []
+    for gate_name, kind, gate in gate_instances():
+        caches = gate_caches(gate)
+        for protocol, call in protocol_calls(gate):
+            for cache in ('cold', 'warm') if caches else ('cold',):
+                name = '{}.{}.{}.{}'.format(gate_name, protocol, kind, cache)
+                if name_filter not in name:
+                    continue
+                seconds, number = time_call(
+                    call, repeat, caches if cache == 'cold' else None)
+                results.append({
+                    'name': name,
+                    'gate': gate_name,
+                    'protocol': protocol,
+                    'inputs': kind,
+                    'cache': cache,
+                    'seconds': seconds,
+                    'number': number,
+                    'repeat': repeat,
+                })
+    return results
+
+
+def environment() -> Dict[str, Optional[str]]:
+    """The commit and versions that the timings depend on."""
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                         stderr=subprocess.DEVNULL,
+                                         universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'date': datetime.datetime.utcnow().isoformat(),
+        'machine': platform.machine(),
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'sympy': sympy.__version__,
+        'cirq': cirq.__version__,
+        'openfermioncirq': ofc.__version__,
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any],
+            threshold: float) -> List[str]:
+    """Prints the ratio of each time to the baseline.
+
+    Returns:
+        The names of the benchmarks that are slower than the baseline by more
+        than the threshold.
+    """
+    baseline_seconds = {
+        result['name']: result['seconds'] for result in baseline['benchmarks']
+    }
+    regressions = []
+    for result in results:
+        old = baseline_seconds.get(result['name'])
+        if old is None:
+            continue
+        ratio = result['seconds'] / old
+        flag = ''
+        if ratio > threshold:
+            regressions.append(result['name'])
+            flag = '  REGRESSION'
+        print('{:<60} {:>10.3g}s {:>7.2f}x{}'.format(result['name'],
+                                                     result['seconds'], ratio,
+                                                     flag))
+    return regressions
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        description='Time the cirq protocols of the openfermioncirq gates.')
+    parser.add_argument('--output',
+                        help='The JSON file to write the results to.')
+    parser.add_argument('--compare',
+                        help='A JSON file written by an earlier run.')
+    parser.add_argument('--threshold',
+                        type=float,
+                        default=1.25,
+                        help='The slowdown relative to the baseline that '
+                        'counts as a regression.')
+    parser.add_argument('--repeat',
+                        type=int,
+                        default=REPEAT,
+                        help='The number of times to time each benchmark.')
+    parser.add_argument('--filter',
+                        default='',
+                        help='Only run benchmarks whose name contains this.')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.filter, args.repeat)
+    report = {'environment': environment(), 'benchmarks': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print('{} regression(s) above {}x.'.format(len(regressions),
+                                                       args.threshold))
+            return 1
+    elif not args.output:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -31,9 +31,14 @@ from openfermioncirq.gates import (
     QuadraticFermionicSimulationGate,
     CubicFermionicSimulationGate,
     QuarticFermionicSimulationGate,
+    SparseInteractionOperator,
 )
 
 from openfermioncirq.primitives import (
+    FuseSwapNetworkGates,
+    GivensNetwork,
+    apply_givens_network,
+    bogoliubov_givens_network,
     ffft,
     prepare_gaussian_state,
     prepare_slater_determinant,
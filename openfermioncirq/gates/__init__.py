@@ -42,6 +42,9 @@ from openfermioncirq.gates.fermionic_simulation import (
     QuarticFermionicSimulationGate,
 )
 
+from openfermioncirq.gates.sparse_interaction_operator import (
+    SparseInteractionOperator,)
+
 from openfermioncirq.gates.four_qubit_gates import (
     DoubleExcitation,
     DoubleExcitationGate,
@@ -0,0 +1,60 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Helpers for applying the unitaries of gates in place."""
+
+import numpy as np
+import cirq
+
+
+def apply_global_phase(args: cirq.ApplyUnitaryArgs, exponent: float,
+                       global_shift: float) -> None:
+    """Multiplies the target tensor by the phase of an EigenGate's shift."""
+    if global_shift:
+        args.target_tensor *= np.exp(1j * np.pi * exponent * global_shift)
+
+
+def apply_to_state_pair(args: cirq.ApplyUnitaryArgs, x: int, y: int,
+                        diagonal: complex, upper: complex,
+                        lower: complex) -> np.ndarray:
+    """Applies a 2x2 unitary to the amplitudes of two basis states in place.
+
+    The amplitudes (ψ_x, ψ_y) are replaced by
+
+        (diagonal·ψ_x + upper·ψ_y, lower·ψ_x + diagonal·ψ_y)
+
+    using slices of args.available_buffer as scratch space, and the
+    amplitudes of all other basis states are left unchanged.
+
+    Args:
+        args: The arguments of the _apply_unitary_ call.
+        x: The first basis state, as a big-endian integer.
+        y: The second basis state, as a big-endian integer.
+        diagonal: The diagonal entries of the unitary.
+        upper: The entry mapping ψ_y into the new ψ_x.
+        lower: The entry mapping ψ_x into the new ψ_y.
+
+    Returns:
+        args.target_tensor.
+    """
+    target = args.target_tensor
+    buffer = args.available_buffer
+    x_index = args.subspace_index(big_endian_bits_int=x)
+    y_index = args.subspace_index(big_endian_bits_int=y)
+
+    buffer[x_index] = target[x_index]
+    np.multiply(target[y_index], upper, out=buffer[y_index])
+    target[x_index] *= diagonal
+    target[x_index] += buffer[y_index]
+    np.multiply(buffer[x_index], lower, out=buffer[x_index])
+    target[y_index] *= diagonal
+    target[y_index] += buffer[x_index]
+    return target
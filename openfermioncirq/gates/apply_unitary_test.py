@@ -0,0 +1,48 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import numpy as np
+import cirq
+
+from openfermioncirq.gates.apply_unitary import (apply_global_phase,
+                                                apply_to_state_pair)
+
+
+def _args(state):
+    target = state.reshape((2, 2, 2)).astype(np.complex128)
+    return cirq.ApplyUnitaryArgs(target_tensor=target,
+                                 available_buffer=np.empty_like(target),
+                                 axes=(0, 2))
+
+
+def test_apply_to_state_pair():
+    state = np.arange(8) + 1j
+    args = _args(state)
+    result = apply_to_state_pair(args, 0b01, 0b10, 0.5, 2j, -3)
+
+    matrix = np.eye(4, dtype=complex)
+    matrix[1:3, 1:3] = [[0.5, 2j], [-3, 0.5]]
+    expected = cirq.targeted_left_multiply(matrix.reshape((2,) * 4),
+                                           state.reshape((2, 2, 2)),
+                                           target_axes=(0, 2))
+    assert result is args.target_tensor
+    np.testing.assert_allclose(result, expected)
+
+
+def test_apply_global_phase():
+    state = np.arange(8) + 1j
+    args = _args(state)
+    apply_global_phase(args, 0.5, 0)
+    np.testing.assert_allclose(args.target_tensor.reshape(8), state)
+    apply_global_phase(args, 0.5, -0.5)
+    np.testing.assert_allclose(args.target_tensor.reshape(8),
+                               state * np.exp(-0.25j * np.pi))
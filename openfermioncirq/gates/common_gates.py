@@ -19,6 +19,9 @@ import sympy
 import cirq
 import deprecation
 
+from openfermioncirq.gates.apply_unitary import (apply_global_phase,
+                                                apply_to_state_pair)
+
 
 class FSwapPowGate(cirq.EigenGate, cirq.InterchangeableQubitsGate,
                    cirq.TwoQubitGate):
@@ -64,16 +67,25 @@ class FSwapPowGate(cirq.EigenGate, cirq.InterchangeableQubitsGate,
 
     def _apply_unitary_(self,
                         args: cirq.ApplyUnitaryArgs) -> Optional[np.ndarray]:
-        if self.exponent != 1:
-            return None
-
-        oi = args.subspace_index(0b01)
-        io = args.subspace_index(0b10)
-        ii = args.subspace_index(0b11)
-        args.available_buffer[oi] = args.target_tensor[oi]
-        args.target_tensor[oi] = args.target_tensor[io]
-        args.target_tensor[io] = args.available_buffer[oi]
-        args.target_tensor[ii] *= -1
+        if cirq.is_parameterized(self):
+            return NotImplemented
+
+        if self.exponent == 1 and not self._global_shift:
+            oi = args.subspace_index(0b01)
+            io = args.subspace_index(0b10)
+            ii = args.subspace_index(0b11)
+            args.available_buffer[oi] = args.target_tensor[oi]
+            args.target_tensor[oi] = args.target_tensor[io]
+            args.target_tensor[io] = args.available_buffer[oi]
+            args.target_tensor[ii] *= -1
+            return args.target_tensor
+
+        apply_global_phase(args, self._exponent, self._global_shift)
+        phase = np.exp(1j * np.pi * self._exponent)
+        apply_to_state_pair(args, 0b01, 0b10, (1 + phase) / 2,
+                            (1 - phase) / 2, (1 - phase) / 2)
+        args.target_tensor[args.subspace_index(big_endian_bits_int=0b11)] *= (
+            phase)
         return args.target_tensor
 
     def _circuit_diagram_info_(self, args: cirq.CircuitDiagramInfoArgs
@@ -148,14 +160,11 @@ class XXYYPowGate(cirq.EigenGate, cirq.InterchangeableQubitsGate,
     def _apply_unitary_(self,
                         args: cirq.ApplyUnitaryArgs) -> Optional[np.ndarray]:
         if cirq.is_parameterized(self):
-            return None
-        inner_matrix = cirq.unitary(cirq.rx(self.exponent * np.pi))
-        oi = args.subspace_index(0b01)
-        io = args.subspace_index(0b10)
-        return cirq.apply_matrix_to_slices(args.target_tensor,
-                                           inner_matrix,
-                                           slices=[oi, io],
-                                           out=args.available_buffer)
+            return NotImplemented
+        apply_global_phase(args, self._exponent, self._global_shift)
+        c = np.cos(np.pi * self._exponent / 2)
+        s = np.sin(np.pi * self._exponent / 2)
+        return apply_to_state_pair(args, 0b01, 0b10, c, -1j * s, -1j * s)
 
     def _decompose_(self, qubits):
         a, b = qubits
@@ -227,14 +236,11 @@ class YXXYPowGate(cirq.EigenGate, cirq.TwoQubitGate):
     def _apply_unitary_(self,
                         args: cirq.ApplyUnitaryArgs) -> Optional[np.ndarray]:
         if cirq.is_parameterized(self):
-            return None
-        inner_matrix = cirq.unitary(cirq.ry(-self.exponent * np.pi))
-        oi = args.subspace_index(0b01)
-        io = args.subspace_index(0b10)
-        return cirq.apply_matrix_to_slices(args.target_tensor,
-                                           inner_matrix,
-                                           slices=[oi, io],
-                                           out=args.available_buffer)
+            return NotImplemented
+        apply_global_phase(args, self._exponent, self._global_shift)
+        c = np.cos(np.pi * self._exponent / 2)
+        s = np.sin(np.pi * self._exponent / 2)
+        return apply_to_state_pair(args, 0b01, 0b10, c, -s, s)
 
     def _decompose_(self, qubits):
         a, b = qubits
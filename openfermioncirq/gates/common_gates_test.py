@@ -57,7 +57,10 @@ def test_fswap_matrix():
                   [0, 0.5 - 0.5j, 0.5 + 0.5j, 0], [0, 0, 0, 1j]]))
 
     cirq.testing.assert_has_consistent_apply_unitary_for_various_exponents(
-        val=ofc.FSWAP, exponents=[1])
+        val=ofc.FSWAP, exponents=[1, -1, 0.5, 0.25, -0.3, sympy.Symbol('s')])
+    for exponent in [1, 0.5, -0.3]:
+        cirq.testing.assert_has_consistent_apply_unitary(
+            ofc.FSwapPowGate(exponent=exponent, global_shift=0.4))
 
 
 @deprecated_test
@@ -106,6 +109,8 @@ def test_xxyy_matrix():
         ofc.XXYY,
         exponents=[1, -0.5, 0.5, 0.25, -0.25, 0.1,
                    sympy.Symbol('s')])
+    cirq.testing.assert_has_consistent_apply_unitary(
+        ofc.XXYYPowGate(exponent=0.3, global_shift=-0.5))
 
     np.testing.assert_allclose(cirq.unitary(ofc.XXYYPowGate(exponent=2)),
                                np.array([[1, 0, 0, 0], [0, -1, 0, 0],
@@ -183,6 +188,8 @@ def test_yxxy_matrix():
         ofc.YXXY,
         exponents=[1, -0.5, 0.5, 0.25, -0.25, 0.1,
                    sympy.Symbol('s')])
+    cirq.testing.assert_has_consistent_apply_unitary(
+        ofc.YXXYPowGate(exponent=0.3, global_shift=-0.5))
 
     np.testing.assert_allclose(cirq.unitary(ofc.YXXYPowGate(exponent=2)),
                                np.array([[1, 0, 0, 0], [0, -1, 0, 0],
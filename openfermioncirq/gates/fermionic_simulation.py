@@ -11,8 +11,12 @@
 #   limitations under the License.
 
 import abc
-import itertools
-from typing import (cast, Dict, Optional, Sequence, Tuple, TYPE_CHECKING, Union)
+import cmath
+import collections
+import functools
+import hashlib
+from typing import (Any, Callable, cast, Dict, Iterable, Iterator, List,
+                    Optional, Sequence, Tuple, Type, TYPE_CHECKING, Union)
 
 import cirq
 import numpy as np
@@ -20,6 +24,9 @@ import openfermion
 import scipy.linalg as la
 import sympy
 
+from openfermioncirq.gates.sparse_interaction_operator import (
+    SparseInteractionOperator)
+
 if TYPE_CHECKING:
     import openfermioncirq as ofc
 
@@ -42,6 +49,211 @@ def _canonicalize_weight(w):
                      (abs(w) % period) * w / abs(w), 8), 0)
 
 
+_UNITARY_CACHE_SIZE = 256
+
+
+def _swap_block(weight: complex, exponent: float) -> np.ndarray:
+    """exp(-i t [[0, w], [w*, 0]]) for weight w and exponent t."""
+    angle = abs(weight) * exponent
+    phase = np.exp(1j * np.angle(weight))
+    return np.array([[np.cos(angle), -1j * np.sin(angle) * phase],
+                     [-1j * np.sin(angle) * phase.conjugate(),
+                      np.cos(angle)]])
+
+
+@functools.lru_cache(maxsize=_UNITARY_CACHE_SIZE)
+def _quadratic_unitary(weights: Tuple[complex, complex], exponent: float,
+                       global_shift: float) -> np.ndarray:
+    unitary = np.zeros((4, 4), dtype=np.complex128)
+    unitary[0, 0] = 1
+    unitary[np.ix_((2, 1), (2, 1))] = _swap_block(weights[0], exponent)
+    unitary[3, 3] = np.exp(-1j * exponent * weights[1])
+    unitary *= np.exp(1j * np.pi * exponent * global_shift)
+    return unitary
+
+
+@functools.lru_cache(maxsize=_UNITARY_CACHE_SIZE)
+def _cubic_unitary(weights: Tuple[complex, complex, complex], exponent: float,
+                   global_shift: float) -> np.ndarray:
+    # The generator acts on span(|011⟩, |101⟩, |110⟩)
+    generator = np.zeros((3, 3), dtype=np.complex128)
+    for (i, j), w in zip([(2, 1), (2, 0), (1, 0)], weights):
+        generator[i, j] = w
+        generator[j, i] = w.conjugate()
+    eig_vals, eig_vecs = np.linalg.eigh(generator)
+    block = (eig_vecs * np.exp(-1j * exponent * eig_vals)) @ eig_vecs.T.conj()
+
+    unitary = np.diag(np.ones(8, dtype=np.complex128))
+    unitary[np.ix_((3, 5, 6), (3, 5, 6))] = block
+    unitary *= np.exp(1j * np.pi * exponent * global_shift)
+    return unitary
+
+
+@functools.lru_cache(maxsize=_UNITARY_CACHE_SIZE)
+def _quartic_unitary(weights: Tuple[complex, complex, complex], exponent: float,
+                     global_shift: float) -> np.ndarray:
+    unitary = np.diag(np.ones(16, dtype=np.complex128))
+    for pair, w in zip([(0b1001, 0b0110), (0b1010, 0b0101), (0b1100, 0b0011)],
+                       weights):
+        unitary[np.ix_(pair, pair)] = _swap_block(w, exponent)
+    unitary *= np.exp(1j * np.pi * exponent * global_shift)
+    return unitary
+
+
+# The basis change in QuarticFermionicSimulationGate._decompose_, as
+# (gate, qubit indices)
+_QUARTIC_BASIS_CHANGE = (
+    (cirq.CNOT, (1, 0)),
+    (cirq.CNOT, (2, 1)),
+    (cirq.CNOT, (3, 2)),
+    (cirq.CNOT, (2, 1)),
+    (cirq.CNOT, (1, 0)),
+    (cirq.CNOT, (0, 1)),
+    (cirq.CNOT, (1, 2)),
+    (cirq.CNOT, (0, 1)),
+    (cirq.X, (2,)),
+    (cirq.X, (3,)),
+    (cirq.CNOT, (2, 3)),
+    (cirq.CNOT, (3, 2)),
+    (cirq.X, (2,)),
+    (cirq.X, (3,)),
+)
+
+# The doubly-controlled rotations in QuarticFermionicSimulationGate._decompose_;
+# integers stand for the weight-dependent controlled rotations V0, ..., V3
+_QUARTIC_CONTROLLED_ROTATIONS = (
+    (0, (1, 2)),
+    (cirq.CNOT, (0, 1)),
+    (1, (1, 2)),
+    (cirq.CNOT, (1, 0)),
+    (cirq.CNOT, (0, 1)),
+    (2, (1, 2)),
+    (cirq.CNOT, (0, 1)),
+    (3, (1, 2)),
+)
+
+
+@functools.lru_cache(maxsize=_UNITARY_CACHE_SIZE)
+def _quartic_controlled_rotations(weights: Tuple[complex, complex, complex],
+                                  exponent: float
+                                 ) -> Tuple[Tuple[cirq.Gate, ...],
+                                            Tuple[cirq.Gate, ...]]:
+    """The controlled rotations V0, ..., V3 and their inverses.
+
+    See QuarticFermionicSimulationGate._decompose_. All of the rotations are
+    in SU(2), so their products, inverses and square roots have closed forms.
+    """
+    identity = np.eye(2)
+    angle = 0.5 * exponent
+    individual_rotations = []
+    for s, w in zip([1, -1, -1], weights):
+        # M² = |w|² I, so expm(i α M) = cos(α |w|) I + i sin(α |w|) M / |w|
+        generator = np.array([[np.real(w), 1j * s * np.imag(w)],
+                              [-1j * s * np.imag(w), -np.real(w)]])
+        individual_rotations.append(
+            np.cos(angle * abs(w)) * identity +
+            1j * angle * np.sinc(angle * abs(w) / np.pi) * generator)
+
+    product = np.linalg.multi_dot([
+        individual_rotations[1].conj().T, individual_rotations[0],
+        individual_rotations[2]
+    ])
+    # The principal square root of V in SU(2) is (V + I) / sqrt(2 + tr V)
+    trace = np.real(np.trace(product))
+    if 2 + trace > 1e-12:
+        square_root = (product + identity) / np.sqrt(2 + trace)
+    else:  # coverage: ignore
+        square_root = la.sqrtm(product)
+
+    combined_rotations = [
+        square_root,
+        np.linalg.inv(square_root),
+        np.linalg.multi_dot([
+            individual_rotations[0].conj().T, individual_rotations[1],
+            square_root
+        ]),
+        individual_rotations[0],
+    ]
+    rotations = tuple(
+        cirq.ControlledGate(cirq.MatrixGate(matrix, qid_shape=(2,)))
+        for matrix in combined_rotations)
+    return rotations, tuple(cirq.inverse(gate) for gate in rotations)
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    array = np.asarray(array)
+    array.setflags(write=False)
+    return array
+
+
+def _read_only(components: Iterable[Tuple[Any, np.ndarray]]
+              ) -> Tuple[Tuple[Any, np.ndarray], ...]:
+    return tuple(
+        (exponent_factor, _frozen(projector))
+        for exponent_factor, projector in components)
+
+
+# The eigen-components of the fermionic simulation gates are cached by their
+# weights. Each weight is a separate argument so that typed=True keeps, e.g.,
+# the integer weight 1 and the complex weight 1 + 0j apart.
+_QUADRATIC_ZERO_COMPONENT = _frozen(np.diag([1, 0, 0, 0]))
+_QUADRATIC_DOUBLE_OCCUPANCY = _frozen(np.diag([0, 0, 0, 1]))
+
+
+@functools.lru_cache(maxsize=_UNITARY_CACHE_SIZE, typed=True)
+def _quadratic_eigen_components(w0, w1) -> Tuple[Tuple[Any, np.ndarray], ...]:
+    components = [(0, _QUADRATIC_ZERO_COMPONENT),
+                  (-w1 / np.pi, _QUADRATIC_DOUBLE_OCCUPANCY)]
+    r = abs(w0) / np.pi
+    theta = 2 * _arg(w0) / np.pi
+    for s in (-1, 1):
+        components.append(
+            (-s * r,
+             np.array([[0, 0, 0, 0], [0, 1, s * 1j**(-theta), 0],
+                       [0, s * 1j**(theta), 1, 0], [0, 0, 0, 0]]) / 2))
+    return _read_only(components)
+
+
+_CUBIC_ZERO_COMPONENT = _frozen(np.diag([1, 1, 1, 0, 1, 0, 0, 1]))
+_CUBIC_NONTRIVIAL_INDICES = np.array([3, 5, 6], dtype=np.intp)
+
+
+@functools.lru_cache(maxsize=_UNITARY_CACHE_SIZE, typed=True)
+def _cubic_eigen_components(*weights) -> Tuple[Tuple[Any, np.ndarray], ...]:
+    components = [(0, _CUBIC_ZERO_COMPONENT)]
+    nontrivial_part = np.zeros((3, 3), dtype=np.complex128)
+    for ij, w in zip([(1, 2), (0, 2), (0, 1)], weights):
+        nontrivial_part[ij] = w
+        nontrivial_part[ij[::-1]] = w.conjugate()
+    assert np.allclose(nontrivial_part, nontrivial_part.conj().T)
+    eig_vals, eig_vecs = np.linalg.eigh(nontrivial_part)
+    for eig_val, eig_vec in zip(eig_vals, eig_vecs.T):
+        exp_factor = -eig_val / np.pi
+        proj = np.zeros((8, 8), dtype=np.complex128)
+        proj[_CUBIC_NONTRIVIAL_INDICES[:, np.newaxis],
+             _CUBIC_NONTRIVIAL_INDICES] = np.outer(eig_vec.conjugate(), eig_vec)
+        components.append((exp_factor, proj))
+    return _read_only(components)
+
+
+# The projector onto the subspace spanned by basis states with Hamming weight
+# other than 2
+_QUARTIC_ZERO_COMPONENT = _frozen(
+    np.diag([int(bin(i).count('1') != 2) for i in range(16)]))
+_QUARTIC_STATE_PAIRS = (('0110', '1001'), ('0101', '1010'), ('0011', '1100'))
+
+
+@functools.lru_cache(maxsize=_UNITARY_CACHE_SIZE, typed=True)
+def _quartic_eigen_components(*weights) -> Tuple[Tuple[Any, np.ndarray], ...]:
+    plus_minus_components = tuple(
+        (-abs(weight) * sign / np.pi,
+         state_swap_eigen_component(state_pair[0], state_pair[1], sign,
+                                    np.angle(weight)))
+        for weight, state_pair in zip(weights, _QUARTIC_STATE_PAIRS)
+        for sign in (-1, 1))
+    return ((0, _QUARTIC_ZERO_COMPONENT),) + _read_only(plus_minus_components)
+
+
 def state_swap_eigen_component(x: str, y: str, sign: int = 1, angle: float = 0):
     """The +/- eigen-component of the operation that swaps states x and y.
 
@@ -53,6 +265,10 @@ def state_swap_eigen_component(x: str, y: str, sign: int = 1, angle: float = 0):
         │0, 0,           0,            0│
         └                               ┘
 
+    The component for angle 0 is computed once for each (x, y, sign) and
+    shared between calls; for other angles only the two off-diagonal entries
+    of a copy of it are set. The returned array is read-only.
+
     Args:
         x: The first state to swap, as a bitstring.
         y: The second state to swap, as a bitstring. Must have high index than
@@ -70,6 +286,21 @@ def state_swap_eigen_component(x: str, y: str, sign: int = 1, angle: float = 0):
             * sign is not -1 or 1
         TypeError: x or y is not a string
     """
+    component, i, j = _state_swap_base_component(x, y, sign)
+    if not angle:
+        return component
+    phase = sign * 0.5 * cmath.exp(1j * angle)
+    component = component.copy()
+    component[j, i] = phase
+    component[i, j] = phase.conjugate()
+    component.flags.writeable = False
+    return component
+
+
+@functools.lru_cache(maxsize=None)
+def _state_swap_base_component(x: str, y: str,
+                               sign: int) -> Tuple[np.ndarray, int, int]:
+    """The read-only angle-0 eigen-component and the indices of x and y."""
     if not (isinstance(x, str) and isinstance(y, str)):
         raise TypeError('not (isinstance(x, str) and isinstance(y, str))')
     if len(x) != len(y):
@@ -86,13 +317,13 @@ def state_swap_eigen_component(x: str, y: str, sign: int = 1, angle: float = 0):
 
     component = np.zeros((dim, dim), dtype=np.complex128)
     component[i, i] = component[j, j] = 0.5
-    component[j, i] = sign * 0.5 * 1j**(angle * 2 / np.pi)
-    component[i, j] = sign * 0.5 * 1j**(-angle * 2 / np.pi)
-    return component
+    component[j, i] = component[i, j] = sign * 0.5
+    return _frozen(component), i, j
 
 
 def fermionic_simulation_gates_from_interaction_operator(
-        operator: openfermion.InteractionOperator):
+        operator: Union[openfermion.InteractionOperator,
+                        SparseInteractionOperator]):
     r"""
     Given $H = \sum_{I \subset [n]} H_I$, returns gates
     $\left\{G_I\right\} = \left\{e^{i H_I\right\}$.
@@ -100,40 +331,160 @@ def fermionic_simulation_gates_from_interaction_operator(
     Each term $H_I$ is the sum of all terms in $H$ that involve exactly the
     orbitals $I$.
 
+    The subsets of modes with nonzero terms are found by vectorized masking
+    of the operator's tensors rather than by visiting every subset, so the
+    running time grows with the number of nonzero coefficients. The weights
+    are cached per operator (keyed on a hash of its coefficients); each call
+    returns newly constructed gates.
+
+    A SparseInteractionOperator is converted in time linear in its number of
+    terms, without caching.
+
     Args:
         operator: The interaction operator ($H$).
 
     Returns: A dict from tuples of mode indices to gates.
     """
-    n_qubits = operator.n_qubits
+    if isinstance(operator, SparseInteractionOperator):
+        return _gates_from_sparse_interaction_operator(operator)
+
+    key = _interaction_operator_fingerprint(operator)
+    terms = _gate_weights_cache.get(key)
+    if terms is None:
+        terms = _interaction_operator_gate_weights(operator)
+        _gate_weights_cache[key] = terms
+        if len(_gate_weights_cache) > _GATE_WEIGHTS_CACHE_SIZE:
+            _gate_weights_cache.popitem(last=False)
+    else:
+        _gate_weights_cache.move_to_end(key)
 
     gates: Dict[Tuple[int, ...], cirq.Gate] = {}
+    for modes, gate_type, weights in terms:
+        if gate_type is None:
+            gates[modes] = weights
+        elif gate_type is cirq.ZPowGate:
+            gates[modes] = cirq.Z**(weights / np.pi)
+        else:
+            gates[modes] = gate_type(weights)
+    return gates
 
+
+def _gates_from_sparse_interaction_operator(
+        operator: SparseInteractionOperator
+) -> Dict[Tuple[int, ...], cirq.Gate]:
+    # Each term contributes to the gate on the modes it involves
+    subsets = {
+        tuple(sorted(set(indices)))
+        for indices, coefficient in operator.terms.items()
+        if indices and coefficient != 0
+    }
+    gate_types: Dict[int, Type[InteractionOperatorFermionicGate]] = {
+        2: QuadraticFermionicSimulationGate,
+        3: CubicFermionicSimulationGate,
+        4: QuarticFermionicSimulationGate,
+    }
+
+    gates: Dict[Tuple[int, ...], cirq.Gate] = {}
     if operator.constant:
-        gates[()] = operator.constant
-    for p in range(n_qubits):
-        coeff = operator.one_body_tensor[p, p]
+        gates[()] = cast(cirq.Gate, operator.constant)
+    for modes in sorted(m for m in subsets if len(m) == 1):
+        coeff = operator.one_body_tensor[modes * 2]
         if coeff:
-            gates[(p,)] = cirq.Z**(coeff / np.pi)
-    for modes in itertools.combinations(range(n_qubits), 2):
-        gate: Optional[InteractionOperatorFermionicGate] = (
-            QuadraticFermionicSimulationGate.from_interaction_operator(
-                operator=operator, modes=modes))
-        if gate:
-            gates[modes] = gate
-    for modes in itertools.combinations(range(n_qubits), 3):
-        gate = CubicFermionicSimulationGate.from_interaction_operator(
-            operator=operator, modes=modes)
-        if gate:
-            gates[modes] = gate
-    for modes in itertools.combinations(range(n_qubits), 4):
-        gate = QuarticFermionicSimulationGate.from_interaction_operator(
-            operator=operator, modes=modes)
-        if gate:
-            gates[modes] = gate
+            gates[modes] = cirq.Z**(coeff / np.pi)
+    for n_modes, gate_type in gate_types.items():
+        mode_subsets = sorted(m for m in subsets if len(m) == n_modes)
+        if mode_subsets:
+            gates.update(
+                gate_type.gates_from_weights(
+                    mode_subsets,
+                    gate_type.weights_from_interaction_operator(
+                        operator=operator, modes=mode_subsets)))
     return gates
 
 
+_GATE_WEIGHTS_CACHE_SIZE = 32
+
+_gate_weights_cache: 'collections.OrderedDict[bytes, List[Tuple]]' = (
+    collections.OrderedDict())
+
+
+def _interaction_operator_fingerprint(
+        operator: openfermion.InteractionOperator) -> bytes:
+    """A hash of the coefficients of an interaction operator."""
+    digest = hashlib.sha1(repr(complex(operator.constant)).encode())
+    for tensor in (operator.one_body_tensor, operator.two_body_tensor):
+        tensor = np.ascontiguousarray(tensor)
+        digest.update(repr((tensor.dtype.str, tensor.shape)).encode())
+        digest.update(tensor.data)
+    return digest.digest()
+
+
+def _interaction_operator_gate_weights(
+        operator: openfermion.InteractionOperator) -> List[Tuple]:
+    """The nonzero terms of an interaction operator, grouped by modes.
+
+    Returns:
+        A list of tuples (modes, gate_type, weights), ordered as the gates are
+        in `fermionic_simulation_gates_from_interaction_operator`. The
+        gate_type is None for the constant and cirq.ZPowGate for the number
+        terms, whose weight is the coefficient.
+    """
+    one_body = np.asarray(operator.one_body_tensor)
+    two_body = np.asarray(operator.two_body_tensor)
+    n_modes = operator.n_qubits
+    terms: List[Tuple] = []
+
+    if operator.constant:
+        terms.append(((), None, operator.constant))
+    for p in np.flatnonzero(np.diagonal(one_body)):
+        terms.append(((int(p),), cirq.ZPowGate, one_body[p, p]))
+
+    # antisymmetrized[p, q, r, s] = V[pqrs] - V[pqsr] - V[qprs] + V[qpsr],
+    # computed in the same order as in the from_interaction_operator methods
+    antisymmetrized = (two_body - two_body.transpose(0, 1, 3, 2) -
+                       two_body.transpose(1, 0, 2, 3) +
+                       two_body.transpose(1, 0, 3, 2))
+
+    # Quadratic terms involve T[p, q], T[q, p] and V restricted to {p, q}
+    pairs = _sorted_mode_subsets(
+        np.argwhere((one_body != 0) | (np.einsum('pqpq->pq', two_body) != 0) |
+                    (np.einsum('pqqp->pq', two_body) != 0)), n_modes)
+    # Cubic weights are ±antisymmetrized[p, q, p, r]
+    triples = _sorted_mode_subsets(
+        np.argwhere(np.einsum('pqpr->pqr', antisymmetrized) != 0), n_modes)
+    quadruples = _sorted_mode_subsets(np.argwhere(antisymmetrized != 0),
+                                      n_modes)
+
+    for gate_type, modes in ((QuadraticFermionicSimulationGate, pairs),
+                             (CubicFermionicSimulationGate, triples),
+                             (QuarticFermionicSimulationGate, quadruples)):
+        if len(modes):
+            weights = gate_type.weights_from_interaction_operator(
+                operator=operator, modes=modes)
+            terms.extend(_nonzero_terms(modes, weights, gate_type))
+
+    return terms
+
+
+def _sorted_mode_subsets(indices: np.ndarray, n_modes: int) -> np.ndarray:
+    """The distinct sorted rows of indices that have no repeated modes.
+
+    The rows are returned in lexicographic order.
+    """
+    indices = np.sort(indices, axis=1)
+    indices = indices[np.all(np.diff(indices, axis=1) != 0, axis=1)]
+    subsets = np.zeros((n_modes,) * indices.shape[1], dtype=bool)
+    subsets[tuple(indices.T)] = True
+    return np.argwhere(subsets)
+
+
+def _nonzero_terms(modes: np.ndarray, weights: np.ndarray,
+                   gate_type: type) -> List[Tuple]:
+    mask = np.any(weights != 0, axis=1)
+    return [(tuple(int(m) for m in subset), gate_type, tuple(row))
+            for subset, row in zip(modes[mask], weights[mask])]
+
+
 def sum_of_interaction_operator_gate_generators(
         n_modes: int,
         gates: Dict[Tuple[int, ...], Union[float, cirq.Gate]],
@@ -159,19 +510,37 @@ def sum_of_interaction_operator_gate_generators(
     Returns:
         The interaction operator.
     """
+    return sparse_sum_of_interaction_operator_gate_generators(
+        gates).to_interaction_operator(n_modes)
+
+
+def sparse_sum_of_interaction_operator_gate_generators(
+        gates: Dict[Tuple[int, ...], Union[float, cirq.Gate]],
+) -> SparseInteractionOperator:
+    """Like `sum_of_interaction_operator_gate_generators`, but returns a
+    SparseInteractionOperator.
+
+    This takes time linear in the number of gates.
+
+    Args:
+        gates: The gates.
+
+    Returns:
+        The sum of the generators of the gates.
+    """
     # assumes gate indices in JW order
-    operator = openfermion.InteractionOperator.zero(n_modes)
+    operator = SparseInteractionOperator()
 
     for indices, gate in gates.items():
         if not indices:
-            operator.constant += gate
+            operator.add_term((), cast(complex, gate))
         elif isinstance(gate, cirq.ZPowGate):
             coeff = gate._exponent * np.pi
-            operator.constant += gate._exponent * gate._global_shift * np.pi
-            operator.one_body_tensor[indices * 2] += coeff
+            operator.add_term((), gate._exponent * gate._global_shift * np.pi)
+            operator.add_term(indices * 2, coeff)
         elif isinstance(gate, InteractionOperatorFermionicGate):
-            gate.interaction_operator_generator(operator=operator,
-                                                modes=indices)
+            operator += gate.sparse_interaction_operator_generator(
+                modes=indices)
         else:
             raise TypeError(f'Gate type {gate} not supported.')
 
@@ -283,6 +652,29 @@ class ParityPreservingFermionicGate(cirq.Gate, metaclass=abc.ABCMeta):
                           exponent=resolved_exponent,
                           global_shift=resolved_global_shift)
 
+    def _shared_eigen_components(self, eigen_components: Callable
+                                ) -> List[Tuple[Any, np.ndarray]]:
+        """The eigen-components of the gate, shared between gates.
+
+        The eigen-components depend only on the weights, so gates that differ
+        in their exponent or global shift, such as the gates obtained by
+        resolving a gate with a symbolic exponent, share them. The projectors
+        are read-only.
+
+        Args:
+            eigen_components: A function of the weights returning the
+                eigen-components, wrapped in functools.lru_cache.
+        """
+        if any(cirq.is_parameterized(w) for w in self.weights):
+            return list(
+                eigen_components.__wrapped__(*self.weights))  # type: ignore
+        return list(eigen_components(*self.weights))
+
+    def _unitary_cache_key(self) -> Tuple:
+        """The weights, exponent and global shift as hashable numbers."""
+        return (tuple(complex(w) for w in self.weights), float(self._exponent),
+                float(self._global_shift))
+
     def _value_equality_values_(self):
         return tuple(
             _canonicalize_weight(w * self.exponent)
@@ -369,23 +761,110 @@ class InteractionOperatorFermionicGate(ParityPreservingFermionicGate):
         """Constructs the gate corresponding to the specified term in the
         Hamiltonian."""
 
+    @classmethod
+    @abc.abstractmethod
+    def weights_from_interaction_operator(
+            cls,
+            *,
+            operator: Union[openfermion.InteractionOperator,
+                            SparseInteractionOperator],
+            modes: Union[np.ndarray, Sequence[Sequence[int]]],
+    ) -> np.ndarray:
+        """The weights of the gates on many sets of modes at once.
+
+        The coefficients are read from the operator's tensors by fancy
+        indexing, so no gates are constructed. Use `gates_from_weights` to
+        construct the gates with nonzero weights.
+
+        Args:
+            operator: The interaction operator.
+            modes: An array with one row of mode indices per gate.
+
+        Returns:
+            An array with one row of weights per row of modes, such that
+            `cls.from_interaction_operator(operator=operator, modes=modes[i])`
+            has weights `weights[i]`.
+        """
+
+    @classmethod
+    def gates_from_weights(
+            cls, modes: Union[np.ndarray, Sequence[Sequence[int]]],
+            weights: np.ndarray
+    ) -> Iterator[Tuple[Tuple[int, ...], 'InteractionOperatorFermionicGate']]:
+        """Lazily constructs the gates with nonzero weights.
+
+        Args:
+            modes: An array with one row of mode indices per gate.
+            weights: An array with one row of weights per gate, as returned
+                by `weights_from_interaction_operator`.
+
+        Yields:
+            Pairs (modes, gate), with the modes as a tuple of ints, for the
+            rows of weights that are not all zero.
+        """
+        modes = np.asarray(modes)
+        for row in np.flatnonzero(np.any(weights != 0, axis=1)):
+            yield (tuple(int(mode) for mode in modes[row]),
+                   cls(tuple(weights[row])))
+
+    @classmethod
+    def _from_interaction_operator_weights(
+            cls, operator: openfermion.InteractionOperator,
+            modes: Sequence[int]
+    ) -> Optional['InteractionOperatorFermionicGate']:
+        weights = cls.weights_from_interaction_operator(operator=operator,
+                                                        modes=[modes])[0]
+        if any(weights):
+            return cls(tuple(weights))
+        return None
+
     def interaction_operator_generator(
             self,
             *,
             operator: Optional[openfermion.InteractionOperator] = None,
             modes: Optional[Sequence[int]] = None
     ) -> openfermion.InteractionOperator:
-        """Constructs the Hamiltonian corresponding to the gate's generator."""
+        """Constructs the Hamiltonian corresponding to the gate's generator.
+
+        Args:
+            operator: An operator to add the generator to in place. Defaults
+                to a new operator on the modes up to max(modes).
+            modes: The modes on which the gate acts. Defaults to
+                (0, ..., n - 1) for a gate on n qubits.
+        """
         if modes is None:
             modes = tuple(range(self.num_qubits()))
         if operator is None:
             n_modes = max(modes) + 1
             operator = openfermion.InteractionOperator.zero(n_modes)
-        else:
-            n_modes = operator.n_qubits
-        fermion_operator = self.fermion_generator
-        return openfermion.get_interaction_operator(fermion_operator,
-                                                    n_qubits=n_modes)
+
+        self.sparse_interaction_operator_generator(
+            modes=modes).add_to_interaction_operator(operator)
+        return operator
+
+    def sparse_interaction_operator_generator(
+            self,
+            *,
+            modes: Optional[Sequence[int]] = None
+    ) -> SparseInteractionOperator:
+        """The Hamiltonian corresponding to the gate's generator, as a
+        SparseInteractionOperator.
+
+        Args:
+            modes: The modes on which the gate acts. Defaults to
+                (0, ..., n - 1) for a gate on n qubits.
+        """
+        if modes is None:
+            modes = tuple(range(self.num_qubits()))
+        generator = SparseInteractionOperator.from_interaction_operator(
+            openfermion.get_interaction_operator(self.fermion_generator,
+                                                 n_qubits=self.num_qubits()))
+        # The gate is exp(i H) for the returned Hamiltonian H
+        operator = SparseInteractionOperator(
+            {(): self._exponent * self._global_shift})
+        for indices, coefficient in generator.permuted(modes).terms.items():
+            operator.add_term(indices, -self._exponent * coefficient)
+        return operator
 
 
 class QuadraticFermionicSimulationGate(InteractionOperatorFermionicGate,
@@ -433,17 +912,13 @@ class QuadraticFermionicSimulationGate(InteractionOperatorFermionicGate,
         yield cirq.CZPowGate(exponent=-self.weights[1] * self.exponent /
                              np.pi)(*qubits)
 
+    def _unitary_(self) -> np.ndarray:
+        if self._is_parameterized_():
+            return NotImplemented
+        return _quadratic_unitary(*self._unitary_cache_key()).copy()
+
     def _eigen_components(self):
-        components = [(0, np.diag([1, 0, 0, 0])),
-                      (-self.weights[1] / np.pi, np.diag([0, 0, 0, 1]))]
-        r = abs(self.weights[0]) / np.pi
-        theta = 2 * _arg(self.weights[0]) / np.pi
-        for s in (-1, 1):
-            components.append(
-                (-s * r,
-                 np.array([[0, 0, 0, 0], [0, 1, s * 1j**(-theta), 0],
-                           [0, s * 1j**(theta), 1, 0], [0, 0, 0, 0]]) / 2))
-        return components
+        return self._shared_eigen_components(_quadratic_eigen_components)
 
     def __repr__(self):
         exponent_str = ('' if self.exponent == 1 else ', exponent=' +
@@ -482,37 +957,40 @@ class QuadraticFermionicSimulationGate(InteractionOperatorFermionicGate,
     ) -> Optional['QuadraticFermionicSimulationGate']:
         if modes is None:
             modes = (0, 1)
+        return cast(Optional['QuadraticFermionicSimulationGate'],
+                    cls._from_interaction_operator_weights(operator, modes))
 
-        p, q = modes
+    @classmethod
+    def weights_from_interaction_operator(
+            cls,
+            *,
+            operator: Union[openfermion.InteractionOperator,
+                            SparseInteractionOperator],
+            modes: Union[np.ndarray, Sequence[Sequence[int]]],
+    ) -> np.ndarray:
+        p, q = np.asarray(modes, dtype=np.intp).reshape(-1, 2).T
+        two_body = operator.two_body_tensor
         tunneling_coeff = operator.one_body_tensor[p, q]
-        interaction_coeff = (-operator.two_body_tensor[p, q, p, q] +
-                             operator.two_body_tensor[q, p, p, q] +
-                             operator.two_body_tensor[p, q, q, p] -
-                             operator.two_body_tensor[q, p, q, p])
-        weights: Tuple[complex, complex] = (-tunneling_coeff,
-                                            -interaction_coeff)
-        if any(weights):
-            return cls(weights)
-        return None
+        interaction_coeff = (-two_body[p, q, p, q] + two_body[q, p, p, q] +
+                             two_body[p, q, q, p] - two_body[q, p, q, p])
+        return np.stack((-tunneling_coeff, -interaction_coeff), axis=1)
 
-    def interaction_operator_generator(
+    def sparse_interaction_operator_generator(
             self,
             *,
-            operator: Optional[openfermion.InteractionOperator] = None,
             modes: Optional[Sequence[int]] = None
-    ) -> openfermion.InteractionOperator:
+    ) -> SparseInteractionOperator:
         if modes is None:
             modes = (0, 1)
-        if operator is None:
-            n_modes = max(modes) + 1
-            operator = openfermion.InteractionOperator.zero(n_modes)
 
         weights = tuple(w * self._exponent for w in self.weights)
-        operator.constant += self._exponent * self._global_shift
-        operator.one_body_tensor[modes] -= weights[0]
-        operator.one_body_tensor[modes[::-1]] -= weights[0].conjugate()
-        operator.two_body_tensor[tuple(modes) * 2] += weights[1]
-        return operator
+        p, q = modes
+        return SparseInteractionOperator({
+            (): self._exponent * self._global_shift,
+            (p, q): -weights[0],
+            (q, p): -weights[0].conjugate(),
+            (p, q, p, q): weights[1],
+        })
 
     def fswap(self, i: int = 0):
         if i != 0:
@@ -567,21 +1045,12 @@ class CubicFermionicSimulationGate(InteractionOperatorFermionicGate,
         return '↕↓↑' if use_unicode else 'na*a'
 
     def _eigen_components(self):
-        components = [(0, np.diag([1, 1, 1, 0, 1, 0, 0, 1]))]
-        nontrivial_part = np.zeros((3, 3), dtype=np.complex128)
-        for ij, w in zip([(1, 2), (0, 2), (0, 1)], self.weights):
-            nontrivial_part[ij] = w
-            nontrivial_part[ij[::-1]] = w.conjugate()
-        assert np.allclose(nontrivial_part, nontrivial_part.conj().T)
-        eig_vals, eig_vecs = np.linalg.eigh(nontrivial_part)
-        for eig_val, eig_vec in zip(eig_vals, eig_vecs.T):
-            exp_factor = -eig_val / np.pi
-            proj = np.zeros((8, 8), dtype=np.complex128)
-            nontrivial_indices = np.array([3, 5, 6], dtype=np.intp)
-            proj[nontrivial_indices[:, np.newaxis], nontrivial_indices] = (
-                np.outer(eig_vec.conjugate(), eig_vec))
-            components.append((exp_factor, proj))
-        return components
+        return self._shared_eigen_components(_cubic_eigen_components)
+
+    def _unitary_(self) -> np.ndarray:
+        if self._is_parameterized_():
+            return NotImplemented
+        return _cubic_unitary(*self._unitary_cache_key()).copy()
 
     def __repr__(self):
         return ('ofc.CubicFermionicSimulationGate(' + '({})'.format(' ,'.join(
@@ -623,40 +1092,46 @@ class CubicFermionicSimulationGate(InteractionOperatorFermionicGate,
     ) -> Optional['CubicFermionicSimulationGate']:
         if modes is None:
             modes = (0, 1, 2)
-        i, j, k = modes
-        weights = tuple(
-            sgn * (operator.two_body_tensor[p, q, p, r] -
-                   operator.two_body_tensor[p, q, r, p] -
-                   operator.two_body_tensor[q, p, p, r] +
-                   operator.two_body_tensor[q, p, r, p])
+        return cast(Optional['CubicFermionicSimulationGate'],
+                    cls._from_interaction_operator_weights(operator, modes))
+
+    @classmethod
+    def weights_from_interaction_operator(
+            cls,
+            *,
+            operator: Union[openfermion.InteractionOperator,
+                            SparseInteractionOperator],
+            modes: Union[np.ndarray, Sequence[Sequence[int]]],
+    ) -> np.ndarray:
+        i, j, k = np.asarray(modes, dtype=np.intp).reshape(-1, 3).T
+        two_body = operator.two_body_tensor
+        return np.stack([
+            sgn * (two_body[p, q, p, r] - two_body[p, q, r, p] -
+                   two_body[q, p, p, r] + two_body[q, p, r, p])
             for sgn, (p, q,
-                      r) in zip([1, -1, 1], [(i, j, k), (j, i, k), (k, i, j)]))
-        if any(weights):
-            return cls(cast(Tuple[complex, complex, complex], weights))
-        return None
+                      r) in zip([1, -1, 1], [(i, j, k), (j, i, k), (k, i, j)])
+        ],
+                        axis=1)
 
-    def interaction_operator_generator(
+    def sparse_interaction_operator_generator(
             self,
             *,
-            operator: Optional[openfermion.InteractionOperator] = None,
             modes: Optional[Sequence[int]] = None
-    ) -> openfermion.InteractionOperator:
+    ) -> SparseInteractionOperator:
         if modes is None:
             modes = (0, 1, 2)
-        if operator is None:
-            n_modes = max(modes) + 1
-            operator = openfermion.InteractionOperator.zero(n_modes)
 
         weights = tuple(w * self._exponent for w in self.weights)
-        operator.constant += self._exponent * self._global_shift
         p, q, r = modes
-        operator.two_body_tensor[p, q, p, r] += weights[0]
-        operator.two_body_tensor[p, r, p, q] += weights[0].conjugate()
-        operator.two_body_tensor[p, q, q, r] += weights[1]
-        operator.two_body_tensor[q, r, p, q] += weights[1].conjugate()
-        operator.two_body_tensor[p, r, q, r] += weights[2]
-        operator.two_body_tensor[q, r, p, r] += weights[2].conjugate()
-        return operator
+        return SparseInteractionOperator({
+            (): self._exponent * self._global_shift,
+            (p, q, p, r): weights[0],
+            (p, r, p, q): weights[0].conjugate(),
+            (p, q, q, r): weights[1],
+            (q, r, p, q): weights[1].conjugate(),
+            (p, r, q, r): weights[2],
+            (q, r, p, r): weights[2].conjugate(),
+        })
 
     def fswap(self, i: int):
         if i == 0:
@@ -716,21 +1191,12 @@ class QuarticFermionicSimulationGate(InteractionOperatorFermionicGate,
         return 4
 
     def _eigen_components(self):
-        # projector onto subspace spanned by basis states with
-        # Hamming weight != 2
-        zero_component = np.diag(
-            [int(bin(i).count('1') != 2) for i in range(16)])
-
-        state_pairs = (('0110', '1001'), ('0101', '1010'), ('0011', '1100'))
+        return self._shared_eigen_components(_quartic_eigen_components)
 
-        plus_minus_components = tuple(
-            (-abs(weight) * sign / np.pi,
-             state_swap_eigen_component(state_pair[0], state_pair[1], sign,
-                                        np.angle(weight)))
-            for weight, state_pair in zip(self.weights, state_pairs)
-            for sign in (-1, 1))
-
-        return ((0, zero_component),) + plus_minus_components
+    def _unitary_(self) -> np.ndarray:
+        if self._is_parameterized_():
+            return NotImplemented
+        return _quartic_unitary(*self._unitary_cache_key()).copy()
 
     def _with_exponent(self, exponent: Union[sympy.Symbol, float]
                       ) -> 'QuarticFermionicSimulationGate':
@@ -771,64 +1237,23 @@ class QuarticFermionicSimulationGate(InteractionOperatorFermionicGate,
         if self._is_parameterized_():
             return NotImplemented
 
-        individual_rotations = [
-            la.expm(0.5j * self.exponent *
-                    np.array([[np.real(w), 1j * s * np.imag(w)],
-                              [-1j * s * np.imag(w), -np.real(w)]]))
-            for s, w in zip([1, -1, -1], self.weights)
-        ]
+        weights, exponent, _ = self._unitary_cache_key()
+        rotations, inverse_rotations = _quartic_controlled_rotations(
+            weights, exponent)
 
-        combined_rotations = {}
-        combined_rotations[0] = la.sqrtm(
-            np.linalg.multi_dot([
-                la.inv(individual_rotations[1]), individual_rotations[0],
-                individual_rotations[2]
-            ]))
-        combined_rotations[1] = la.inv(combined_rotations[0])
-        combined_rotations[2] = np.linalg.multi_dot([
-            la.inv(individual_rotations[0]), individual_rotations[1],
-            combined_rotations[0]
-        ])
-        combined_rotations[3] = individual_rotations[0]
-
-        controlled_rotations = {
-            i: cirq.ControlledGate(
-                cirq.MatrixGate(combined_rotations[i], qid_shape=(2,)))
-            for i in range(4)
-        }
-
-        a, b, c, d = qubits
-
-        basis_change = list(
-            cirq.flatten_op_tree([
-                cirq.CNOT(b, a),
-                cirq.CNOT(c, b),
-                cirq.CNOT(d, c),
-                cirq.CNOT(c, b),
-                cirq.CNOT(b, a),
-                cirq.CNOT(a, b),
-                cirq.CNOT(b, c),
-                cirq.CNOT(a, b),
-                [cirq.X(c), cirq.X(d)],
-                [cirq.CNOT(c, d), cirq.CNOT(d, c)],
-                [cirq.X(c), cirq.X(d)],
-            ]))
-
-        controlled_rotations = list(
-            cirq.flatten_op_tree([
-                controlled_rotations[0](b, c),
-                cirq.CNOT(a, b), controlled_rotations[1](b, c),
-                cirq.CNOT(b, a),
-                cirq.CNOT(a, b), controlled_rotations[2](b, c),
-                cirq.CNOT(a, b), controlled_rotations[3](b, c)
-            ]))
+        def on_qubits(skeleton, rotations=()):
+            return [(rotations[gate] if isinstance(gate, int) else gate).on(
+                *(qubits[i] for i in indices)) for gate, indices in skeleton]
 
+        c, d = qubits[2:]
+        basis_change = on_qubits(_QUARTIC_BASIS_CHANGE)
         controlled_swaps = [
             [cirq.CNOT(c, d), cirq.H(c)],
             cirq.CNOT(d, c),
-            controlled_rotations,
+            on_qubits(_QUARTIC_CONTROLLED_ROTATIONS, rotations),
             cirq.CNOT(d, c),
-            [cirq.inverse(op) for op in reversed(controlled_rotations)],
+            on_qubits(reversed(_QUARTIC_CONTROLLED_ROTATIONS),
+                      inverse_rotations),
             [cirq.H(c), cirq.CNOT(c, d)],
         ]
 
@@ -843,9 +1268,7 @@ class QuarticFermionicSimulationGate(InteractionOperatorFermionicGate,
         if cirq.is_parameterized(self):
             return NotImplemented
 
-        am, bm, cm = (la.expm(-1j * self.exponent *
-                              np.array([[0, w], [w.conjugate(), 0]]))
-                      for w in self.weights)
+        am, bm, cm = (_swap_block(w, self.exponent) for w in self.weights)
 
         a1 = args.subspace_index(0b1001)
         b1 = args.subspace_index(0b0101)
@@ -863,10 +1286,13 @@ class QuarticFermionicSimulationGate(InteractionOperatorFermionicGate,
                                     bm,
                                     slices=[b1, b2],
                                     out=args.target_tensor)
-        return cirq.apply_matrix_to_slices(args.target_tensor,
-                                           cm,
-                                           slices=[c1, c2],
-                                           out=args.available_buffer)
+        result = cirq.apply_matrix_to_slices(args.target_tensor,
+                                             cm,
+                                             slices=[c1, c2],
+                                             out=args.available_buffer)
+        if self._global_shift:
+            result *= np.exp(1j * np.pi * self.exponent * self._global_shift)
+        return result
 
     def __repr__(self):
         return ('ofc.QuarticFermionicSimulationGate(({}), '
@@ -912,38 +1338,45 @@ class QuarticFermionicSimulationGate(InteractionOperatorFermionicGate,
     ) -> Optional['QuarticFermionicSimulationGate']:
         if modes is None:
             modes = (0, 1, 2, 3)
-        i, j, k, l = modes
-        weights = tuple(
-            (operator.two_body_tensor[p, q, r, s] -
-             operator.two_body_tensor[p, q, s, r] -
-             operator.two_body_tensor[q, p, r, s] +
-             operator.two_body_tensor[q, p, s, r])
-            for p, q, r, s in [(i, l, j, k), (i, k, j, l), (i, j, k, l)])
-        if any(weights):
-            return cls(cast(Tuple[complex, complex, complex], weights))
-        return None
+        return cast(Optional['QuarticFermionicSimulationGate'],
+                    cls._from_interaction_operator_weights(operator, modes))
 
-    def interaction_operator_generator(
+    @classmethod
+    def weights_from_interaction_operator(
+            cls,
+            *,
+            operator: Union[openfermion.InteractionOperator,
+                            SparseInteractionOperator],
+            modes: Union[np.ndarray, Sequence[Sequence[int]]],
+    ) -> np.ndarray:
+        i, j, k, l = np.asarray(modes, dtype=np.intp).reshape(-1, 4).T
+        two_body = operator.two_body_tensor
+        return np.stack([
+            two_body[p, q, r, s] - two_body[p, q, s, r] - two_body[q, p, r, s] +
+            two_body[q, p, s, r]
+            for p, q, r, s in [(i, l, j, k), (i, k, j, l), (i, j, k, l)]
+        ],
+                        axis=1)
+
+    def sparse_interaction_operator_generator(
             self,
-            operator: Optional[openfermion.InteractionOperator] = None,
+            *,
             modes: Optional[Sequence[int]] = None
-    ) -> openfermion.InteractionOperator:
+    ) -> SparseInteractionOperator:
         if modes is None:
             modes = (0, 1, 2, 3)
-        if operator is None:
-            n_modes = max(modes) + 1
-            operator = openfermion.InteractionOperator.zero(n_modes)
 
         weights = tuple(w * self._exponent for w in self.weights)
-        operator.constant += self._exponent * self._global_shift
         p, q, r, s = modes
-        operator.two_body_tensor[p, s, q, r] += weights[0]
-        operator.two_body_tensor[q, r, p, s] += weights[0].conjugate()
-        operator.two_body_tensor[p, r, q, s] += weights[1]
-        operator.two_body_tensor[q, s, p, r] += weights[1].conjugate()
-        operator.two_body_tensor[p, q, r, s] += weights[2]
-        operator.two_body_tensor[r, s, p, q] += weights[2].conjugate()
-        return operator
+        return SparseInteractionOperator({
+            (): self._exponent * self._global_shift,
+            (p, s, q, r): weights[0],
+            (q, r, p, s): weights[0].conjugate(),
+            (p, r, q, s): weights[1],
+            (q, s, p, r): weights[1].conjugate(),
+            (p, q, r, s): weights[2],
+            (r, s, p, q): weights[2].conjugate(),
+        })
 
     def fswap(self, i: int):
         if i == 0:
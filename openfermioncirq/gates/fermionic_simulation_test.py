@@ -23,8 +23,12 @@ import sympy
 
 import openfermioncirq as ofc
 from openfermioncirq.gates.fermionic_simulation import (
+    InteractionOperatorFermionicGate,
+    sparse_sum_of_interaction_operator_gate_generators,
     sum_of_interaction_operator_gate_generators,
     state_swap_eigen_component,
+    _quadratic_eigen_components,
+    _quartic_controlled_rotations,
 )
 
 
@@ -56,6 +60,22 @@ def test_state_swap_eigen_component(index_pair, n_qubits):
         expected_component[i, i] = expected_component[j, j] = 0.5
         expected_component[i, j] = expected_component[j, i] = sign * 0.5
         assert np.allclose(actual_component, expected_component)
+        assert not actual_component.flags.writeable
+
+        angle = 0.7
+        actual_component = state_swap_eigen_component(state_pair[0],
+                                                      state_pair[1], sign,
+                                                      angle)
+        expected_component = expected_component.astype(np.complex128)
+        expected_component[j, i] *= np.exp(1j * angle)
+        expected_component[i, j] *= np.exp(-1j * angle)
+        assert np.allclose(actual_component, expected_component)
+        assert not actual_component.flags.writeable
+
+    # The angle-0 component is shared, and unchanged by other angles
+    assert (state_swap_eigen_component(*state_pair) is
+            state_swap_eigen_component(*state_pair))
+    assert state_swap_eigen_component(*state_pair)[j, i] == 0.5
 
 
 @pytest.mark.parametrize('n_modes, seed',
@@ -71,6 +91,158 @@ def test_interaction_operator_interconversion(n_modes, seed):
     assert operator == other_operator
 
 
+def _gates_from_interaction_operator_by_subsets(operator):
+    n_modes = operator.n_qubits
+    gates = {}
+    if operator.constant:
+        gates[()] = operator.constant
+    for p in range(n_modes):
+        coeff = operator.one_body_tensor[p, p]
+        if coeff:
+            gates[(p,)] = cirq.Z**(coeff / np.pi)
+    for order, gate_type in [(2, ofc.QuadraticFermionicSimulationGate),
+                             (3, ofc.CubicFermionicSimulationGate),
+                             (4, ofc.QuarticFermionicSimulationGate)]:
+        for modes in itertools.combinations(range(n_modes), order):
+            gate = gate_type.from_interaction_operator(operator=operator,
+                                                       modes=modes)
+            if gate:
+                gates[modes] = gate
+    return gates
+
+
+def assert_gates_from_interaction_operator_equal(gates, expected):
+    assert list(gates) == list(expected)
+    for modes, gate in gates.items():
+        if isinstance(gate, cirq.ZPowGate):
+            # Z gates with complex exponents don't support equality
+            assert np.isclose(gate.exponent, expected[modes].exponent)
+        else:
+            assert gate == expected[modes]
+
+
+@pytest.mark.parametrize('n_modes, density', [(4, 1), (6, 0.3), (8, 0.05),
+                                              (5, 0)])
+def test_gates_from_interaction_operator_matches_subsets(n_modes, density):
+    operator = openfermion.random_interaction_operator(n_modes,
+                                                       real=False,
+                                                       seed=n_modes)
+    mask = np.random.RandomState(n_modes).uniform(
+        size=operator.two_body_tensor.shape) < density
+    operator.two_body_tensor *= mask
+    operator.one_body_tensor[:, 1] = 0
+
+    gates = ofc.fermionic_simulation_gates_from_interaction_operator(operator)
+    expected = _gates_from_interaction_operator_by_subsets(operator)
+    assert_gates_from_interaction_operator_equal(gates, expected)
+
+
+@pytest.mark.parametrize('gate_type,order',
+                         [(ofc.QuadraticFermionicSimulationGate, 2),
+                          (ofc.CubicFermionicSimulationGate, 3),
+                          (ofc.QuarticFermionicSimulationGate, 4)])
+def test_weights_from_interaction_operator(gate_type, order):
+    operator = openfermion.random_interaction_operator(6, real=False, seed=2)
+    # Mode 5 doesn't interact with the others
+    operator.one_body_tensor[5, :] = operator.one_body_tensor[:, 5] = 0
+    for axis in range(4):
+        np.moveaxis(operator.two_body_tensor, axis, 0)[5] = 0
+    modes = np.array(list(itertools.permutations(range(6), order)))
+
+    weights = gate_type.weights_from_interaction_operator(operator=operator,
+                                                          modes=modes)
+    assert weights.shape == (len(modes), gate_type.num_weights())
+    sparse_weights = gate_type.weights_from_interaction_operator(
+        operator=ofc.SparseInteractionOperator.from_interaction_operator(
+            operator),
+        modes=modes)
+    np.testing.assert_allclose(sparse_weights, weights)
+
+    zero_rows = 0
+    for row, gate_modes in zip(weights, modes):
+        gate = gate_type.from_interaction_operator(operator=operator,
+                                                   modes=gate_modes)
+        if gate is None:
+            zero_rows += 1
+            assert not np.any(row)
+        else:
+            assert gate.weights == tuple(row)
+    assert zero_rows
+
+    gates = gate_type.gates_from_weights(modes, weights)
+    assert not isinstance(gates, (list, tuple, dict))
+    gates = dict(gates)
+    assert len(gates) == len(modes) - zero_rows
+    for gate_modes, gate in gates.items():
+        assert all(isinstance(mode, int) for mode in gate_modes)
+        assert gate == gate_type.from_interaction_operator(operator=operator,
+                                                           modes=gate_modes)
+
+    empty = gate_type.weights_from_interaction_operator(operator=operator,
+                                                        modes=np.zeros(
+                                                            (0, order), int))
+    assert empty.shape == (0, gate_type.num_weights())
+    assert not list(gate_type.gates_from_weights(np.zeros((0, order)), empty))
+
+
+def test_gates_from_interaction_operator_cached():
+    operator = openfermion.random_interaction_operator(5, seed=3)
+    gates = ofc.fermionic_simulation_gates_from_interaction_operator(operator)
+    gate = gates[(0, 1, 2, 3)]
+    gate.permute([1, 0, 2, 3])
+
+    other_gates = ofc.fermionic_simulation_gates_from_interaction_operator(
+        openfermion.InteractionOperator(operator.constant,
+                                        operator.one_body_tensor.copy(),
+                                        operator.two_body_tensor.copy()))
+    assert_gates_from_interaction_operator_equal(
+        other_gates, _gates_from_interaction_operator_by_subsets(operator))
+
+    operator.two_body_tensor[0, 1, 2, 3] += 1
+    assert_gates_from_interaction_operator_equal(
+        ofc.fermionic_simulation_gates_from_interaction_operator(operator),
+        _gates_from_interaction_operator_by_subsets(operator))
+
+
+@pytest.mark.parametrize('n_modes, seed',
+                         [(6, np.random.randint(1 << 30)) for _ in range(2)])
+def test_sparse_interaction_operator_interconversion(n_modes, seed):
+    operator = openfermion.random_interaction_operator(n_modes,
+                                                       real=False,
+                                                       seed=seed)
+    gates = ofc.fermionic_simulation_gates_from_interaction_operator(operator)
+    sparse_operator = sparse_sum_of_interaction_operator_gate_generators(gates)
+    assert (sparse_operator.to_interaction_operator(n_modes) ==
+            sum_of_interaction_operator_gate_generators(n_modes, gates))
+
+    other_gates = ofc.fermionic_simulation_gates_from_interaction_operator(
+        sparse_operator)
+    assert_gates_from_interaction_operator_equal(
+        other_gates,
+        ofc.fermionic_simulation_gates_from_interaction_operator(
+            sparse_operator.to_interaction_operator(n_modes)))
+    assert_gates_from_interaction_operator_equal(
+        other_gates,
+        ofc.fermionic_simulation_gates_from_interaction_operator(
+            ofc.SparseInteractionOperator.from_interaction_operator(operator)))
+
+
+@pytest.mark.parametrize('order', [2, 3, 4])
+def test_sparse_interaction_operator_generator_permuted(order):
+    gate = random_fermionic_simulation_gate(order)
+    init_pos = np.random.permutation(order)
+    expected = gate.permuted(init_pos).interaction_operator_generator()
+    actual = gate.sparse_interaction_operator_generator().permuted(
+        init_pos).to_interaction_operator(order)
+    assert (openfermion.normal_ordered(actual) ==
+            openfermion.normal_ordered(expected))
+
+    modes = (5, 1, 3, 2)[:order]
+    actual = gate.sparse_interaction_operator_generator(modes=modes)
+    expected = gate.sparse_interaction_operator_generator().permuted(modes)
+    assert actual == expected
+
+
 def test_interaction_operator_from_bad_gates():
     for gates in [{(): 'bad'}, {(0,): cirq.X}]:
         with pytest.raises(TypeError):
@@ -189,12 +361,14 @@ def assert_interaction_operator_consistent(gate):
         interaction_op.n_qubits)
     super(type(gate),
           gate).interaction_operator_generator(operator=other_interaction_op)
-    other_interaction_op = openfermion.normal_ordered(interaction_op)
+    other_interaction_op = openfermion.normal_ordered(other_interaction_op)
     assert interaction_op == other_interaction_op
 
-    other_interaction_op = super(type(gate),
-                                 gate).interaction_operator_generator()
-    other_interaction_op = openfermion.normal_ordered(interaction_op)
+    # The generic implementation goes through the FermionOperator generator
+    other_interaction_op = InteractionOperatorFermionicGate.\
+        sparse_interaction_operator_generator(gate).to_interaction_operator(
+            interaction_op.n_qubits)
+    other_interaction_op = openfermion.normal_ordered(other_interaction_op)
     assert interaction_op == other_interaction_op
 
 
@@ -229,6 +403,59 @@ def test_fermionic_simulation_gate(gate):
     assert gate.num_weights() == super(type(gate), gate).num_weights()
 
 
+@pytest.mark.parametrize('gate,global_shift',
+                         itertools.product(gates, [0, 0.3]))
+def test_fermionic_simulation_gate_unitary_matches_eigen_components(
+        gate, global_shift):
+    gate = type(gate)(gate.weights,
+                      exponent=gate.exponent,
+                      global_shift=global_shift)
+    expected_unitary = cirq.EigenGate._unitary_(gate)
+    actual_unitary = cirq.unitary(gate)
+    assert np.allclose(expected_unitary, actual_unitary)
+
+    # Cached unitaries are copied
+    actual_unitary[0, 0] = 2
+    assert np.allclose(cirq.unitary(gate), expected_unitary)
+
+
+@pytest.mark.parametrize('gate', gates)
+def test_fermionic_simulation_gate_resolved_gates_share_eigen_components(gate):
+    t = sympy.Symbol('t')
+    symbolic_gate = type(gate)(gate.weights, exponent=t)
+    resolved_gates = [
+        cirq.resolve_parameters(symbolic_gate, {t: value})
+        for value in (0.1, 0.7)
+    ]
+    components = [g._eigen_components() for g in resolved_gates]
+    for (factor, projector), (other_factor, other_projector) in zip(
+            *components):
+        assert factor == other_factor
+        assert projector is other_projector
+        assert not projector.flags.writeable
+
+    for resolved_gate, value in zip(resolved_gates, (0.1, 0.7)):
+        expected = type(gate)(gate.weights, exponent=value)
+        assert cirq.approx_eq(resolved_gate, expected)
+        np.testing.assert_allclose(cirq.EigenGate._unitary_(resolved_gate),
+                                   cirq.unitary(expected),
+                                   atol=1e-8)
+
+    # Gates with symbolic weights are not cached
+    symbolic_weights = (sympy.Symbol('w'),) + tuple(gate.weights[1:])
+    symbolic_weight_gate = type(gate)(symbolic_weights)
+    assert cirq.is_parameterized(symbolic_weight_gate)
+    if isinstance(gate, ofc.QuadraticFermionicSimulationGate):
+        info = _quadratic_eigen_components.cache_info()
+        assert len(symbolic_weight_gate._eigen_components()) == 4
+        assert _quadratic_eigen_components.cache_info() == info
+    resolved_gate = cirq.resolve_parameters(symbolic_weight_gate,
+                                            {'w': gate.weights[0]})
+    np.testing.assert_allclose(cirq.unitary(resolved_gate),
+                               cirq.unitary(type(gate)(gate.weights)),
+                               atol=1e-8)
+
+
 @pytest.mark.parametrize('weights', list(np.random.rand(10, 3)) + [(1, 0, 1)])
 def test_weights_and_exponent(weights):
     exponents = np.linspace(-1, 1, 8)
@@ -525,6 +752,26 @@ def test_quartic_fermionic_simulation_decompose(weights):
         ofc.QuarticFermionicSimulationGate(weights))
 
 
+@pytest.mark.parametrize(
+    'weights,exponent',
+    [(np.random.uniform(-5, 5, 3) + 1j * np.random.uniform(-5, 5, 3),
+      np.random.uniform(-5, 5)) for _ in range(5)] + [((np.pi, 0, 0), 1)])
+def test_quartic_fermionic_simulation_decompose_complex(weights, exponent):
+    gate = ofc.QuarticFermionicSimulationGate(weights, exponent=exponent)
+    cirq.testing.assert_decompose_is_consistent_with_unitary(gate)
+
+    # Decomposing an equal gate reuses the cached rotations
+    qubits = cirq.LineQubit.range(4)
+    operations = list(cirq.flatten_op_tree(gate._decompose_(qubits)))
+    hits = _quartic_controlled_rotations.cache_info().hits
+    other_operations = list(
+        cirq.flatten_op_tree(
+            ofc.QuarticFermionicSimulationGate(
+                weights, exponent=exponent)._decompose_(qubits)))
+    assert _quartic_controlled_rotations.cache_info().hits == hits + 1
+    assert operations == other_operations
+
+
 @pytest.mark.parametrize(
     'weights,exponent',
     [(np.random.uniform(-5, 5, 3) + 1j * np.random.uniform(-5, 5, 3),
@@ -599,3 +846,7 @@ def test_quartic_fermionic_simulation_gate_text_diagram():
 def test_quartic_fermionic_simulation_apply_unitary(weights, exponent):
     gate = ofc.QuarticFermionicSimulationGate(weights, exponent=exponent)
     cirq.testing.assert_has_consistent_apply_unitary(gate, atol=5e-6)
+    gate = ofc.QuarticFermionicSimulationGate(weights,
+                                              exponent=exponent,
+                                              global_shift=0.25)
+    cirq.testing.assert_has_consistent_apply_unitary(gate, atol=5e-6)
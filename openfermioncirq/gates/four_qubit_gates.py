@@ -21,6 +21,9 @@ import sympy
 import cirq
 from cirq._compat import proper_repr
 
+from openfermioncirq.gates.apply_unitary import (apply_global_phase,
+                                                apply_to_state_pair)
+
 
 class DoubleExcitationGate(cirq.EigenGate):
     """Evolve under ``-|0011⟩⟨1100|`` + h.c. for some time."""
@@ -79,14 +82,11 @@ class DoubleExcitationGate(cirq.EigenGate):
     def _apply_unitary_(self, args: cirq.ApplyUnitaryArgs
                         ) -> Optional[np.ndarray]:
         if cirq.is_parameterized(self):
-            return None
-        inner_matrix = cirq.unitary(cirq.rx(-2 * np.pi * self.exponent))
-        a = args.subspace_index(0b0011)
-        b = args.subspace_index(0b1100)
-        return cirq.apply_matrix_to_slices(args.target_tensor,
-                                           inner_matrix,
-                                           slices=[a, b],
-                                           out=args.available_buffer)
+            return NotImplemented
+        apply_global_phase(args, self._exponent, self._global_shift)
+        c = np.cos(np.pi * self._exponent)
+        s = np.sin(np.pi * self._exponent)
+        return apply_to_state_pair(args, 0b0011, 0b1100, c, 1j * s, 1j * s)
 
     def _with_exponent(self,
                        exponent: Union[sympy.Symbol, float]
@@ -12,6 +12,7 @@
 
 import numpy
 import scipy
+import sympy
 import cirq
 import openfermion
 import pytest
@@ -48,6 +49,9 @@ def test_double_excitation_eq():
 def test_double_excitation_consistency():
     ofc.testing.assert_implements_consistent_protocols(
         ofc.DoubleExcitation)
+    cirq.testing.assert_has_consistent_apply_unitary_for_various_exponents(
+        ofc.DoubleExcitation,
+        exponents=[1, -0.5, 0.5, 0.25, -0.25, 0.1, sympy.Symbol('s')])
 
 
 double_excitation_simulator_test_cases = [
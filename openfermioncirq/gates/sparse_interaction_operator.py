@@ -0,0 +1,203 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""An interaction operator that stores only its nonzero coefficients."""
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import openfermion
+
+
+class SparseInteractionOperator:
+    r"""An interaction operator stored as a dictionary of coefficients.
+
+    The operator is
+
+    .. math::
+        c + \sum_{p, q} T_{pq} a^\dagger_p a_q +
+            \sum_{p, q, r, s} V_{pqrs} a^\dagger_p a^\dagger_q a_r a_s,
+
+    as in openfermion.InteractionOperator, but only the coefficients that
+    have been set are stored. The key () holds the constant c, (p, q) holds
+    :math:`T_{pq}` and (p, q, r, s) holds :math:`V_{pqrs}`.
+
+    Sums and relabelings of the modes take time linear in the number of
+    stored coefficients. Like an InteractionOperator, the representation is
+    not canonical: different coefficients can give the same operator.
+
+    Attributes:
+        terms: A dict from tuples of mode indices to coefficients.
+    """
+
+    def __init__(self,
+                 terms: Optional[Mapping[Tuple[int, ...], complex]] = None
+                ) -> None:
+        """
+        Args:
+            terms: The coefficients, keyed by tuples of mode indices of length
+                0, 2 or 4.
+
+        Raises:
+            ValueError: A key has a length other than 0, 2 or 4.
+        """
+        self.terms: Dict[Tuple[int, ...], complex] = {}
+        if terms is not None:
+            for indices, coefficient in terms.items():
+                self.add_term(indices, coefficient)
+
+    @classmethod
+    def from_interaction_operator(cls, operator: openfermion.InteractionOperator
+                                 ) -> 'SparseInteractionOperator':
+        """The nonzero coefficients of an InteractionOperator."""
+        sparse = cls()
+        if operator.constant:
+            sparse.terms[()] = operator.constant
+        for tensor in (operator.one_body_tensor, operator.two_body_tensor):
+            for indices in zip(*np.nonzero(tensor)):
+                sparse.terms[tuple(int(i) for i in indices)] = tensor[indices]
+        return sparse
+
+    @property
+    def constant(self) -> complex:
+        """The constant term."""
+        return self.terms.get((), 0)
+
+    @property
+    def one_body_tensor(self) -> '_SparseTensorView':
+        """A read-only view of the one-body coefficients.
+
+        Indexing the view with (p, q) gives the coefficient, or 0 if it is
+        not stored, so that the operator can stand in for an
+        InteractionOperator where coefficients are only read.
+        """
+        return _SparseTensorView(self.terms)
+
+    @property
+    def two_body_tensor(self) -> '_SparseTensorView':
+        """A read-only view of the two-body coefficients."""
+        return _SparseTensorView(self.terms)
+
+    @property
+    def n_modes(self) -> int:
+        """One more than the largest mode index."""
+        return max((max(indices) + 1 for indices in self.terms if indices),
+                   default=0)
+
+    def add_term(self, indices: Sequence[int], coefficient: complex) -> None:
+        """Add to the coefficient of a term."""
+        indices = tuple(indices)
+        if len(indices) not in (0, 2, 4):
+            raise ValueError(
+                f'Term {indices} is not a constant, one-body or two-body term.')
+        if indices in self.terms:
+            self.terms[indices] += coefficient
+        else:
+            self.terms[indices] = coefficient
+
+    def permuted(self, permutation: Union[Sequence[int], Mapping[int, int]]
+                ) -> 'SparseInteractionOperator':
+        """Returns the operator with mode p relabeled as permutation[p].
+
+        Args:
+            permutation: The new index of each mode. Modes that are not
+                keys (or, for a sequence, indices) keep their index.
+        """
+        if not isinstance(permutation, Mapping):
+            permutation = dict(enumerate(permutation))
+        permuted = SparseInteractionOperator()
+        for indices, coefficient in self.terms.items():
+            permuted.add_term([permutation.get(p, p) for p in indices],
+                              coefficient)
+        return permuted
+
+    def to_interaction_operator(self, n_modes: Optional[int] = None
+                               ) -> openfermion.InteractionOperator:
+        """The operator as a dense InteractionOperator.
+
+        Args:
+            n_modes: The number of modes. Defaults to self.n_modes.
+        """
+        if n_modes is None:
+            n_modes = self.n_modes
+        operator = openfermion.InteractionOperator.zero(n_modes)
+        self.add_to_interaction_operator(operator)
+        return operator
+
+    def add_to_interaction_operator(
+            self, operator: openfermion.InteractionOperator) -> None:
+        """Adds the coefficients into an InteractionOperator in place."""
+        for indices, coefficient in self.terms.items():
+            if not indices:
+                operator.constant += coefficient
+            elif len(indices) == 2:
+                operator.one_body_tensor[indices] += coefficient
+            else:
+                operator.two_body_tensor[indices] += coefficient
+
+    def __iadd__(self, other: 'SparseInteractionOperator'
+                ) -> 'SparseInteractionOperator':
+        if not isinstance(other, SparseInteractionOperator):
+            return NotImplemented
+        for indices, coefficient in other.terms.items():
+            self.add_term(indices, coefficient)
+        return self
+
+    def __add__(self, other: 'SparseInteractionOperator'
+               ) -> 'SparseInteractionOperator':
+        if not isinstance(other, SparseInteractionOperator):
+            return NotImplemented
+        result = SparseInteractionOperator(self.terms)
+        result += other
+        return result
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SparseInteractionOperator):
+            return NotImplemented
+        return _nonzero_terms(self.terms) == _nonzero_terms(other.terms)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __repr__(self) -> str:
+        return f'ofc.SparseInteractionOperator({self.terms!r})'
+
+
+class _SparseTensorView:
+    """Looks up coefficients of a SparseInteractionOperator by index.
+
+    Like a NumPy array, the view can be indexed by a tuple of integer arrays,
+    which are broadcast together, to look up many coefficients at once.
+    """
+
+    def __init__(self, terms: Mapping[Tuple[int, ...], complex]) -> None:
+        self._terms = terms
+
+    def __getitem__(self, indices: Tuple[Any, ...]
+                   ) -> Union[complex, np.ndarray]:
+        if not any(isinstance(index, np.ndarray) for index in indices):
+            return self._terms.get(tuple(indices), 0)
+        arrays = np.broadcast_arrays(*indices)
+        coefficients = np.array([
+            self._terms.get(tuple(int(i) for i in key), 0)
+            for key in zip(*(array.ravel() for array in arrays))
+        ])
+        return coefficients.reshape(arrays[0].shape)
+
+
+def _nonzero_terms(terms: Mapping[Tuple[int, ...], complex]
+                  ) -> Dict[Tuple[int, ...], complex]:
+    return {
+        indices: coefficient
+        for indices, coefficient in terms.items()
+        if coefficient != 0
+    }
+
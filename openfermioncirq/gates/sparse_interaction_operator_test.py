@@ -0,0 +1,116 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import numpy as np
+import openfermion
+import pytest
+
+import openfermioncirq as ofc
+
+
+def test_sparse_interaction_operator_terms():
+    operator = ofc.SparseInteractionOperator({
+        (): 1.5,
+        (0, 2): 2,
+        (1, 0, 3, 2): -1j
+    })
+    assert operator.constant == 1.5
+    assert operator.n_modes == 4
+    assert len(operator) == 3
+    assert operator.one_body_tensor[0, 2] == 2
+    assert operator.one_body_tensor[2, 0] == 0
+    assert operator.two_body_tensor[1, 0, 3, 2] == -1j
+
+    operator.add_term((0, 2), 1)
+    assert operator.terms[(0, 2)] == 3
+
+    with pytest.raises(ValueError):
+        operator.add_term((0, 1, 2), 1)
+    with pytest.raises(ValueError):
+        ofc.SparseInteractionOperator({(0,): 1})
+
+    assert ofc.SparseInteractionOperator().n_modes == 0
+    assert ofc.SparseInteractionOperator().constant == 0
+
+
+def test_sparse_interaction_operator_fancy_indexing():
+    dense = openfermion.random_interaction_operator(4, real=False, seed=3)
+    sparse = ofc.SparseInteractionOperator.from_interaction_operator(dense)
+    p = np.array([[0, 1], [2, 3]])
+    q = np.array([1, 3])
+    np.testing.assert_allclose(sparse.one_body_tensor[p, q],
+                               dense.one_body_tensor[p, q])
+    np.testing.assert_allclose(sparse.two_body_tensor[p, q, 0, p],
+                               dense.two_body_tensor[p, q, 0, p])
+    assert ofc.SparseInteractionOperator().one_body_tensor[q, q].shape == (2,)
+
+
+def test_sparse_interaction_operator_dense_conversion():
+    dense = openfermion.random_interaction_operator(4, real=False, seed=5)
+    dense.one_body_tensor[1, 2] = 0
+    sparse = ofc.SparseInteractionOperator.from_interaction_operator(dense)
+    assert (1, 2) not in sparse.terms
+    assert sparse.to_interaction_operator() == dense
+    assert sparse.to_interaction_operator(6).n_qubits == 6
+
+    other = openfermion.InteractionOperator.zero(4)
+    sparse.add_to_interaction_operator(other)
+    sparse.add_to_interaction_operator(other)
+    assert other == dense * 2
+
+
+def test_sparse_interaction_operator_sum():
+    a = ofc.SparseInteractionOperator({(): 1, (0, 1): 2})
+    b = ofc.SparseInteractionOperator({(0, 1): -2, (1, 2, 0, 3): 1})
+    total = a + b
+    assert total.terms == {(): 1, (0, 1): 0, (1, 2, 0, 3): 1}
+    assert total == ofc.SparseInteractionOperator({(): 1, (1, 2, 0, 3): 1})
+    assert a.terms == {(): 1, (0, 1): 2}
+
+    a += b
+    assert a == total
+    assert (a.to_interaction_operator(4) == a.to_interaction_operator(4) +
+            openfermion.InteractionOperator.zero(4))
+
+    assert a.__add__(1) is NotImplemented
+    assert a.__iadd__(1) is NotImplemented
+    assert a != 1
+
+
+def test_sparse_interaction_operator_permuted():
+    operator = ofc.SparseInteractionOperator({
+        (): 1,
+        (0, 1): 2,
+        (1, 2, 0, 3): 3
+    })
+    permuted = operator.permuted([2, 0, 1, 3])
+    assert permuted.terms == {(): 1, (2, 0): 2, (0, 1, 2, 3): 3}
+    assert operator.permuted({0: 5}).terms == {
+        (): 1,
+        (5, 1): 2,
+        (1, 2, 5, 3): 3
+    }
+
+    # Relabeling modes gives the same operator up to reordering the modes
+    dense = openfermion.random_interaction_operator(4, real=False, seed=7)
+    permutation = [3, 1, 0, 2]
+    actual = ofc.SparseInteractionOperator.from_interaction_operator(
+        dense).permuted(permutation).to_interaction_operator()
+    expected = openfermion.get_interaction_operator(
+        openfermion.reorder(openfermion.get_fermion_operator(dense),
+                            lambda mode, _: permutation[mode]), 4)
+    assert openfermion.normal_ordered(actual) == expected
+
+
+def test_sparse_interaction_operator_repr():
+    operator = ofc.SparseInteractionOperator({(0, 1): 2})
+    assert repr(operator) == 'ofc.SparseInteractionOperator({(0, 1): 2})'
@@ -18,7 +18,8 @@ import numpy as np
 import cirq
 import deprecation
 
-from openfermioncirq.gates import common_gates
+from openfermioncirq.gates.apply_unitary import (apply_global_phase,
+                                                apply_to_state_pair)
 
 
 def rot111(rads: float) -> cirq.CCZPowGate:
@@ -39,10 +40,12 @@ class CXXYYPowGate(cirq.EigenGate, cirq.ThreeQubitGate):
 
     def _apply_unitary_(self,
                         args: cirq.ApplyUnitaryArgs) -> Optional[np.ndarray]:
-        return cirq.apply_unitary(cirq.ControlledGate(
-            common_gates.XXYY**self.exponent),
-                                  args,
-                                  default=None)
+        if cirq.is_parameterized(self):
+            return NotImplemented
+        apply_global_phase(args, self._exponent, self._global_shift)
+        c = np.cos(np.pi * self._exponent / 2)
+        s = np.sin(np.pi * self._exponent / 2)
+        return apply_to_state_pair(args, 0b101, 0b110, c, -1j * s, -1j * s)
 
     def _eigen_components(self):
         minus_half_component = cirq.linalg.block_diag(
@@ -89,10 +92,12 @@ class CYXXYPowGate(cirq.EigenGate, cirq.ThreeQubitGate):
 
     def _apply_unitary_(self,
                         args: cirq.ApplyUnitaryArgs) -> Optional[np.ndarray]:
-        return cirq.apply_unitary(cirq.ControlledGate(
-            common_gates.YXXY**self.exponent),
-                                  args,
-                                  default=None)
+        if cirq.is_parameterized(self):
+            return NotImplemented
+        apply_global_phase(args, self._exponent, self._global_shift)
+        c = np.cos(np.pi * self._exponent / 2)
+        s = np.sin(np.pi * self._exponent / 2)
+        return apply_to_state_pair(args, 0b101, 0b110, c, -s, s)
 
     def _eigen_components(self):
         minus_half_component = cirq.linalg.block_diag(
@@ -31,6 +31,10 @@ def test_apply_unitary_effect():
         ofc.CYXXY,
         exponents=[1, -0.5, 0.5, 0.25, -0.25, 0.1, sympy.Symbol('s')])
 
+    for gate_type in (ofc.CXXYYPowGate, ofc.CYXXYPowGate):
+        cirq.testing.assert_has_consistent_apply_unitary(
+            gate_type(exponent=0.3, global_shift=0.25))
+
 
 @deprecated_test
 def test_cxxyy_eq():
@@ -135,7 +139,6 @@ with warnings.catch_warnings():
          np.array([1, 0, 0, 1, 0, 0, 0, 0]) / np.sqrt(2),
          np.array([1, 0, 0, 1, 0, 0, 0, 0]) / np.sqrt(2))
     ]
-@deprecated_test
 @pytest.mark.parametrize('gate, initial_state, correct_state', args)
 def test_three_qubit_rotation_gates_on_simulator(gate: cirq.Gate,
                                                  initial_state: np.ndarray,
@@ -20,6 +20,8 @@ from openfermioncirq.optimization.black_box import (
     BlackBox,
     StatefulBlackBox)
 
+from openfermioncirq.optimization.evaluation_trace import EvaluationTrace
+
 from openfermioncirq.optimization.result import (
     OptimizationResult,
     OptimizationTrialResult)
@@ -19,6 +19,8 @@ import time
 
 import numpy
 
+from openfermioncirq.optimization.evaluation_trace import EvaluationTrace
+
 if TYPE_CHECKING:
     # pylint: disable=unused-import
     from typing import List
@@ -74,6 +76,11 @@ class BlackBox(metaclass=abc.ABCMeta):
         """
         return None
 
+    @property
+    def has_gradient(self) -> bool:
+        """Whether `gradient` returns the exact gradient of the objective."""
+        return False
+
     @abc.abstractmethod
     def _evaluate(self,
                   x: numpy.ndarray) -> float:
@@ -92,6 +99,27 @@ class BlackBox(metaclass=abc.ABCMeta):
         # Default: defer to `_evaluate`
         return self._evaluate(x)
 
+    def _evaluate_batch(self,
+                        xs: numpy.ndarray) -> numpy.ndarray:
+        """Evaluate the objective function at multiple points.
+
+        Implement this method when a BlackBox can evaluate many points more
+        efficiently than one at a time.
+        """
+        # Default: defer to `_evaluate`
+        return numpy.array([self._evaluate(x) for x in xs])
+
+    def _evaluate_with_cost_batch(self,
+                                  xs: numpy.ndarray,
+                                  cost: float) -> numpy.ndarray:
+        """Evaluate the objective function at multiple points with a cost.
+
+        Implement this method when a BlackBox with a cost model can evaluate
+        many points more efficiently than one at a time.
+        """
+        # Default: defer to `_evaluate_with_cost`
+        return numpy.array([self._evaluate_with_cost(x, cost) for x in xs])
+
     def evaluate(self,
                  x: numpy.ndarray) -> float:
         """Evaluate the objective function."""
@@ -99,6 +127,21 @@ class BlackBox(metaclass=abc.ABCMeta):
             return self.evaluate_with_cost(x, self.cost_of_evaluate)
         return self._evaluate(x)
 
+    def evaluate_batch(self,
+                       xs: numpy.ndarray) -> numpy.ndarray:
+        """Evaluate the objective function at multiple points.
+
+        Args:
+            xs: A 2d numpy array with each row representing one point.
+
+        Returns:
+            A 1d numpy array whose i-th entry is the function value of the
+            i-th row of xs.
+        """
+        if self.cost_of_evaluate is not None:
+            return self.evaluate_with_cost_batch(xs, self.cost_of_evaluate)
+        return self._evaluate_batch(xs)
+
     def evaluate_with_cost(self,
                            x: numpy.ndarray,
                            cost: float) -> float:
@@ -109,6 +152,26 @@ class BlackBox(metaclass=abc.ABCMeta):
         """
         return self._evaluate_with_cost(x, cost)
 
+    def evaluate_with_cost_batch(self,
+                                 xs: numpy.ndarray,
+                                 cost: float) -> numpy.ndarray:
+        """Evaluate the objective function at multiple points with a cost.
+
+        The specified cost is spent on each point.
+        """
+        return self._evaluate_with_cost_batch(xs, cost)
+
+    def gradient(self,
+                 x: numpy.ndarray) -> numpy.ndarray:
+        """The gradient of the objective function.
+
+        Implement this method, and override `has_gradient`, when defining a
+        BlackBox whose gradient can be computed exactly. Calls to this method
+        are not counted as evaluations of the objective function.
+        """
+        raise NotImplementedError(
+                '{} does not implement a gradient.'.format(type(self).__name__))
+
     def noise_bounds(self,
                      cost: float,
                      confidence: Optional[float]=None
@@ -143,15 +206,18 @@ class StatefulBlackBox(BlackBox):
         cost_spent: The total cost that has been spent on function evaluations.
         cost_of_evaluate: An optional cost associated with the
             ``evaluate`` method.
-        function_values: A list of tuples storing function values of evaluated
-            points. The tuples contain three objects. The first is a function
-            value, the second is the cost that was used for the evaluation
-            (or None if there was no cost), and the third is the point that
-            was evaluated (or None if the black box was initialized with
-            ``save_x_vals`` set to False.
+        function_values: An EvaluationTrace storing function values of
+            evaluated points. It behaves like a list of tuples containing
+            three objects. The first is a function value, the second is the
+            cost that was used for the evaluation (or None if there was no
+            cost), and the third is the point that was evaluated (or None if
+            the black box was initialized with ``save_x_vals`` set to False.
+            The values, costs and points are also available as NumPy arrays.
         wait_times: A list of floats. The i-th float float represents the time
             elapsed between the i-th and (i+1)-th times that the black box
-            was queried. Time is recorded using ``time.time()``.
+            was queried. Time is recorded using ``time.time()``. A call to
+            ``evaluate_batch`` or ``evaluate_with_cost_batch`` counts as a
+            single query.
     """
 
     def __init__(self,
@@ -165,8 +231,7 @@ class StatefulBlackBox(BlackBox):
                 whether the function values (y values) are saved (they are
                 saved no matter what).
         """
-        self.function_values = [] \
-            # type: List[Tuple[float, Optional[float], Optional[numpy.ndarray]]]
+        self.function_values = EvaluationTrace(save_x_vals)
         self.cost_spent = 0.0
         self.wait_times = []  # type: List[float]
         self._save_x_vals = save_x_vals
@@ -189,9 +254,7 @@ class StatefulBlackBox(BlackBox):
             self.wait_times.append(time.time() - self._time_of_last_query)
 
         val = self._evaluate(x)
-        self.function_values.append(
-                (val, None, x if self._save_x_vals else None)
-        )
+        self.function_values.append(val, None, x)
         self._time_of_last_query = time.time()
         return val
 
@@ -203,9 +266,35 @@ class StatefulBlackBox(BlackBox):
             self.wait_times.append(time.time() - self._time_of_last_query)
 
         val = self._evaluate_with_cost(x, cost)
-        self.function_values.append(
-                (val, cost, x if self._save_x_vals else None)
-        )
+        self.function_values.append(val, cost, x)
         self.cost_spent += cost
         self._time_of_last_query = time.time()
         return val
+
+    def evaluate_batch(self,
+                       xs: numpy.ndarray) -> numpy.ndarray:
+        """Evaluate the objective function at many points and update state."""
+        # If cost_of_evaluate is set, defer to evaluate_with_cost_batch
+        if self.cost_of_evaluate is not None:
+            return self.evaluate_with_cost_batch(xs, self.cost_of_evaluate)
+
+        if self._time_of_last_query is not None:
+            self.wait_times.append(time.time() - self._time_of_last_query)
+
+        vals = self._evaluate_batch(xs)
+        self.function_values.extend(vals, None, xs)
+        self._time_of_last_query = time.time()
+        return vals
+
+    def evaluate_with_cost_batch(self,
+                                 xs: numpy.ndarray,
+                                 cost: float) -> numpy.ndarray:
+        """Evaluate at several points with a cost and update state."""
+        if self._time_of_last_query is not None:
+            self.wait_times.append(time.time() - self._time_of_last_query)
+
+        vals = self._evaluate_with_cost_batch(xs, cost)
+        self.function_values.extend(vals, cost, xs)
+        self.cost_spent += cost * len(vals)
+        self._time_of_last_query = time.time()
+        return vals
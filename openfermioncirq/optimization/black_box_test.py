@@ -41,11 +41,33 @@ def test_black_box_evaluate_with_cost():
     assert 5.0 < noisy_val < 6.0
 
 
+def test_black_box_evaluate_batch():
+    black_box = ExampleBlackBox()
+    xs = numpy.array([[1.0, 2.0], [0.0, 3.0], [-1.0, 1.0]])
+    numpy.testing.assert_allclose(black_box.evaluate_batch(xs),
+                                  [5.0, 9.0, 2.0])
+    numpy.testing.assert_allclose(black_box.evaluate_with_cost_batch(xs, 1.0),
+                                  [5.0, 9.0, 2.0])
+
+    numpy.random.seed(27394)
+    black_box_noisy = ExampleBlackBoxNoisy(cost_of_evaluate=10.0)
+    noisy_vals = black_box_noisy.evaluate_batch(xs)
+    assert noisy_vals.shape == (3,)
+    assert numpy.all(numpy.abs(noisy_vals - [5.0, 9.0, 2.0]) < 1.0)
+
+
 def test_black_box_noise_bounds():
     black_box = ExampleBlackBox()
     assert black_box.noise_bounds(100) == (-numpy.inf, numpy.inf)
 
 
+def test_black_box_gradient_not_implemented():
+    black_box = ExampleBlackBox()
+    assert not black_box.has_gradient
+    with pytest.raises(NotImplementedError):
+        _ = black_box.gradient(numpy.array([1.0, 2.0]))
+
+
 def test_black_box_is_abstract_cant_instantiate():
     with pytest.raises(TypeError):
         _ = BlackBox()
@@ -73,11 +95,45 @@ def test_stateful_black_box():
     assert z == 1.0
     assert x is None
 
+    numpy.testing.assert_allclose(stateful_black_box.function_values.costs,
+                                  [numpy.nan, numpy.nan, 1.0, 2.0])
+    assert stateful_black_box.function_values.values.shape == (4,)
+
     assert len(stateful_black_box.wait_times) == 3
     for t in stateful_black_box.wait_times:
         assert isinstance(t, float)
 
 
+def test_stateful_black_box_evaluate_batch():
+    stateful_black_box = ExampleStatefulBlackBox(save_x_vals=True)
+    a, b, c, d, e = numpy.random.randn(5, 2)
+    _ = stateful_black_box.evaluate(a)
+    vals = stateful_black_box.evaluate_batch(numpy.array([b, c]))
+    _ = stateful_black_box.evaluate_with_cost_batch(numpy.array([d, e]), 2.0)
+
+    numpy.testing.assert_allclose(vals, [numpy.sum(b**2), numpy.sum(c**2)])
+    assert stateful_black_box.num_evaluations == 5
+    assert stateful_black_box.cost_spent == 4.0
+    assert len(stateful_black_box.wait_times) == 2
+
+    y, z, x = stateful_black_box.function_values[2]
+    assert y == vals[1]
+    assert z is None
+    numpy.testing.assert_array_equal(x, c)
+
+    y, z, x = stateful_black_box.function_values[4]
+    assert isinstance(y, float)
+    assert z == 2.0
+    numpy.testing.assert_array_equal(x, e)
+
+    stateful_black_box = ExampleStatefulBlackBox(cost_of_evaluate=1.5)
+    _ = stateful_black_box.evaluate_batch(numpy.array([a, b, c]))
+    assert stateful_black_box.num_evaluations == 3
+    assert stateful_black_box.cost_spent == 4.5
+    assert stateful_black_box.function_values[0][1] == 1.5
+    assert stateful_black_box.function_values[0][2] is None
+
+
 def test_stateful_black_box_save_x_vals():
     stateful_black_box = ExampleStatefulBlackBox(save_x_vals=True)
     a, b, c, d = numpy.random.randn(4, 2)
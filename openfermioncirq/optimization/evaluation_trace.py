@@ -0,0 +1,211 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Columnar storage for the evaluations made by a black box."""
+
+from typing import (Any, BinaryIO, cast, Dict, Iterator, List, Optional,
+                    Sequence, Tuple, Union, overload)
+
+import collections.abc
+
+import numpy
+
+
+class EvaluationTrace(collections.abc.Sequence):
+    """The function values, costs and points of a sequence of evaluations.
+
+    The trace stores its data in preallocated NumPy arrays that grow
+    geometrically: a vector of function values, a vector of costs, and, if
+    points are saved, a matrix with one row per evaluated point. The arrays
+    are exposed as views through `values`, `costs` and `x_vals`.
+
+    For compatibility with code that treats the trace as a list, indexing
+    and iterating produce tuples (value, cost, x), where cost is None if the
+    evaluation had no cost and x is None if points are not saved.
+
+    Attributes:
+        save_x_vals: Whether the evaluated points are stored.
+    """
+
+    def __init__(self,
+                 save_x_vals: bool=False,
+                 capacity: int=64) -> None:
+        """
+        Args:
+            save_x_vals: Whether to store the evaluated points.
+            capacity: The number of evaluations to allocate space for
+                initially.
+        """
+        self.save_x_vals = save_x_vals
+        self._size = 0
+        self._values = numpy.empty(capacity)
+        # Evaluations without a cost are stored as NaN
+        self._costs = numpy.empty(capacity)
+        self._x_vals = None  # type: Optional[numpy.ndarray]
+
+    @property
+    def values(self) -> numpy.ndarray:
+        """The function values."""
+        return self._values[:self._size]
+
+    @property
+    def costs(self) -> numpy.ndarray:
+        """The costs of the evaluations, with NaN for no cost."""
+        return self._costs[:self._size]
+
+    @property
+    def x_vals(self) -> Optional[numpy.ndarray]:
+        """The evaluated points as rows of a matrix, if they are saved."""
+        if not self.save_x_vals:
+            return None
+        if self._x_vals is None:
+            return numpy.empty((0, 0))
+        return self._x_vals[:self._size]
+
+    def append(self,
+               value: float,
+               cost: Optional[float],
+               x: Optional[numpy.ndarray]) -> None:
+        """Record a single evaluation."""
+        self.extend([value], cost, None if x is None else [x])
+
+    def extend(self,
+               values: Union[numpy.ndarray, Sequence[float]],
+               cost: Optional[float],
+               xs: Optional[Union[numpy.ndarray,
+                                  Sequence[numpy.ndarray]]]) -> None:
+        """Record several evaluations made with the same cost."""
+        num_new = len(values)
+        self._reserve(self._size + num_new,
+                      None if not self.save_x_vals or xs is None else
+                      numpy.size(xs[0]) if num_new else None)
+        new = slice(self._size, self._size + num_new)
+        self._values[new] = values
+        self._costs[new] = numpy.nan if cost is None else cost
+        if self.save_x_vals and xs is not None and num_new:
+            cast(numpy.ndarray, self._x_vals)[new] = numpy.reshape(
+                    xs, (num_new, -1))
+        self._size += num_new
+
+    def save(self, file: Union[str, BinaryIO]) -> None:
+        """Write the trace to a file in NumPy's .npz format."""
+        arrays = {'values': self.values, 'costs': self.costs}
+        if self.save_x_vals:
+            arrays['x_vals'] = cast(numpy.ndarray, self.x_vals)
+        numpy.savez(file, **arrays)
+
+    @staticmethod
+    def load(file: Union[str, BinaryIO]) -> 'EvaluationTrace':
+        """Read a trace written by `save`."""
+        with numpy.load(file) as data:
+            trace = EvaluationTrace(save_x_vals='x_vals' in data.files,
+                                    capacity=len(data['values']))
+            trace._restore(data['values'], data['costs'],
+                           data['x_vals'] if trace.save_x_vals else None)
+        return trace
+
+    def __len__(self) -> int:
+        return self._size
+
+    @overload
+    def __getitem__(self, index: int
+                   ) -> Tuple[float, Optional[float], Optional[numpy.ndarray]]:
+        pass
+
+    @overload
+    def __getitem__(self, index: slice
+                   ) -> List[Tuple[float, Optional[float],
+                                   Optional[numpy.ndarray]]]:
+        pass
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('EvaluationTrace index out of range.')
+        cost = self._costs[index]
+        x = None
+        if self.save_x_vals and self._x_vals is not None:
+            x = self._x_vals[index]
+        return (float(self._values[index]),
+                None if numpy.isnan(cost) else float(cost),
+                x)
+
+    def __iter__(self) -> Iterator[Tuple[float, Optional[float],
+                                         Optional[numpy.ndarray]]]:
+        for i in range(self._size):
+            yield self[i]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, EvaluationTrace):
+            return (self.save_x_vals == other.save_x_vals and
+                    numpy.array_equal(self.values, other.values) and
+                    numpy.array_equal(self.costs, other.costs,
+                                      equal_nan=True) and
+                    (not self.save_x_vals or
+                     numpy.array_equal(cast(numpy.ndarray, self.x_vals),
+                                       cast(numpy.ndarray, other.x_vals))))
+        if isinstance(other, list):
+            return len(self) == len(other) and all(
+                a[:2] == tuple(b[:2]) and
+                (a[2] is None if b[2] is None else
+                 numpy.array_equal(a[2], b[2]))
+                for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return 'EvaluationTrace({!r})'.format(list(self))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only the used part of the arrays is pickled
+        return {'save_x_vals': self.save_x_vals,
+                'values': self.values.copy(),
+                'costs': self.costs.copy(),
+                'x_vals': self._x_vals[:self._size].copy()
+                          if self._x_vals is not None else None}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.save_x_vals = state['save_x_vals']
+        self._size = 0
+        self._values = numpy.empty(0)
+        self._costs = numpy.empty(0)
+        self._x_vals = None
+        self._restore(state['values'], state['costs'], state['x_vals'])
+
+    def _restore(self,
+                 values: numpy.ndarray,
+                 costs: numpy.ndarray,
+                 x_vals: Optional[numpy.ndarray]) -> None:
+        self._values = numpy.array(values, dtype=float)
+        self._costs = numpy.array(costs, dtype=float)
+        self._size = len(self._values)
+        if x_vals is not None and x_vals.size:
+            self._x_vals = numpy.array(x_vals, dtype=float)
+
+    def _reserve(self, size: int, dimension: Optional[int]) -> None:
+        """Make room for at least size evaluations."""
+        capacity = len(self._values)
+        if size > capacity:
+            capacity = max(size, 2 * capacity, 1)
+            self._values = _resized(self._values, capacity)
+            self._costs = _resized(self._costs, capacity)
+            if self._x_vals is not None:
+                self._x_vals = _resized(self._x_vals, capacity)
+        if dimension is not None and self._x_vals is None:
+            self._x_vals = numpy.empty((len(self._values), dimension))
+
+
+def _resized(array: numpy.ndarray, length: int) -> numpy.ndarray:
+    new_array = numpy.empty((length,) + array.shape[1:], dtype=array.dtype)
+    new_array[:len(array)] = array
+    return new_array
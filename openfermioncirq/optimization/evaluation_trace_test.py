@@ -0,0 +1,111 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import io
+import pickle
+
+import numpy
+import pytest
+
+from openfermioncirq.optimization import EvaluationTrace
+
+
+def test_evaluation_trace_append_and_extend():
+    trace = EvaluationTrace(save_x_vals=True, capacity=1)
+    trace.append(1.5, None, numpy.array([0.0, 1.0]))
+    trace.extend([2.5, 3.5, 4.5], 0.25, numpy.array([[1.0, 2.0],
+                                                     [3.0, 4.0],
+                                                     [5.0, 6.0]]))
+    trace.extend([], 1.0, [])
+
+    assert len(trace) == 4
+    numpy.testing.assert_allclose(trace.values, [1.5, 2.5, 3.5, 4.5])
+    numpy.testing.assert_allclose(trace.costs,
+                                  [numpy.nan, 0.25, 0.25, 0.25])
+    numpy.testing.assert_allclose(trace.x_vals, [[0.0, 1.0], [1.0, 2.0],
+                                                 [3.0, 4.0], [5.0, 6.0]])
+
+    y, z, x = trace[0]
+    assert y == 1.5
+    assert z is None
+    numpy.testing.assert_allclose(x, [0.0, 1.0])
+    y, z, x = trace[-1]
+    assert (y, z) == (4.5, 0.25)
+    numpy.testing.assert_allclose(x, [5.0, 6.0])
+    assert [y for y, _, _ in trace[1:3]] == [2.5, 3.5]
+    assert [y for y, _, _ in trace] == [1.5, 2.5, 3.5, 4.5]
+    with pytest.raises(IndexError):
+        _ = trace[4]
+
+
+def test_evaluation_trace_without_x_vals():
+    trace = EvaluationTrace()
+    assert trace.x_vals is None
+    for i in range(100):
+        trace.append(float(i), 1.0, numpy.array([i, i]))
+    assert len(trace) == 100
+    assert trace[7] == (7.0, 1.0, None)
+    assert trace == [(float(i), 1.0, None) for i in range(100)]
+    assert trace != [(float(i), 2.0, None) for i in range(100)]
+    assert trace != 'trace'
+
+
+def test_evaluation_trace_views():
+    trace = EvaluationTrace(save_x_vals=True)
+    assert trace.x_vals.shape == (0, 0)
+    trace.append(1.0, None, numpy.array([2.0]))
+    values = trace.values
+    values[0] = 3.0
+    assert trace[0][0] == 3.0
+
+
+def test_evaluation_trace_equality_with_list_of_points():
+    trace = EvaluationTrace(save_x_vals=True)
+    trace.append(1.0, None, numpy.array([2.0, 3.0]))
+    assert trace == [(1.0, None, numpy.array([2.0, 3.0]))]
+    assert trace != [(1.0, None, numpy.array([2.0, 4.0]))]
+    assert trace != [(1.0, None, None)]
+
+
+def test_evaluation_trace_save_load():
+    trace = EvaluationTrace(save_x_vals=True)
+    trace.extend([1.0, 2.0], None, numpy.array([[0.5], [1.5]]))
+    trace.append(3.0, 2.0, numpy.array([2.5]))
+
+    file = io.BytesIO()
+    trace.save(file)
+    file.seek(0)
+    loaded = EvaluationTrace.load(file)
+    assert loaded == trace
+    loaded.append(4.0, None, numpy.array([3.5]))
+    assert len(loaded) == 4
+
+    trace = EvaluationTrace()
+    trace.append(1.0, None, None)
+    file = io.BytesIO()
+    trace.save(file)
+    file.seek(0)
+    assert EvaluationTrace.load(file) == trace
+
+
+def test_evaluation_trace_pickle():
+    trace = EvaluationTrace(save_x_vals=True, capacity=10000)
+    trace.extend([1.0, 2.0], 1.0, numpy.array([[0.5, 1.0], [1.5, 2.0]]))
+    data = pickle.dumps(trace)
+    assert len(data) < 2000
+    unpickled = pickle.loads(data)
+    assert unpickled == trace
+    unpickled.append(3.0, 1.0, numpy.array([2.5, 3.0]))
+    assert len(unpickled) == 3
+
+    assert pickle.loads(pickle.dumps(EvaluationTrace())) == EvaluationTrace()
+    assert repr(EvaluationTrace()) == 'EvaluationTrace([])'
@@ -12,7 +12,8 @@
 
 """Classes for storing the results of running an optimization algorithm."""
 
-from typing import Iterable, List, Optional, TYPE_CHECKING, Tuple
+from typing import (Iterable, List, Optional, Sequence, TYPE_CHECKING,
+                    Tuple)
 
 import numpy
 import pandas
@@ -34,12 +35,12 @@ class OptimizationResult:
             evaluated in the course of the optimization.
         cost_spent: For objective functions with a cost model, the total cost
             spent on function evaluations.
-        function_values: A list of tuples storing function values of evaluated
-            points. The tuples contain three objects. The first is a function
-            value, the second is the cost that was used for the evaluation
-            (or None if there was no cost), and the third is the point that
-            was evaluated (or None if the black box was initialized with
-            `save_x_vals` set to False).
+        function_values: A list of tuples, or an EvaluationTrace, storing
+            function values of evaluated points. The tuples contain three
+            objects. The first is a function value, the second is the cost
+            that was used for the evaluation (or None if there was no cost),
+            and the third is the point that was evaluated (or None if the
+            black box was initialized with `save_x_vals` set to False).
         wait_times: A list of floats. The i-th float float represents the time
             elapsed between the i-th and (i+1)-th times that the black box
             was queried. Time is recorded using ``time.time()``.
@@ -54,11 +55,11 @@ class OptimizationResult:
                  optimal_parameters: numpy.ndarray,
                  num_evaluations: Optional[int]=None,
                  cost_spent: Optional[float]=None,
-                 function_values: Optional[List[Tuple[
+                 function_values: Optional[Sequence[Tuple[
                      float, Optional[float], Optional[numpy.ndarray]
                      ]]]=None,
                  wait_times: Optional[List[float]]=None,
-                 time: Optional[int]=None,
+                 time: Optional[float]=None,
                  seed: Optional[int]=None,
                  status: Optional[int]=None,
                  message: Optional[str]=None) -> None:
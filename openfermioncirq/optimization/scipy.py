@@ -28,19 +28,26 @@ class ScipyOptimizationAlgorithm(OptimizationAlgorithm):
     def __init__(self,
                  options: Optional[Dict]=None,
                  kwargs: Optional[Dict]=None,
-                 uses_bounds: bool=True) -> None:
+                 uses_bounds: bool=True,
+                 uses_gradient: bool=False) -> None:
         """
         Args:
             options: The `options` dictionary passed to scipy.optimize.minimize.
             kwargs: Other keyword arguments passed to scipy.optimize.minimize.
                 This should NOT include the `bounds` or `options` keyword
-                arguments.
+                arguments, or the `jac` keyword argument if `uses_gradient`
+                is True.
             uses_bounds: Whether the algorithm uses bounds on the input
                 variables. Set this to False to prevent scipy.optimize.minimize
                 from raising a warning if the chosen method does not use bounds.
+            uses_gradient: Whether the algorithm uses the gradient of the
+                objective function. If True, then the gradient of black boxes
+                that provide one is passed to scipy.optimize.minimize as the
+                `jac` keyword argument.
         """
         self.kwargs = kwargs or {}
         self.uses_bounds = uses_bounds
+        self.uses_gradient = uses_gradient
         super().__init__(options)
 
     def optimize(self,
@@ -52,11 +59,14 @@ class ScipyOptimizationAlgorithm(OptimizationAlgorithm):
             raise ValueError('The chosen optimization algorithm requires an '
                              'initial guess.')
         bounds = black_box.bounds if self.uses_bounds else None
+        kwargs = dict(self.kwargs)
+        if self.uses_gradient and black_box.has_gradient:
+            kwargs['jac'] = black_box.gradient
         result = scipy.optimize.minimize(black_box.evaluate,
                                          initial_guess,
                                          bounds=bounds,
                                          options=self.options,
-                                         **self.kwargs)
+                                         **kwargs)
         return OptimizationResult(optimal_value=result.fun,
                                   optimal_parameters=result.x,
                                   num_evaluations=result.nfev,
@@ -73,11 +83,13 @@ COBYLA = ScipyOptimizationAlgorithm(
         uses_bounds=False)
 
 L_BFGS_B = ScipyOptimizationAlgorithm(
-        kwargs={'method': 'L-BFGS-B'})
+        kwargs={'method': 'L-BFGS-B'},
+        uses_gradient=True)
 
 NELDER_MEAD = ScipyOptimizationAlgorithm(
         kwargs={'method': 'Nelder-Mead'},
         uses_bounds=False)
 
 SLSQP = ScipyOptimizationAlgorithm(
-        kwargs={'method': 'SLSQP'})
+        kwargs={'method': 'SLSQP'},
+        uses_gradient=True)
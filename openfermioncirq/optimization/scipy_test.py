@@ -35,6 +35,39 @@ def test_scipy_algorithm(algorithm):
     assert isinstance(result.message, (str, bytes))
 
 
+class ExampleBlackBoxWithGradient(ExampleBlackBox):
+
+    def __init__(self, **kwargs):
+        self.num_gradient_calls = 0
+        super().__init__(**kwargs)
+
+    @property
+    def has_gradient(self):
+        return True
+
+    def gradient(self, x):
+        self.num_gradient_calls += 1
+        return 2 * x
+
+
+@pytest.mark.parametrize('algorithm', [L_BFGS_B, SLSQP])
+def test_scipy_algorithm_uses_gradient(algorithm):
+    black_box = ExampleBlackBoxWithGradient()
+    result = algorithm.optimize(black_box, numpy.array([1.0, -2.0]))
+
+    assert black_box.num_gradient_calls > 0
+    numpy.testing.assert_allclose(result.optimal_parameters, [0.0, 0.0],
+                                  atol=1e-6)
+
+
+@pytest.mark.parametrize('algorithm', [COBYLA, NELDER_MEAD])
+def test_scipy_algorithm_ignores_gradient(algorithm):
+    black_box = ExampleBlackBoxWithGradient()
+    _ = algorithm.optimize(black_box, numpy.array([1.0, -2.0]))
+
+    assert black_box.num_gradient_calls == 0
+
+
 def test_scipy_algorithm_requires_initial_guess():
     black_box = ExampleBlackBox()
     with pytest.raises(ValueError):
@@ -12,15 +12,26 @@
 
 """Building blocks of algorithms for quantum simulation."""
 
-from openfermioncirq.primitives.bogoliubov_transform import bogoliubov_transform
+from openfermioncirq.primitives.bogoliubov_transform import (
+    bogoliubov_givens_network,
+    bogoliubov_transform)
 
 from openfermioncirq.primitives.ffft import ffft
 
+from openfermioncirq.primitives.givens_network import (
+    GivensNetwork,
+    apply_givens_network,
+    givens_decomposition_square)
+
 from openfermioncirq.primitives.optimal_givens_decomposition import (
-    optimal_givens_decomposition)
+    optimal_givens_decomposition,
+    parallel_optimal_givens_decomposition)
 
 from openfermioncirq.primitives.state_preparation import (
     prepare_gaussian_state,
     prepare_slater_determinant)
 
 from openfermioncirq.primitives.swap_network import swap_network
+
+from openfermioncirq.primitives.swap_network_fusion import (
+    FuseSwapNetworkGates)
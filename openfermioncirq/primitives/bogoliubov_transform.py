@@ -12,18 +12,19 @@
 
 """The Bogoliubov transformation."""
 
-from typing import (
-        Iterable, List, Optional, Sequence, Tuple, Union, cast)
+from typing import List, Optional, Sequence, Tuple, Union, cast
+
+import functools
 
 import numpy
 
 import cirq
 from openfermion import slater_determinant_preparation_circuit
-from openfermion.ops._givens_rotations import (
-        fermionic_gaussian_decomposition,
-        givens_decomposition_square)
+from openfermion.ops._givens_rotations import fermionic_gaussian_decomposition
 
-from openfermioncirq import Ryxxy
+from openfermioncirq.primitives.givens_network import (
+        GivensNetwork,
+        givens_decomposition_square)
 
 
 def bogoliubov_transform(
@@ -82,6 +83,10 @@ def bogoliubov_transform(
             qubits that are set to one (indexing starts from 0). For
             example, the list [2, 3] represents qubits 2 and 3 being set to one.
             Default is 0, the all zeros state.
+
+    The operations are cached, keyed on the qubits, the initial state and
+    the entries of the transformation matrix, so that the repeated basis
+    changes of a Trotter step are decomposed only once.
     """
 
     n_qubits = len(qubits)
@@ -93,6 +98,57 @@ def bogoliubov_transform(
                              (n_qubits, 2 * n_qubits),
                              shape))
 
+    if initial_state is not None and not isinstance(initial_state, int):
+        initial_state = tuple(initial_state)
+    yield _bogoliubov_operations(tuple(qubits),
+                                 transformation_matrix.tobytes(),
+                                 transformation_matrix.dtype.str,
+                                 shape,
+                                 initial_state)
+
+
+@functools.lru_cache(maxsize=128)
+def _bogoliubov_operations(
+        qubits: Tuple[cirq.Qid, ...],
+        matrix_bytes: bytes,
+        dtype: str,
+        shape: Tuple[int, int],
+        initial_state: Optional[Union[int, Tuple[int, ...]]]
+        ) -> Tuple[cirq.Operation, ...]:
+    """The operations of bogoliubov_transform for a serialized matrix."""
+    transformation_matrix = numpy.frombuffer(
+            matrix_bytes, dtype=dtype).reshape(shape).copy()
+    network = bogoliubov_givens_network(transformation_matrix, initial_state)
+    return tuple(network.operations(qubits))
+
+
+def bogoliubov_givens_network(
+        transformation_matrix: numpy.ndarray,
+        initial_state: Optional[Union[int, Sequence[int]]]=None
+        ) -> GivensNetwork:
+    """The network of Givens rotations of a Bogoliubov transformation.
+
+    The operations of the network on N qubits are those of
+    `bogoliubov_transform`, but the network holds them as arrays of angles
+    and qubit indices, so that it can be built and simulated without
+    creating any cirq operations.
+
+    Args:
+        transformation_matrix: The matrix :math:`W`; see
+            `bogoliubov_transform`. Its shape should be either :math:`NxN` or
+            :math:`Nx(2N)`.
+        initial_state: The computational basis state to assume that the
+            qubits start in; see `bogoliubov_transform`.
+    """
+    n_qubits = transformation_matrix.shape[0]
+    shape = transformation_matrix.shape
+    if shape not in [(n_qubits, n_qubits), (n_qubits, 2 * n_qubits)]:
+        raise ValueError('Bad shape for transformation_matrix. '
+                         'Expected {} or {} but got {}.'.format(
+                             (n_qubits, n_qubits),
+                             (n_qubits, 2 * n_qubits),
+                             shape))
+
     if isinstance(initial_state, int):
         initial_state = _occupied_orbitals(initial_state, n_qubits)
     initially_occupied_orbitals = cast(Optional[Sequence[int]], initial_state)
@@ -101,10 +157,7 @@ def bogoliubov_transform(
     # do each block separately
     if _is_spin_block_diagonal(transformation_matrix):
         up_block = transformation_matrix[:n_qubits//2, :n_qubits//2]
-        up_qubits = qubits[:n_qubits//2]
-
         down_block = transformation_matrix[n_qubits//2:, n_qubits//2:]
-        down_qubits = qubits[n_qubits//2:]
 
         if initially_occupied_orbitals is None:
             up_orbitals = None
@@ -115,22 +168,18 @@ def bogoliubov_transform(
             down_orbitals = [i-n_qubits//2 for i in initially_occupied_orbitals
                              if i >= n_qubits//2]
 
-        yield bogoliubov_transform(
-                up_qubits, up_block, initial_state=up_orbitals)
-        yield bogoliubov_transform(
-                down_qubits, down_block, initial_state=down_orbitals)
-        return
+        return bogoliubov_givens_network(
+                up_block, initial_state=up_orbitals).direct_sum(
+                        bogoliubov_givens_network(
+                            down_block, initial_state=down_orbitals))
 
     if shape == (n_qubits, n_qubits):
         # We're performing a particle-number conserving "Slater" basis change
-        yield _slater_basis_change(qubits,
-                                   transformation_matrix,
-                                   initially_occupied_orbitals)
-    else:
-        # We're performing a more general Gaussian unitary
-        yield _gaussian_basis_change(qubits,
-                                     transformation_matrix,
-                                     initially_occupied_orbitals)
+        return _slater_basis_change(transformation_matrix,
+                                    initially_occupied_orbitals)
+    # We're performing a more general Gaussian unitary
+    return _gaussian_basis_change(transformation_matrix,
+                                  initially_occupied_orbitals)
 
 
 def _is_spin_block_diagonal(matrix) -> bool:
@@ -150,42 +199,34 @@ def _occupied_orbitals(computational_basis_state: int, n_qubits) -> List[int]:
     return [j for j in range(len(bitstring)) if bitstring[j] == '1']
 
 
-def _slater_basis_change(qubits: Sequence[cirq.Qid],
-                         transformation_matrix: numpy.ndarray,
+def _slater_basis_change(transformation_matrix: numpy.ndarray,
                          initially_occupied_orbitals: Optional[Sequence[int]]
-                         ) -> cirq.OP_TREE:
-    n_qubits = len(qubits)
+                         ) -> GivensNetwork:
+    n_qubits = transformation_matrix.shape[0]
 
     if initially_occupied_orbitals is None:
-        decomposition, diagonal = givens_decomposition_square(
-                transformation_matrix)
-        circuit_description = list(reversed(decomposition))
+        network, diagonal = givens_decomposition_square(transformation_matrix)
         # The initial state is not a computational basis state so the
         # phases left on the diagonal in the decomposition matter
-        yield (cirq.rz(rads=numpy.angle(diagonal[j])).on(qubits[j])
-               for j in range(n_qubits))
-    else:
-        initially_occupied_orbitals = cast(
-                Sequence[int], initially_occupied_orbitals)
-        transformation_matrix = transformation_matrix[
-                list(initially_occupied_orbitals)]
-        n_occupied = len(initially_occupied_orbitals)
-        # Flip bits so that the first n_occupied are 1 and the rest 0
-        initially_occupied_orbitals_set = set(initially_occupied_orbitals)
-        yield (cirq.X(qubits[j]) for j in range(n_qubits)
-               if (j < n_occupied) != (j in initially_occupied_orbitals_set))
-        circuit_description = slater_determinant_preparation_circuit(
-                transformation_matrix)
-
-    yield _ops_from_givens_rotations_circuit_description(
-            qubits, circuit_description)
-
-
-def _gaussian_basis_change(qubits: Sequence[cirq.Qid],
-                           transformation_matrix: numpy.ndarray,
+        network.initial_phases = numpy.angle(diagonal)
+        return network
+
+    transformation_matrix = transformation_matrix[
+            list(initially_occupied_orbitals)]
+    n_occupied = len(initially_occupied_orbitals)
+    # Flip bits so that the first n_occupied are 1 and the rest 0
+    initial_flips = numpy.arange(n_qubits) < n_occupied
+    initial_flips[sorted(set(initially_occupied_orbitals))] ^= True
+    return GivensNetwork.from_circuit_description(
+            n_qubits,
+            slater_determinant_preparation_circuit(transformation_matrix),
+            initial_flips=initial_flips)
+
+
+def _gaussian_basis_change(transformation_matrix: numpy.ndarray,
                            initially_occupied_orbitals: Optional[Sequence[int]]
-                           ) -> cirq.OP_TREE:
-    n_qubits = len(qubits)
+                           ) -> GivensNetwork:
+    n_qubits = transformation_matrix.shape[0]
 
     # Rearrange the transformation matrix because the OpenFermion routine
     # expects it to describe annihilation operators rather than creation
@@ -198,6 +239,7 @@ def _gaussian_basis_change(qubits: Sequence[cirq.Qid],
     decomposition, left_decomposition, _, left_diagonal = (
         fermionic_gaussian_decomposition(transformation_matrix))
 
+    initial_phases = None
     if (initially_occupied_orbitals is not None and
             len(initially_occupied_orbitals) == 0):
         # Starting with the vacuum state yields additional symmetry
@@ -206,27 +248,8 @@ def _gaussian_basis_change(qubits: Sequence[cirq.Qid],
         if initially_occupied_orbitals is None:
             # The initial state is not a computational basis state so the
             # phases left on the diagonal in the Givens decomposition matter
-            yield (cirq.rz(rads=
-                       numpy.angle(left_diagonal[j])).on(qubits[j])
-                   for j in range(n_qubits))
+            initial_phases = numpy.angle(left_diagonal)
         circuit_description = list(reversed(decomposition + left_decomposition))
 
-    yield _ops_from_givens_rotations_circuit_description(
-            qubits, circuit_description)
-
-
-def _ops_from_givens_rotations_circuit_description(
-        qubits: Sequence[cirq.Qid],
-        circuit_description: Iterable[Iterable[
-            Union[str, Tuple[int, int, float, float]]]]) -> cirq.OP_TREE:
-    """Yield operations from a Givens rotations circuit obtained from
-    OpenFermion.
-    """
-    for parallel_ops in circuit_description:
-        for op in parallel_ops:
-            if op == 'pht':
-                yield cirq.X(qubits[-1])
-            else:
-                i, j, theta, phi = cast(Tuple[int, int, float, float], op)
-                yield Ryxxy(theta).on(qubits[i], qubits[j])
-                yield cirq.Z(qubits[j]) ** (phi / numpy.pi)
+    return GivensNetwork.from_circuit_description(
+            n_qubits, circuit_description, initial_phases=initial_phases)
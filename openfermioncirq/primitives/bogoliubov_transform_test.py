@@ -21,7 +21,7 @@ from openfermion.utils import (
         random_quadratic_hamiltonian, random_unitary_matrix)
 import pytest
 
-from openfermioncirq import bogoliubov_transform
+from openfermioncirq import bogoliubov_givens_network, bogoliubov_transform
 
 
 def fourier_transform_matrix(n_modes):
@@ -257,3 +257,38 @@ def test_bogoliubov_transform_bad_shape_raises_error():
     with pytest.raises(ValueError):
         _ = next(bogoliubov_transform(cirq.LineQubit.range(4),
                                       numpy.zeros((4, 7))))
+
+
+@pytest.mark.parametrize('transformation_matrix, initial_state', [
+    (random_unitary_matrix(4, seed=2045), None),
+    (random_unitary_matrix(4, seed=2045), [0, 2]),
+    (numpy.kron(numpy.eye(2), random_unitary_matrix(3, seed=7137)), None),
+    (random_quadratic_hamiltonian(
+        3, seed=5380).diagonalizing_bogoliubov_transform()[1], None),
+])
+def test_bogoliubov_givens_network(transformation_matrix, initial_state):
+    n_qubits = transformation_matrix.shape[0]
+    qubits = cirq.LineQubit.range(n_qubits)
+    network = bogoliubov_givens_network(transformation_matrix, initial_state)
+    assert network.n_qubits == n_qubits
+    assert (cirq.Circuit(network.operations(qubits)) ==
+            cirq.Circuit(bogoliubov_transform(qubits, transformation_matrix,
+                                              initial_state)))
+
+
+def test_bogoliubov_transform_caches_operations():
+    qubits = cirq.LineQubit.range(4)
+    u = random_unitary_matrix(4, seed=6173)
+    operations = list(cirq.flatten_op_tree(bogoliubov_transform(qubits, u)))
+
+    repeated = list(cirq.flatten_op_tree(
+            bogoliubov_transform(qubits, u.copy())))
+    assert all(a is b for a, b in zip(operations, repeated))
+
+    other_qubits = list(cirq.flatten_op_tree(
+            bogoliubov_transform(cirq.LineQubit.range(1, 5), u)))
+    assert other_qubits[0].qubits != operations[0].qubits
+
+    other_state = list(cirq.flatten_op_tree(
+            bogoliubov_transform(qubits, u, initial_state=[0, 1])))
+    assert other_state != operations
@@ -0,0 +1,392 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Networks of Givens rotations stored as arrays."""
+
+from typing import Iterable, List, Optional, Sequence, Tuple, Union, cast
+
+import numpy
+
+import cirq
+from openfermion.config import EQ_TOLERANCE
+
+from openfermioncirq.gates import Ryxxy
+
+
+class GivensNetwork:
+    """A circuit of Givens rotations on a line of qubits, stored as arrays.
+
+    The circuit consists of, in order,
+
+        1. X gates on the qubits j for which `initial_flips[j]` is True,
+        2. if `initial_phases` is not None, Rz(initial_phases[j]) on each
+           qubit j,
+        3. the rotations k = 0, 1, ..., len(self) - 1. If
+           `particle_hole[k]` is True, rotation k is a particle-hole
+           transformation, an X gate on the qubit `indices[k, 0]`. Otherwise
+           it is Ryxxy(thetas[k]) on the qubits `indices[k]`, followed by
+           Z**(phis[k] / π) on the qubit `indices[k, 1]`.
+
+    Rotations in the same layer act on disjoint qubits, and each rotation
+    comes after the rotations in earlier layers that share a qubit with it.
+
+    Attributes:
+        n_qubits: The number of qubits.
+        initial_flips: A boolean array of length n_qubits.
+        initial_phases: A float array of length n_qubits, or None.
+        indices: An integer array of shape (len(self), 2).
+        thetas: A float array of length len(self).
+        phis: A float array of length len(self).
+        particle_hole: A boolean array of length len(self).
+        layers: An integer array of length len(self) holding the index of
+            the parallel layer of each rotation.
+    """
+
+    def __init__(self,
+                 n_qubits: int,
+                 indices: numpy.ndarray,
+                 thetas: numpy.ndarray,
+                 phis: numpy.ndarray,
+                 layers: Union[numpy.ndarray, Sequence[int]],
+                 particle_hole: Optional[
+                     Union[numpy.ndarray, Sequence[bool]]]=None,
+                 initial_flips: Optional[
+                     Union[numpy.ndarray, Sequence[bool]]]=None,
+                 initial_phases: Optional[
+                     Union[numpy.ndarray, Sequence[float]]]=None) -> None:
+        self.n_qubits = n_qubits
+        self.indices = numpy.asarray(indices, dtype=int).reshape(-1, 2)
+        self.thetas = numpy.asarray(thetas, dtype=float)
+        self.phis = numpy.asarray(phis, dtype=float)
+        self.layers = numpy.asarray(layers, dtype=int)
+        self.particle_hole = (numpy.zeros(len(self.thetas), dtype=bool)
+                              if particle_hole is None else
+                              numpy.asarray(particle_hole, dtype=bool))
+        self.initial_flips = (numpy.zeros(n_qubits, dtype=bool)
+                              if initial_flips is None else
+                              numpy.asarray(initial_flips, dtype=bool))
+        self.initial_phases = (None if initial_phases is None else
+                               numpy.asarray(initial_phases, dtype=float))
+
+    @staticmethod
+    def from_circuit_description(
+            n_qubits: int,
+            circuit_description: Iterable[Iterable[
+                Union[str, Tuple[int, int, float, float]]]],
+            initial_flips: Optional[
+                Union[numpy.ndarray, Sequence[bool]]]=None,
+            initial_phases: Optional[
+                Union[numpy.ndarray, Sequence[float]]]=None
+            ) -> 'GivensNetwork':
+        """Converts a Givens rotations circuit description from OpenFermion.
+
+        Args:
+            n_qubits: The number of qubits.
+            circuit_description: A list of layers, each a list of rotations
+                (i, j, theta, phi) and particle-hole transformations 'pht'
+                on the last qubit.
+            initial_flips: See the class docstring.
+            initial_phases: See the class docstring.
+        """
+        rotations = []  # type: List[Tuple[int, int, float, float]]
+        layers = []  # type: List[int]
+        particle_hole = []  # type: List[bool]
+        for layer, parallel_ops in enumerate(circuit_description):
+            for op in parallel_ops:
+                if op == 'pht':
+                    rotations.append((n_qubits - 1, n_qubits - 1, 0., 0.))
+                else:
+                    rotations.append(
+                        cast(Tuple[int, int, float, float], op))
+                layers.append(layer)
+                particle_hole.append(op == 'pht')
+        table = numpy.array(rotations, dtype=float).reshape(-1, 4)
+        return GivensNetwork(n_qubits,
+                             indices=table[:, :2],
+                             thetas=table[:, 2],
+                             phis=table[:, 3],
+                             layers=layers,
+                             particle_hole=particle_hole,
+                             initial_flips=initial_flips,
+                             initial_phases=initial_phases)
+
+    def direct_sum(self, other: 'GivensNetwork') -> 'GivensNetwork':
+        """The network acting as self on the first qubits and as other on the
+        rest, with the layers of the two networks side by side."""
+        if self.initial_phases is None and other.initial_phases is None:
+            initial_phases = None
+        else:
+            initial_phases = numpy.concatenate([
+                numpy.zeros(network.n_qubits)
+                if network.initial_phases is None else network.initial_phases
+                for network in (self, other)])
+        return GivensNetwork(
+            self.n_qubits + other.n_qubits,
+            indices=numpy.concatenate(
+                [self.indices, other.indices + self.n_qubits]),
+            thetas=numpy.concatenate([self.thetas, other.thetas]),
+            phis=numpy.concatenate([self.phis, other.phis]),
+            layers=numpy.concatenate([self.layers, other.layers]),
+            particle_hole=numpy.concatenate(
+                [self.particle_hole, other.particle_hole]),
+            initial_flips=numpy.concatenate(
+                [self.initial_flips, other.initial_flips]),
+            initial_phases=initial_phases)
+
+    def operations(self, qubits: Sequence[cirq.Qid]
+                  ) -> Iterable[cirq.Operation]:
+        """The operations of the network on the given qubits."""
+        if len(qubits) != self.n_qubits:
+            raise ValueError('Expected {} qubits but got {}.'.format(
+                self.n_qubits, len(qubits)))
+        for j in numpy.flatnonzero(self.initial_flips):
+            yield cirq.X(qubits[j])
+        if self.initial_phases is not None:
+            for qubit, rads in zip(qubits, self.initial_phases):
+                yield cirq.rz(rads=rads).on(qubit)
+        for (i, j), theta, phi, particle_hole in zip(
+                self.indices.tolist(), self.thetas.tolist(),
+                self.phis.tolist(), self.particle_hole.tolist()):
+            if particle_hole:
+                yield cirq.X(qubits[i])
+            else:
+                yield Ryxxy(theta).on(qubits[i], qubits[j])
+                yield cirq.Z(qubits[j])**(phi / numpy.pi)
+
+    def __len__(self) -> int:
+        return len(self.thetas)
+
+    def __repr__(self) -> str:
+        return 'GivensNetwork(n_qubits={}, rotations={})'.format(
+            self.n_qubits, len(self))
+
+
+def apply_givens_network(network: GivensNetwork,
+                         state: numpy.ndarray) -> numpy.ndarray:
+    """Applies a network of Givens rotations to a state vector in place.
+
+    This has the same effect as simulating the circuit
+    `network.operations(qubits)` on the state, with the qubits in big-endian
+    order, but it never constructs cirq operations. Each rotation updates
+    the two affected quarters of the state with vectorized NumPy slicing.
+
+    Args:
+        network: The network to apply.
+        state: A C-contiguous complex array of length 2**network.n_qubits.
+            It is overwritten with the result.
+
+    Returns:
+        The state, for convenience.
+
+    Raises:
+        ValueError: The state has the wrong size, a real data type or is not
+            contiguous.
+    """
+    n_qubits = network.n_qubits
+    if state.shape != (2**n_qubits,):
+        raise ValueError('Expected a state vector of shape {} but got {}.'.
+                         format((2**n_qubits,), state.shape))
+    if not numpy.iscomplexobj(state):
+        raise ValueError('The state vector must have a complex data type.')
+    if not state.flags.c_contiguous:
+        raise ValueError('The state vector must be C-contiguous.')
+
+    buffers = numpy.empty((2, max(2**n_qubits // 2, 1)), dtype=state.dtype)
+
+    for j in numpy.flatnonzero(network.initial_flips):
+        _apply_x(state, n_qubits, j, buffers[0])
+    if network.initial_phases is not None:
+        for j, rads in enumerate(network.initial_phases.tolist()):
+            if rads:
+                view = _qubit_view(state, n_qubits, j)
+                view[:, 0, :] *= numpy.exp(-0.5j * rads)
+                view[:, 1, :] *= numpy.exp(0.5j * rads)
+
+    for (i, j), theta, phi, particle_hole in zip(
+            network.indices.tolist(), network.thetas.tolist(),
+            network.phis.tolist(), network.particle_hole.tolist()):
+        if particle_hole:
+            _apply_x(state, n_qubits, i, buffers[0])
+            continue
+        # Ryxxy(theta) mixes |01> and |10> on (i, j) by a real rotation
+        zero_one, one_zero = _pair_views(state, n_qubits, i, j)
+        cosine, sine = numpy.cos(theta), numpy.sin(theta)
+        old_zero_one = buffers[0, :zero_one.size].reshape(zero_one.shape)
+        scratch = buffers[1, :zero_one.size].reshape(zero_one.shape)
+        numpy.copyto(old_zero_one, zero_one)
+        zero_one *= cosine
+        numpy.multiply(one_zero, sine, out=scratch)
+        zero_one -= scratch
+        one_zero *= cosine
+        old_zero_one *= sine
+        one_zero += old_zero_one
+        if phi:
+            _qubit_view(state, n_qubits, j)[:, 1, :] *= numpy.exp(1j * phi)
+    return state
+
+
+def _qubit_view(state: numpy.ndarray, n_qubits: int,
+                j: int) -> numpy.ndarray:
+    """A view of the state whose middle axis is the qubit j."""
+    return state.reshape(2**j, 2, 2**(n_qubits - j - 1))
+
+
+def _pair_views(state: numpy.ndarray, n_qubits: int, i: int,
+                j: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Views of the amplitudes with qubits (i, j) in |01> and in |10>."""
+    low, high = min(i, j), max(i, j)
+    view = state.reshape(2**low, 2, 2**(high - low - 1), 2,
+                         2**(n_qubits - high - 1))
+    if i < j:
+        return view[:, 0, :, 1, :], view[:, 1, :, 0, :]
+    return view[:, 1, :, 0, :], view[:, 0, :, 1, :]
+
+
+def _apply_x(state: numpy.ndarray, n_qubits: int, j: int,
+             buffer: numpy.ndarray) -> None:
+    """Flips the qubit j of the state in place."""
+    view = _qubit_view(state, n_qubits, j)
+    zero = buffer[:view[:, 0, :].size].reshape(view[:, 0, :].shape)
+    numpy.copyto(zero, view[:, 0, :])
+    view[:, 0, :] = view[:, 1, :]
+    view[:, 1, :] = zero
+
+
+def givens_decomposition_square(unitary_matrix: numpy.ndarray
+                                ) -> Tuple[GivensNetwork, numpy.ndarray]:
+    r"""Decomposes a square matrix into layers of Givens rotations.
+
+    This computes the same decomposition :math:`Q = D G_k \cdots G_1` as
+    `openfermion.givens_decomposition_square`, but applies all rotations of
+    a layer at once with NumPy, so the number of Python-level steps is linear
+    rather than quadratic in the size of the matrix.
+
+    Args:
+        unitary_matrix: A square array with orthonormal rows.
+
+    Returns:
+        A network holding the rotations in the order in which they are
+        applied in a circuit, that is, :math:`G_k` first, and the diagonal
+        of :math:`D`.
+    """
+    current_matrix = numpy.array(unitary_matrix)
+    n = current_matrix.shape[0]
+    is_complex = numpy.iscomplexobj(current_matrix)
+    layers = []  # type: List[Tuple[numpy.ndarray, ...]]
+    for k in range(2 * (n - 1) - 1):
+        # The (row, column) indices of elements to zero out in parallel
+        if k < n - 1:
+            start_row, start_column = 0, n - 1 - k
+        else:
+            start_row, start_column = k - (n - 2), k - (n - 3)
+        columns = numpy.arange(start_column, n, 2)
+        rows = numpy.arange(start_row, start_row + len(columns))
+
+        right_elements = current_matrix[rows, columns].conj()
+        needed = numpy.abs(right_elements) > EQ_TOLERANCE
+        if not needed.any():
+            continue
+        rows, columns = rows[needed], columns[needed]
+        right_elements = right_elements[needed]
+        left_elements = current_matrix[rows, columns - 1].conj()
+
+        givens_rotations = givens_matrix_elements_batch(
+            left_elements, right_elements, 'right')
+        theta = numpy.arcsin(numpy.real(givens_rotations[:, 1, 0]))
+        phi = numpy.angle(givens_rotations[:, 1, 1])
+        if not is_complex:
+            givens_rotations = numpy.real(givens_rotations)
+        rotation = [givens_rotations[:, i, j]
+                    for i, j in ((0, 0), (0, 1), (1, 0), (1, 1))]
+        layers.append((columns - 1, columns, theta, phi))
+
+        # Rotate the columns as in openfermion.givens_rotate
+        left_columns = current_matrix[:, columns - 1]
+        right_columns = current_matrix[:, columns]
+        current_matrix[:, columns - 1] = (
+            rotation[0] * left_columns + rotation[1].conj() * right_columns)
+        current_matrix[:, columns] = (
+            rotation[2] * left_columns + rotation[3].conj() * right_columns)
+
+    diagonal = current_matrix[range(n), range(n)]
+
+    # The circuit applies the last rotations found first
+    layers.reverse()
+    if layers:
+        lefts, rights, thetas, phis = (numpy.concatenate(arrays)
+                                       for arrays in zip(*layers))
+        layer_indices = numpy.repeat(numpy.arange(len(layers)),
+                                     [len(layer[0]) for layer in layers])
+    else:
+        lefts = rights = layer_indices = numpy.zeros(0, dtype=int)
+        thetas = phis = numpy.zeros(0)
+    network = GivensNetwork(n,
+                            indices=numpy.stack([lefts, rights], axis=1),
+                            thetas=thetas,
+                            phis=phis,
+                            layers=layer_indices)
+    return network, diagonal
+
+
+def givens_matrix_elements_batch(a: numpy.ndarray, b: numpy.ndarray,
+                                 which: str) -> numpy.ndarray:
+    """Vectorized openfermion.givens_matrix_elements.
+
+    Args:
+        a, b: The pairs of elements to zero out, one pair per rotation.
+        which: 'left' to zero out the elements of a, 'right' for those of b.
+
+    Returns:
+        An array of shape (len(a), 2, 2) holding the Givens rotations.
+    """
+    abs_a, abs_b = numpy.abs(a), numpy.abs(b)
+    a_is_zero = abs_a < EQ_TOLERANCE
+    b_is_zero = ~a_is_zero & (abs_b < EQ_TOLERANCE)
+    general = ~(a_is_zero | b_is_zero)
+    denominator = numpy.where(general, numpy.sqrt(abs_a**2 + abs_b**2), 1.)
+    cosine = numpy.where(a_is_zero, 1.,
+                         numpy.where(b_is_zero, 0., abs_b / denominator))
+    sine = numpy.where(a_is_zero, 0.,
+                       numpy.where(b_is_zero, 1., abs_a / denominator))
+    phase = numpy.where(
+        general,
+        (a / numpy.where(general, abs_a, 1.)) *
+        (b / numpy.where(general, abs_b, 1.)).conjugate(), 1.)
+    # OpenFermion computes with real phases as floats, which matters for the
+    # sign of zero imaginary parts
+    real_phase = numpy.imag(phase) == 0
+    phase_real = numpy.real(phase)
+    phase_cosine = numpy.where(real_phase, phase_real * cosine,
+                               phase * cosine)
+    phase_sine = numpy.where(real_phase, phase_real * sine, phase * sine)
+    minus_phase_cosine = numpy.where(real_phase, -phase_real * cosine,
+                                     -phase * cosine)
+    minus_phase_sine = numpy.where(real_phase, -phase_real * sine,
+                                   -phase * sine)
+    real_elements = ((numpy.abs(numpy.imag(a)) < EQ_TOLERANCE) &
+                     (numpy.abs(numpy.imag(b)) < EQ_TOLERANCE))
+
+    givens_rotations = numpy.empty((len(a), 2, 2), dtype=complex)
+    if which == 'left':
+        givens_rotations[:, 0, 0] = cosine
+        givens_rotations[:, 0, 1] = minus_phase_sine
+        givens_rotations[:, 1, 0] = numpy.where(real_elements, phase_sine,
+                                                sine)
+        givens_rotations[:, 1, 1] = numpy.where(real_elements, cosine,
+                                                phase_cosine)
+    else:
+        givens_rotations[:, 0, 0] = sine
+        givens_rotations[:, 0, 1] = phase_cosine
+        givens_rotations[:, 1, 0] = numpy.where(real_elements,
+                                                minus_phase_cosine, cosine)
+        givens_rotations[:, 1, 1] = numpy.where(real_elements, sine,
+                                                minus_phase_sine)
+    return givens_rotations
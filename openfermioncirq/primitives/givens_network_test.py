@@ -0,0 +1,178 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import numpy
+import pytest
+
+import cirq
+import openfermion
+from openfermion.ops._givens_rotations import (
+        givens_decomposition_square as openfermion_givens_decomposition_square,
+        givens_matrix_elements)
+
+from openfermioncirq import (GivensNetwork, Ryxxy, apply_givens_network,
+                             bogoliubov_givens_network)
+from openfermioncirq.primitives import givens_decomposition_square
+from openfermioncirq.primitives.givens_network import (
+        givens_matrix_elements_batch)
+
+
+def _matrices(n):
+    random_state = numpy.random.RandomState(n)
+    yield openfermion.random_unitary_matrix(n, seed=n)
+    yield numpy.linalg.qr(random_state.randn(n, n))[0]
+    yield numpy.eye(n)
+    yield -numpy.eye(n)[random_state.permutation(n)]
+    yield numpy.diag(numpy.exp(1j * numpy.arange(n)))[
+            random_state.permutation(n)]
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 4, 7])
+def test_givens_decomposition_square_matches_openfermion(n):
+    for matrix in _matrices(n):
+        decomposition, diagonal = openfermion_givens_decomposition_square(
+                matrix)
+        network, actual_diagonal = givens_decomposition_square(matrix)
+
+        rotations = numpy.array([op for layer in reversed(decomposition)
+                                 for op in layer]).reshape(-1, 4)
+        layers = [k for k, layer in enumerate(reversed(decomposition))
+                  for _ in layer]
+        assert len(network) == len(rotations)
+        numpy.testing.assert_array_equal(network.indices, rotations[:, :2])
+        numpy.testing.assert_allclose(network.thetas, rotations[:, 2],
+                                      atol=1e-12)
+        numpy.testing.assert_allclose(network.phis, rotations[:, 3],
+                                      atol=1e-12)
+        numpy.testing.assert_array_equal(network.layers, layers)
+        numpy.testing.assert_allclose(actual_diagonal, diagonal, atol=1e-12)
+        assert not network.particle_hole.any()
+        assert network.initial_phases is None
+
+
+def test_givens_decomposition_square_does_not_modify_input():
+    matrix = openfermion.random_unitary_matrix(4, seed=3)
+    original = matrix.copy()
+    givens_decomposition_square(matrix)
+    numpy.testing.assert_array_equal(matrix, original)
+
+
+def test_givens_network_from_circuit_description():
+    network = GivensNetwork.from_circuit_description(
+            3,
+            [((0, 1, 0.5, 0.25),), ('pht', (1, 2, -0.5, 0.))],
+            initial_flips=[True, False, True],
+            initial_phases=[0.1, 0.2, 0.3])
+    assert len(network) == 3
+    numpy.testing.assert_array_equal(network.indices,
+                                     [[0, 1], [2, 2], [1, 2]])
+    numpy.testing.assert_array_equal(network.layers, [0, 1, 1])
+    numpy.testing.assert_array_equal(network.particle_hole,
+                                     [False, True, False])
+    assert repr(network) == 'GivensNetwork(n_qubits=3, rotations=3)'
+
+    a, b, c = cirq.LineQubit.range(3)
+    assert list(cirq.flatten_op_tree(network.operations([a, b, c]))) == [
+        cirq.X(a),
+        cirq.X(c),
+        cirq.rz(rads=0.1).on(a),
+        cirq.rz(rads=0.2).on(b),
+        cirq.rz(rads=0.3).on(c),
+        Ryxxy(0.5).on(a, b),
+        cirq.Z(b)**(0.25 / numpy.pi),
+        cirq.X(c),
+        Ryxxy(-0.5).on(b, c),
+        cirq.Z(c)**0.,
+    ]
+
+    with pytest.raises(ValueError):
+        _ = list(network.operations([a, b]))
+
+    empty = GivensNetwork.from_circuit_description(2, [])
+    assert len(empty) == 0
+    assert not list(empty.operations([a, b]))
+
+
+def test_givens_network_direct_sum():
+    first = GivensNetwork.from_circuit_description(
+            2, [((0, 1, 0.5, 0.25), 'pht')], initial_phases=[0.1, 0.2])
+    second = GivensNetwork.from_circuit_description(
+            3, [((1, 2, 0.3, 0.),)], initial_flips=[False, True, False])
+    network = first.direct_sum(second)
+    assert network.n_qubits == 5
+    numpy.testing.assert_array_equal(network.indices,
+                                     [[0, 1], [1, 1], [3, 4]])
+    numpy.testing.assert_array_equal(network.layers, [0, 0, 0])
+    numpy.testing.assert_array_equal(network.initial_flips,
+                                     [False, False, False, True, False])
+    numpy.testing.assert_array_equal(network.initial_phases,
+                                     [0.1, 0.2, 0, 0, 0])
+    assert second.direct_sum(second).initial_phases is None
+
+    qubits = cirq.LineQubit.range(5)
+    cirq.testing.assert_allclose_up_to_global_phase(
+            cirq.Circuit(network.operations(qubits)).unitary(qubits),
+            cirq.Circuit(first.operations(qubits[:2]),
+                         second.operations(qubits[2:])).unitary(qubits),
+            atol=1e-8)
+
+
+@pytest.mark.parametrize('network', [
+    bogoliubov_givens_network(openfermion.random_unitary_matrix(4, seed=9),
+                              None),
+    bogoliubov_givens_network(openfermion.random_unitary_matrix(4, seed=9),
+                              [1, 2]),
+    bogoliubov_givens_network(
+        openfermion.random_quadratic_hamiltonian(
+            3, seed=41).diagonalizing_bogoliubov_transform()[1], None),
+    GivensNetwork.from_circuit_description(
+        4, [((2, 0, 0.3, -1.2), (3, 1, -0.7, 0.)), ('pht',)],
+        initial_flips=[False, True, True, False],
+        initial_phases=[0.1, 0., -0.4, 2.]),
+    GivensNetwork.from_circuit_description(1, [('pht',)],
+                                           initial_phases=[0.5]),
+])
+def test_apply_givens_network(network):
+    qubits = cirq.LineQubit.range(network.n_qubits)
+    circuit = cirq.Circuit(network.operations(qubits))
+    state = openfermion.haar_random_vector(2**network.n_qubits,
+                                           seed=network.n_qubits)
+    state = state.astype(numpy.complex128)
+    expected = circuit.final_wavefunction(state.astype(numpy.complex64),
+                                          qubit_order=qubits)
+    actual = state.copy()
+    assert apply_givens_network(network, actual) is actual
+    numpy.testing.assert_allclose(actual, expected, atol=1e-6)
+
+
+def test_apply_givens_network_bad_state_raises_error():
+    network = GivensNetwork.from_circuit_description(2, [])
+    with pytest.raises(ValueError):
+        apply_givens_network(network, numpy.zeros(8, dtype=complex))
+    with pytest.raises(ValueError):
+        apply_givens_network(network, numpy.zeros(4))
+    with pytest.raises(ValueError):
+        apply_givens_network(network, numpy.zeros(8, dtype=complex)[::2])
+
+
+@pytest.mark.parametrize('which', ['left', 'right'])
+def test_givens_matrix_elements_batch(which):
+    random_state = numpy.random.RandomState(0)
+    a = numpy.concatenate([random_state.randn(3) + 1j * random_state.randn(3),
+                           random_state.randn(3), [0, 0.5, 0]])
+    b = numpy.concatenate([random_state.randn(3) + 1j * random_state.randn(3),
+                           random_state.randn(3), [0.5j, 0, 0]])
+    givens_rotations = givens_matrix_elements_batch(a, b, which)
+    assert givens_rotations.shape == (len(a), 2, 2)
+    for k in range(len(a)):
+        numpy.testing.assert_allclose(
+            givens_rotations[k], givens_matrix_elements(a[k], b[k], which))
@@ -0,0 +1,37 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""Helpers for building circuits directly as moments."""
+
+from typing import Dict, Iterable, List
+
+import cirq
+
+
+def pack_into_moments(operations: Iterable[cirq.Operation]
+                      ) -> List[cirq.Moment]:
+    """Places each operation in the earliest moment after the previous
+    operations on its qubits.
+
+    The moments are those of `cirq.Circuit(operations)`, built without
+    searching the circuit for each insertion. Operations that act on no
+    qubits go in the first moment.
+    """
+    moment_operations = []  # type: List[List[cirq.Operation]]
+    depths = {}  # type: Dict[cirq.Qid, int]
+    for op in operations:
+        index = max((depths.get(qubit, 0) for qubit in op.qubits), default=0)
+        if index == len(moment_operations):
+            moment_operations.append([])
+        moment_operations[index].append(op)
+        for qubit in op.qubits:
+            depths[qubit] = index + 1
+    return [cirq.Moment(ops) for ops in moment_operations]
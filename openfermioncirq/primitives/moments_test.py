@@ -0,0 +1,26 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import cirq
+
+from openfermioncirq.primitives.moments import pack_into_moments
+
+
+def test_pack_into_moments():
+    a, b, c = cirq.LineQubit.range(3)
+    operations = [cirq.X(a), cirq.CZ(b, c), cirq.GlobalPhaseOperation(-1),
+                  cirq.CZ(a, b), cirq.Y(c), cirq.Z(a)]
+    moments = pack_into_moments(operations)
+    assert moments == list(cirq.Circuit(operations))
+    assert len(moments) == 3
+
+    assert pack_into_moments([]) == []
@@ -17,7 +17,7 @@ of this circuit can be found in Optica Vol. 3, Issue 12, pp. 1460-1465 (2016).
 This Givens network improves upon the parallel Givens network for implementing
 basis rotations in Phys. Rev. Lett. 120, 110501 (2018).
 """
-from typing import cast, Iterable, Sequence, Tuple
+from typing import cast, Iterable, List, Sequence, Tuple
 
 import numpy
 import cirq
@@ -25,6 +25,9 @@ import cirq
 from openfermion.ops._givens_rotations import (givens_matrix_elements,
                                                givens_rotate)
 from openfermioncirq import Ryxxy
+from openfermioncirq.primitives.givens_network import (
+    givens_matrix_elements_batch)
+from openfermioncirq.primitives.moments import pack_into_moments
 
 
 class GivensTranspositionError(Exception):
@@ -135,3 +138,127 @@ def optimal_givens_decomposition(qubits: Sequence[cirq.Qid],
 
     for idx, phase in enumerate(phases):
         yield cirq.Z(qubits[idx]) ** (numpy.angle(phase) / numpy.pi)
+
+
+def parallel_optimal_givens_decomposition(qubits: Sequence[cirq.Qid],
+                                          unitary: numpy.ndarray
+                                          ) -> List[cirq.Moment]:
+    """The circuit of `optimal_givens_decomposition`, packed into moments.
+
+    The eliminations are computed in the same order as in
+    `optimal_givens_decomposition`, since each of them reads entries written
+    by the one before. Moving the phases through the row rotations is done
+    in waves of rotations on disjoint pairs of modes, with batched 2x2
+    updates, and the angles and consistency checks of all rotations are
+    computed at once. The operations are then placed in the earliest moment
+    in which their qubits are free.
+
+    Unlike `optimal_givens_decomposition`, this does not modify `unitary`.
+
+    Args:
+        qubits: Sequence of qubits to apply the operations over.  The qubits
+                should be ordered in linear physical order.
+        unitary: The N x N unitary matrix of the basis rotation.
+
+    Returns:
+        The moments of the circuit.
+    """
+    unitary = numpy.array(unitary, dtype=complex)
+    N = unitary.shape[0]
+    right_gmats = []  # type: List[numpy.ndarray]
+    right_indices = []  # type: List[int]
+    left_gmats = []  # type: List[numpy.ndarray]
+    left_indices = []  # type: List[int]
+    for i in range(1, N):
+        if i % 2 == 1:
+            for j in range(0, i):
+                k = i - j - 1
+                gmat = givens_matrix_elements(unitary[N - j - 1, k],
+                                              unitary[N - j - 1, k + 1],
+                                              which='left')
+                right_gmats.append(gmat)
+                right_indices.append(k)
+                givens_rotate(unitary, gmat.conj(), k, k + 1, which='col')
+        else:
+            for j in range(1, i + 1):
+                k = N + j - i - 2
+                gmat = givens_matrix_elements(unitary[k, j - 1],
+                                              unitary[k + 1, j - 1],
+                                              which='right')
+                left_gmats.append(gmat)
+                left_indices.append(k)
+                givens_rotate(unitary, gmat, k, k + 1, which='row')
+
+    # Move the phases through the row rotations, as in
+    # optimal_givens_decomposition, in waves of disjoint pairs
+    left_gmats_array = numpy.array(left_gmats[::-1],
+                                   dtype=complex).reshape((-1, 2, 2))
+    left_indices_array = numpy.array(left_indices[::-1], dtype=int)
+    new_left_gmats = numpy.empty_like(left_gmats_array)
+    for wave in _schedule_pairs(left_indices_array, N):
+        i = left_indices_array[wave]
+        phases = numpy.stack([unitary[i, i], unitary[i + 1, i + 1]], axis=1)
+        matrix_to_decompose = (
+            left_gmats_array[wave].conj().transpose(0, 2, 1) *
+            phases[:, numpy.newaxis, :])
+        new_givens_matrix = givens_matrix_elements_batch(
+            matrix_to_decompose[:, 1, 0], matrix_to_decompose[:, 1, 1], 'left')
+        new_phase_matrix = numpy.matmul(matrix_to_decompose,
+                                        new_givens_matrix.transpose(0, 2, 1))
+
+        # check if T_{m,n}^{-1}D  = D T.
+        # coverage: ignore
+        if not numpy.allclose(
+                numpy.matmul(new_phase_matrix, new_givens_matrix.conj()),
+                matrix_to_decompose):
+            raise GivensTranspositionError(
+                "Failed to shift the phase matrix "
+                "from right to left")
+        # coverage: ignore
+
+        unitary[i, i] = new_phase_matrix[:, 0, 0]
+        unitary[i + 1, i + 1] = new_phase_matrix[:, 1, 1]
+        new_left_gmats[wave] = new_givens_matrix.conj()
+
+    # The rotations in the order in which optimal_givens_decomposition
+    # yields them
+    gmats = numpy.concatenate([
+        numpy.array(right_gmats, dtype=complex).reshape((-1, 2, 2)).conj(),
+        new_left_gmats])
+    indices = right_indices + left_indices_array.tolist()
+
+    # coverage: ignore
+    if not numpy.allclose(gmats[:, :, 0].imag, 0.0):
+        raise GivensMatrixError(
+            "Givens matrix does not obey our convention that all elements "
+            "in the first column are real")
+    # coverage: ignore
+
+    thetas = numpy.arcsin(numpy.real(gmats[:, 1, 0]))
+    phis = numpy.angle(gmats[:, 1, 1])
+    nonzero_phis = ~numpy.isclose(phis, 0.0)
+
+    operations = []  # type: List[cirq.Operation]
+    for i, theta, phi, nonzero_phi in zip(indices, thetas.tolist(),
+                                          phis.tolist(),
+                                          nonzero_phis.tolist()):
+        if nonzero_phi:
+            operations.append(cirq.Z(qubits[i + 1]) ** (phi / numpy.pi))
+        operations.append(Ryxxy(-theta).on(qubits[i], qubits[i + 1]))
+    for idx, phase in enumerate(numpy.angle(numpy.diag(unitary)).tolist()):
+        operations.append(cirq.Z(qubits[idx]) ** (phase / numpy.pi))
+    return pack_into_moments(operations)
+
+
+def _schedule_pairs(indices: numpy.ndarray, N: int) -> List[numpy.ndarray]:
+    """Groups updates of the pairs (i, i + 1) into waves of disjoint pairs,
+    keeping the order of the updates that share an index."""
+    last_wave = [-1] * N
+    waves = []  # type: List[List[int]]
+    for k, i in enumerate(indices.tolist()):
+        wave = max(last_wave[i], last_wave[i + 1]) + 1
+        last_wave[i] = last_wave[i + 1] = wave
+        if wave == len(waves):
+            waves.append([])
+        waves[wave].append(k)
+    return [numpy.array(wave, dtype=int) for wave in waves]
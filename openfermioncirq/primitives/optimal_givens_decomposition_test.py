@@ -19,8 +19,8 @@ from openfermion.ops._givens_rotations import (givens_matrix_elements,
 from openfermion.ops import QubitOperator, FermionOperator
 from openfermion.transforms import jordan_wigner, get_sparse_operator
 
-from openfermioncirq.primitives.optimal_givens_decomposition import \
-    optimal_givens_decomposition
+from openfermioncirq.primitives.optimal_givens_decomposition import (
+    optimal_givens_decomposition, parallel_optimal_givens_decomposition)
 
 
 def test_givens_inverse():
@@ -238,3 +238,33 @@ def test_circuit_generation_state():
     test_final_state = test_unitary.dot(wavefunction)
     cirq_wf = simulator.simulate(circuit).final_state
     assert numpy.allclose(cirq_wf, test_final_state.flatten())
+
+
+def test_parallel_optimal_givens_decomposition():
+    for dim in range(1, 10):
+        qubits = cirq.LineQubit.range(dim)
+        random_state = numpy.random.RandomState(dim)
+        u_generator = random_state.random_sample(
+            (dim, dim)) + 1j * random_state.random_sample((dim, dim))
+        u_generator = u_generator - numpy.conj(u_generator).T
+        unitary = scipy.linalg.expm(u_generator)
+        original = unitary.copy()
+
+        moments = parallel_optimal_givens_decomposition(qubits, unitary)
+        assert numpy.array_equal(unitary, original)
+        circuit = cirq.Circuit(optimal_givens_decomposition(qubits, unitary))
+        assert len(moments) == len(circuit)
+        for moment, expected_moment in zip(moments, circuit):
+            assert cirq.approx_eq(moment, expected_moment, atol=1e-10)
+
+
+def test_parallel_optimal_givens_decomposition_real_permutation():
+    dim = 6
+    qubits = cirq.LineQubit.range(dim)
+    unitary = -numpy.eye(dim)[numpy.random.RandomState(5).permutation(dim)]
+    moments = parallel_optimal_givens_decomposition(qubits, unitary)
+    circuit = cirq.Circuit(optimal_givens_decomposition(qubits,
+                                                        unitary.copy()))
+    numpy.testing.assert_allclose(cirq.Circuit(moments).unitary(),
+                                  circuit.unitary(),
+                                  atol=1e-10)
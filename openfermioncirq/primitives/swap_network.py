@@ -12,11 +12,12 @@
 
 """The linear swap network."""
 
-from typing import Callable, cast, Iterable, List, Sequence
+from typing import Callable, cast, Iterable, List, Sequence, Union
 
 import cirq
 
 from openfermioncirq import FSWAP
+from openfermioncirq.primitives.moments import pack_into_moments
 
 
 def swap_network(qubits: Sequence[cirq.Qid],
@@ -24,7 +25,9 @@ def swap_network(qubits: Sequence[cirq.Qid],
                      [int, int, cirq.Qid, cirq.Qid], cirq.OP_TREE
                  ] = lambda p, q, p_qubit, q_qubit: (),
                  fermionic: bool=False,
-                 offset: bool=False) -> List[cirq.Operation]:
+                 offset: bool=False,
+                 as_moments: bool=False
+                 ) -> Union[List[cirq.Operation], List[cirq.Moment]]:
     """Apply operations to pairs of qubits or modes using a swap network.
 
     This is used for applying operations between arbitrary pairs of qubits or
@@ -117,11 +120,28 @@ def swap_network(qubits: Sequence[cirq.Qid],
             swaps.
         offset: If True, then qubit 0 will participate in odd-numbered layers
             instead of even-numbered layers.
+        as_moments: If True, return the moments of the circuit instead of a
+            flat list of operations. Each operation is placed in the moment
+            after the last one acting on any of its qubits while the network
+            is built, so `cirq.Circuit` does not have to search for it. The
+            moments are those of `cirq.Circuit(swap_network(...))`.
     """
+    operations = _swap_network_operations(
+        qubits, operation, fermionic, offset)
+    if as_moments:
+        return pack_into_moments(operations)
+    return list(operations)
+
+
+def _swap_network_operations(
+        qubits: Sequence[cirq.Qid],
+        operation: Callable[
+            [int, int, cirq.Qid, cirq.Qid], cirq.OP_TREE],
+        fermionic: bool,
+        offset: bool) -> Iterable[cirq.Operation]:
     n_qubits = len(qubits)
     order = list(range(n_qubits))
     swap_gate = FSWAP if fermionic else cirq.SWAP
-    result = []  # type: List[cirq.Operation]
 
     for layer_num in range(n_qubits):
         lowest_active_qubit = (layer_num + offset) % 2
@@ -130,9 +150,7 @@ def swap_network(qubits: Sequence[cirq.Qid],
         for i, j in active_pairs:
             p, q = order[i], order[j]
             extra_ops = operation(p, q, qubits[i], qubits[j])
-            result.extend(cast(Iterable[cirq.Operation],
-                cirq.flatten_op_tree(extra_ops)))
-            result.append(swap_gate(qubits[i], qubits[j]))
+            yield from cast(Iterable[cirq.Operation],
+                cirq.flatten_op_tree(extra_ops))
+            yield swap_gate(qubits[i], qubits[j])
             order[i], order[j] = q, p
-
-    return result
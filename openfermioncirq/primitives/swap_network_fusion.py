@@ -0,0 +1,144 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""An optimization pass that fuses the gates of a swap network."""
+
+from typing import cast, List, Optional, Tuple
+
+import numpy as np
+import cirq
+
+
+class FuseSwapNetworkGates(cirq.PointOptimizer):
+    """Fuses runs of gates acting on the same pair of qubits into one gate.
+
+    In a circuit produced by `swap_network`, each interaction between two
+    modes is followed by a (fermionic) swap on the same pair of qubits. This
+    pass replaces every maximal run of operations that act only on one pair
+    of qubits, and that starts with a two-qubit operation, by a single
+    two-qubit gate with the same unitary. Single-qubit operations on either
+    qubit are absorbed into the run. The run ends at the first operation that
+    couples one of the qubits to a different qubit or that has no unitary
+    (for example, a parameterized gate or a measurement).
+
+    The fused gate is a `cirq.FSimGate` if the unitary of the run has that
+    form, and a `cirq.MatrixGate` otherwise. Runs whose unitary is the
+    identity are removed. The pass does not change the unitary of the
+    circuit, including its global phase.
+
+    Example:
+
+    .. code-block:: python
+
+        circuit = cirq.Circuit(swap_network(qubits, interaction,
+                                            fermionic=True))
+        FuseSwapNetworkGates().optimize_circuit(circuit)
+    """
+
+    def __init__(self, tolerance: float = 1e-8, use_fsim: bool = True) -> None:
+        """
+        Args:
+            tolerance: The absolute tolerance used to recognize FSim gates
+                and the identity.
+            use_fsim: Whether to replace runs by FSim gates when possible.
+        """
+        super().__init__()
+        self.tolerance = tolerance
+        self.use_fsim = use_fsim
+
+    def optimization_at(self, circuit: cirq.Circuit, index: int,
+                        op: cirq.Operation
+                       ) -> Optional[cirq.PointOptimizationSummary]:
+        if len(op.qubits) != 2 or _op_to_matrix(op, op.qubits) is None:
+            return None
+
+        operations, indices, matrix = _scan_two_qubit_run(
+            circuit, index, op.qubits)
+        if len(operations) < 2:
+            return None
+
+        a, b = op.qubits
+        if np.allclose(matrix, np.eye(4), atol=self.tolerance):
+            new_operations = []  # type: List[cirq.Operation]
+        else:
+            new_operations = [self._fused_gate(matrix).on(a, b)]
+        return cirq.PointOptimizationSummary(clear_span=max(indices) + 1 -
+                                             index,
+                                             clear_qubits=op.qubits,
+                                             new_operations=new_operations)
+
+    def _fused_gate(self, matrix: np.ndarray) -> cirq.Gate:
+        if self.use_fsim:
+            fsim = _fsim_gate(matrix, self.tolerance)
+            if fsim is not None:
+                return fsim
+        return cirq.MatrixGate(matrix)
+
+
+def _fsim_gate(matrix: np.ndarray,
+               tolerance: float) -> Optional[cirq.FSimGate]:
+    """The FSim gate with the given unitary, if there is one."""
+    theta = np.arctan2(np.real(1j * matrix[1, 2]), np.real(matrix[1, 1]))
+    phi = -np.angle(matrix[3, 3])
+    gate = cirq.FSimGate(theta=theta, phi=phi)
+    if np.allclose(cirq.unitary(gate), matrix, atol=tolerance):
+        return gate
+    return None
+
+
+def _scan_two_qubit_run(circuit: cirq.Circuit, index: Optional[int],
+                        qubits: Tuple[cirq.Qid, ...]
+                       ) -> Tuple[List[cirq.Operation], List[int], np.ndarray]:
+    """Accumulates the operations acting only on a pair of qubits.
+
+    Returns:
+        The operations, the indices of the moments they are in, and the
+        unitary of the operations on the qubits in the given order.
+    """
+    product = np.eye(4, dtype=np.complex128)
+    operations = []  # type: List[cirq.Operation]
+    indices = []  # type: List[int]
+    while index is not None:
+        moment_operations = []  # type: List[cirq.Operation]
+        for qubit in qubits:
+            op = circuit.operation_at(qubit, index)
+            if op is not None and op not in moment_operations:
+                moment_operations.append(op)
+        matrices = [_op_to_matrix(op, qubits) for op in moment_operations]
+        if any(matrix is None for matrix in matrices):
+            break
+        for matrix in matrices:
+            product = cast(np.ndarray, matrix).dot(product)
+        operations.extend(moment_operations)
+        indices.append(index)
+        index = circuit.next_moment_operating_on(qubits, index + 1)
+    return operations, indices, product
+
+
+def _op_to_matrix(op: cirq.Operation,
+                  qubits: Tuple[cirq.Qid, ...]) -> Optional[np.ndarray]:
+    """The unitary of an operation on some of the qubits, on both qubits.
+
+    Returns None if the operation acts on other qubits or has no unitary.
+    """
+    if any(qubit not in qubits for qubit in op.qubits):
+        return None
+    matrix = cirq.unitary(op, None)
+    if matrix is None:
+        return None
+    a, b = qubits
+    if op.qubits == (a, b):
+        return matrix
+    if op.qubits == (b, a):
+        return matrix.reshape((2,) * 4).transpose(1, 0, 3, 2).reshape(4, 4)
+    if op.qubits == (a,):
+        return np.kron(matrix, np.eye(2))
+    return np.kron(np.eye(2), matrix)
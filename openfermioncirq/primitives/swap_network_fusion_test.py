@@ -0,0 +1,113 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import numpy
+import pytest
+import sympy
+
+import cirq
+
+from openfermioncirq import FuseSwapNetworkGates, swap_network
+from openfermioncirq.gates import FSWAP
+
+
+def _fused(circuit, **kwargs):
+    fused = circuit.copy()
+    FuseSwapNetworkGates(**kwargs).optimize_circuit(fused)
+    return fused
+
+
+@pytest.mark.parametrize('fermionic,offset', [(False, False), (True, False),
+                                              (True, True)])
+def test_fuse_swap_network_gates(fermionic, offset):
+    qubits = cirq.LineQubit.range(5)
+
+    def interaction(i, j, a, b):
+        yield cirq.CZ(a, b)**(0.1 * (i + j + 1))
+        yield cirq.ISwapPowGate(exponent=0.3 * (i - j))(a, b)
+
+    circuit = cirq.Circuit(
+        swap_network(qubits, interaction, fermionic=fermionic, offset=offset))
+    fused = _fused(circuit)
+
+    numpy.testing.assert_allclose(cirq.unitary(fused),
+                                  cirq.unitary(circuit),
+                                  atol=1e-8)
+    assert all(
+        isinstance(op.gate, cirq.MatrixGate) for op in fused.all_operations())
+    assert (len(list(fused.all_operations())) ==
+            len(list(circuit.all_operations())) // 3)
+
+
+def test_fuse_swap_network_gates_fsim_gate():
+    a, b = cirq.LineQubit.range(2)
+    circuit = cirq.Circuit([cirq.ISWAP(a, b)**-0.3, cirq.CZ(b, a)**0.2])
+    fused = _fused(circuit)
+    (op,) = fused.all_operations()
+    assert op.qubits == (a, b)
+    assert cirq.approx_eq(op.gate,
+                          cirq.FSimGate(theta=0.15 * numpy.pi,
+                                        phi=-0.2 * numpy.pi))
+    numpy.testing.assert_allclose(cirq.unitary(fused),
+                                  cirq.unitary(circuit),
+                                  atol=1e-8)
+
+
+def test_fuse_swap_network_gates_matrix_gate():
+    a, b = cirq.LineQubit.range(2)
+    circuit = cirq.Circuit([cirq.X(a), cirq.CNOT(a, b), cirq.Y(b), FSWAP(b, a)])
+    for use_fsim in (True, False):
+        fused = _fused(circuit, use_fsim=use_fsim)
+        ops = list(fused.all_operations())
+        # The leading single-qubit gate is not part of the run
+        assert len(ops) == 2
+        assert isinstance(ops[1].gate, cirq.MatrixGate)
+        numpy.testing.assert_allclose(cirq.unitary(fused),
+                                      cirq.unitary(circuit),
+                                      atol=1e-8)
+
+    circuit = cirq.Circuit([cirq.ISWAP(a, b)**0.5, cirq.CZ(a, b)**0.25])
+    fused = _fused(circuit, use_fsim=False)
+    assert isinstance(fused[0].operations[0].gate, cirq.MatrixGate)
+
+
+def test_fuse_swap_network_gates_removes_identity():
+    a, b = cirq.LineQubit.range(2)
+    circuit = cirq.Circuit([FSWAP(a, b), FSWAP(b, a)])
+    assert not list(_fused(circuit).all_operations())
+
+
+def test_fuse_swap_network_gates_stops_at_other_operations():
+    a, b, c = cirq.LineQubit.range(3)
+    t = sympy.Symbol('t')
+    circuit = cirq.Circuit([
+        cirq.CZ(a, b),
+        FSWAP(a, b),
+        cirq.CZ(b, c),
+        FSWAP(a, b),
+        cirq.ISWAP(a, b)**t,
+        FSWAP(a, b),
+        cirq.measure(a, b),
+    ])
+    fused = _fused(circuit)
+    assert [type(op.gate) for op in fused.all_operations()] == [
+        cirq.MatrixGate,
+        cirq.CZPowGate,
+        type(FSWAP),
+        cirq.ISwapPowGate,
+        type(FSWAP),
+        cirq.MeasurementGate,
+    ]
+    resolved = cirq.resolve_parameters(circuit, {t: 0.3})
+    fused = cirq.resolve_parameters(fused, {t: 0.3})
+    cirq.testing.assert_circuits_with_terminal_measurements_are_equivalent(
+        fused, resolved, atol=1e-8)
@@ -97,3 +97,37 @@ iSwap─iSwap^-1 iSwap────iSwap^-1
 def test_reusable():
     ops = swap_network(cirq.LineQubit.range(5))
     assert list(ops) == list(ops)
+
+
+def test_swap_network_as_moments():
+    qubits = cirq.LineQubit.range(5)
+
+    def operation(i, j, a, b):
+        if (i + j) % 3:
+            yield cirq.CZ(a, b)**0.5
+            yield cirq.ISWAP(a, b)
+        if i == 0:
+            yield cirq.X(a)
+
+    for fermionic in (False, True):
+        for offset in (False, True):
+            moments = swap_network(qubits, operation, fermionic=fermionic,
+                                   offset=offset, as_moments=True)
+            assert all(isinstance(moment, cirq.Moment) for moment in moments)
+            assert cirq.Circuit(moments) == cirq.Circuit(
+                    swap_network(qubits, operation, fermionic=fermionic,
+                                 offset=offset))
+
+    assert swap_network([], as_moments=True) == []
+
+
+def test_swap_network_as_moments_with_zero_qubit_operations():
+    qubits = cirq.LineQubit.range(3)
+
+    def operation(i, j, a, b):
+        yield cirq.GlobalPhaseOperation(1j)
+        yield cirq.CZ(a, b)
+
+    moments = swap_network(qubits, operation, as_moments=True)
+    assert cirq.Circuit(moments) == cirq.Circuit(
+            swap_network(qubits, operation))
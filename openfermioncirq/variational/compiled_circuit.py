@@ -0,0 +1,482 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Circuits analysed once for repeated simulation with new parameters."""
+
+from typing import (Any, Callable, Dict, List, Optional, Sequence, Tuple,
+                    Union)
+
+import numpy
+import sympy
+
+import cirq
+
+
+class CompiledCircuit:
+    """A parameterized circuit prepared for repeated simulation.
+
+    Simulating a parameterized circuit with `cirq.resolve_parameters`
+    followed by `final_wavefunction` rebuilds the whole circuit and performs
+    sympy substitution on every gate each time new parameter values are used.
+    A CompiledCircuit instead analyses the circuit once, recording which
+    operations depend on which symbols, and then only recomputes the unitaries
+    of the parameterized operations on each simulation. The state is evolved
+    in preallocated buffers.
+
+    Parameterized operations whose gate is an EigenGate with an exponent that
+    is an affine function of the symbols (for instance, `ZPowGate`,
+    `CZPowGate`, `ISwapPowGate` and `PhasedISwapPowGate` as used by the
+    ansatzes in this library) are handled natively: their eigencomponents are
+    computed once and their exponents are obtained from a single matrix-vector
+    product. Any other parameterized operation falls back to resolving its
+    parameters with a `cirq.ParamResolver`.
+
+    Attributes:
+        symbols: The symbols of the circuit, in the order in which their
+            values are given to `final_state`.
+        qubits: The qubits of the circuit, in the order used to index the
+            simulated state.
+    """
+
+    def __init__(self,
+                 circuit: cirq.Circuit,
+                 symbols: Sequence[sympy.Symbol],
+                 qubit_order: cirq.QubitOrderOrList=cirq.QubitOrder.DEFAULT,
+                 initial_state: Union[int, numpy.ndarray]=0,
+                 dtype: type=numpy.complex128) -> None:
+        """
+        Args:
+            circuit: The circuit to compile. Measurements are ignored.
+            symbols: The symbols that parameterize the circuit. Values for
+                these symbols are passed, in this order, to `final_state`.
+            qubit_order: Determines the ordering of the qubits in the
+                simulated state.
+            initial_state: The initial state of the simulation, as a
+                computational basis state index or a state vector.
+            dtype: The numpy dtype of the simulated state.
+        """
+        self.symbols = tuple(symbols)
+        self.qubits = tuple(cirq.QubitOrder.as_qubit_order(
+                qubit_order).order_for(circuit.all_qubits()))
+
+        n_qubits = len(self.qubits)
+        self._shape = (2,) * n_qubits
+        self._initial_state = cirq.to_valid_state_vector(
+                initial_state, n_qubits, dtype=dtype).reshape(self._shape)
+        self._dtype = dtype
+        # Buffers for the states, with a leading axis for parameter settings
+        self._state = numpy.empty(
+                (1,) + self._shape, dtype=dtype)  # type: numpy.ndarray
+        self._buffer = numpy.empty(
+                (1,) + self._shape, dtype=dtype)  # type: numpy.ndarray
+
+        symbol_indices = {str(symbol): i
+                          for i, symbol in enumerate(self.symbols)}
+        qubit_indices = {qubit: i for i, qubit in enumerate(self.qubits)}
+
+        # Each step is a tuple whose first entry describes how to apply it
+        self._steps = []  # type: List[Tuple[Any, ...]]
+        coefficient_rows = []  # type: List[numpy.ndarray]
+        offsets = []  # type: List[float]
+
+        for op in circuit.all_operations():
+            if cirq.is_measurement(op):
+                continue
+            # Axis 0 of the simulated states indexes parameter settings
+            axes = tuple(1 + qubit_indices[qubit] for qubit in op.qubits)
+            if not cirq.is_parameterized(op):
+                self._steps.append((_CONSTANT, op, axes))
+                continue
+            linear_exponent = _linear_exponent(op, symbol_indices)
+            if linear_exponent is None:
+                self._steps.append((_RESOLVE, op, axes))
+                continue
+            row, offset, gate = linear_exponent
+            half_turns, projectors = zip(*gate._eigen_components())
+            half_turns = numpy.array(half_turns) + gate._global_shift
+            shifts, weights = _shift_rule(half_turns)
+            self._steps.append((
+                _EIGEN,
+                len(coefficient_rows),
+                half_turns,
+                numpy.array(projectors, dtype=dtype),
+                axes,
+                shifts,
+                weights))
+            coefficient_rows.append(row)
+            offsets.append(offset)
+
+        self._exponent_coefficients = (
+                numpy.array(coefficient_rows) if coefficient_rows
+                else numpy.zeros((0, len(self.symbols))))
+        self._exponent_offsets = numpy.array(offsets)
+        self._needs_resolver = any(step[0] == _RESOLVE for step in self._steps)
+        # Inverses of constant operations, computed lazily by adjoint_gradient
+        self._inverses = {}  # type: Dict[cirq.Operation, Any]
+
+    @property
+    def num_parameterized_operations(self) -> int:
+        """The number of operations whose unitary depends on the symbols."""
+        return sum(step[0] != _CONSTANT for step in self._steps)
+
+    def final_state(self, values: numpy.ndarray) -> numpy.ndarray:
+        """Simulate the circuit with the given values for the symbols.
+
+        Args:
+            values: The values of the symbols, in the order given by
+                `self.symbols`.
+
+        Returns:
+            The final state vector. The returned array is owned by the
+            CompiledCircuit and is overwritten by the next simulation, so it
+            should be copied if it needs to be kept.
+        """
+        return self.final_states(numpy.asarray(values)[numpy.newaxis])[0]
+
+    def final_states(self, values: numpy.ndarray) -> numpy.ndarray:
+        """Simulate the circuit with several settings of the symbols at once.
+
+        The states are evolved together as a single array whose first axis
+        indexes the parameter settings, so the unitaries of constant
+        operations are applied to all of them in one pass.
+
+        Args:
+            values: A 2d array whose rows give values of the symbols, in the
+                order given by `self.symbols`.
+
+        Returns:
+            A 2d array whose i-th row is the final state vector obtained with
+            the i-th row of `values`. The returned array is owned by the
+            CompiledCircuit and is overwritten by the next simulation, so it
+            should be copied if it needs to be kept.
+        """
+        values = numpy.asarray(values)
+        batch_size = len(values)
+        batch_shape = (batch_size,) + self._shape
+        if self._state.shape != batch_shape:
+            self._state = numpy.empty(batch_shape, dtype=self._dtype)
+            self._buffer = numpy.empty(batch_shape, dtype=self._dtype)
+
+        self._state[...] = self._initial_state
+        state, _ = self._apply_steps(self._state, self._buffer,
+                                     self._exponents(values),
+                                     self._resolvers(values))
+        return state.reshape((batch_size, -1))
+
+    def gradient(self,
+                 values: numpy.ndarray,
+                 objective: Callable[[numpy.ndarray], float]
+                 ) -> numpy.ndarray:
+        """The gradient of a function of the final state.
+
+        The derivative with respect to the exponent of each parameterized
+        operation is computed exactly with a parameter-shift rule derived from
+        the eigenvalues of its gate. The forward state up to each operation is
+        computed once and shared by all of the shifted circuits of that
+        operation, which are simulated together as a batch.
+
+        Args:
+            values: The values of the symbols, in the order given by
+                `self.symbols`.
+            objective: A function mapping a final state vector to a real
+                number.
+
+        Returns:
+            The gradient of objective(final state) with respect to the values
+            of the symbols.
+
+        Raises:
+            ValueError: The circuit contains parameterized operations that are
+                not EigenGates with exponents that are affine functions of
+                the symbols.
+        """
+        if not self.is_differentiable:
+            raise ValueError(
+                    "Can't differentiate a circuit containing parameterized "
+                    "operations that are not EigenGates with exponents that "
+                    "are affine functions of the symbols.")
+
+        values = numpy.asarray(values)
+        exponents = self._exponents(values[numpy.newaxis])[0]
+        exponent_gradient = numpy.zeros(len(exponents))
+
+        state = numpy.empty(
+                (1,) + self._shape, dtype=self._dtype)  # type: numpy.ndarray
+        buffer = numpy.empty_like(state)
+        state[...] = self._initial_state
+        for i, step in enumerate(self._steps):
+            if step[0] == _EIGEN and len(step[5]):
+                _, index, _, _, _, shifts, weights = step
+                num_shifts = 2 * len(shifts)
+                shifted_exponents = numpy.tile(exponents, (num_shifts, 1))
+                shifted_exponents[:, index] += numpy.concatenate(
+                        [shifts, -shifts])
+                shifted_states = numpy.repeat(state, num_shifts, axis=0)
+                shifted_states, _ = self._apply_steps(
+                        shifted_states, numpy.empty_like(shifted_states),
+                        shifted_exponents, [], start=i)
+                shifted_values = numpy.array(
+                        [objective(shifted_state.reshape(-1))
+                         for shifted_state in shifted_states])
+                exponent_gradient[index] = weights.dot(
+                        shifted_values[:len(shifts)]
+                        - shifted_values[len(shifts):])
+            state, buffer = self._apply_steps(
+                    state, buffer, exponents[numpy.newaxis], [],
+                    start=i, stop=i + 1)
+
+        return exponent_gradient.dot(self._exponent_coefficients)
+
+    def adjoint_gradient(self,
+                         values: numpy.ndarray,
+                         state_gradient: Callable[[numpy.ndarray],
+                                                  numpy.ndarray]
+                         ) -> numpy.ndarray:
+        """The gradient of a function of the final state by adjoint mode.
+
+        Suppose f is a real function of the final state psi, and let phi be
+        the costate of psi under f, meaning that a change d psi of the state
+        changes f by 2 Re <phi|d psi>. For an expectation value <psi|H|psi>,
+        the costate is H psi. After a forward simulation, the circuit is
+        walked once in reverse. At each step the state and the costate are
+        both moved back past the operation, and the derivative with respect
+        to the exponent of each parameterized operation is read off from
+        them. The cost is a small constant number of simulations, regardless
+        of the number of parameters, and only a constant number of state
+        vectors is stored.
+
+        Args:
+            values: The values of the symbols, in the order given by
+                `self.symbols`.
+            state_gradient: A function mapping the final state vector to its
+                costate under the function being differentiated.
+
+        Returns:
+            The gradient of the function with respect to the values of the
+            symbols, or NotImplemented if `state_gradient` returned
+            NotImplemented.
+
+        Raises:
+            ValueError: The circuit contains parameterized operations that are
+                not EigenGates with exponents that are affine functions of
+                the symbols.
+        """
+        if not self.is_differentiable:
+            raise ValueError(
+                    "Can't differentiate a circuit containing parameterized "
+                    "operations that are not EigenGates with exponents that "
+                    "are affine functions of the symbols.")
+
+        values = numpy.asarray(values)
+        exponents = self._exponents(values[numpy.newaxis])[0]
+        exponent_gradient = numpy.zeros(len(exponents))
+
+        # Row 0 holds the state and row 1 holds the costate
+        states = numpy.empty(
+                (2,) + self._shape, dtype=self._dtype)  # type: numpy.ndarray
+        buffer = numpy.empty_like(states)
+        states[0] = self.final_state(values).reshape(self._shape)
+        costate = state_gradient(states[0].reshape(-1))
+        if costate is NotImplemented:
+            return NotImplemented
+        states[1] = numpy.reshape(costate, self._shape)
+
+        for step in reversed(self._steps):
+            if step[0] == _EIGEN:
+                index, half_turns, projectors, axes = step[1:5]
+                # The derivative of the unitary is i pi G U where G is the
+                # sum of the half turns times the projectors, and G commutes
+                # with U, so it acts on the state after the operation
+                generator = 1j * numpy.pi * numpy.einsum(
+                        'k,kij->ij', half_turns, projectors)
+                derivative_state = cirq.targeted_left_multiply(
+                        generator.reshape((2,) * (2 * len(axes))),
+                        states[0],
+                        [axis - 1 for axis in axes])
+                exponent_gradient[index] = 2 * numpy.vdot(
+                        states[1], derivative_state).real
+                phases = numpy.exp(-1j * numpy.pi * exponents[index]
+                                   * half_turns)
+                inverse_matrix = numpy.einsum('k,kij->ij', phases, projectors)
+                result = _batched_targeted_left_multiply(
+                        numpy.array([inverse_matrix] * 2), states, axes,
+                        out=buffer)
+            else:
+                _, op, axes = step
+                result = cirq.apply_unitary(
+                        self._inverse(op),
+                        cirq.ApplyUnitaryArgs(states, buffer, axes))
+            if result is buffer:
+                buffer = states
+            states = result
+
+        return exponent_gradient.dot(self._exponent_coefficients)
+
+    @property
+    def is_differentiable(self) -> bool:
+        """Whether the circuit can be differentiated analytically.
+
+        This is the case if every parameterized operation is handled natively.
+        """
+        return not self._needs_resolver
+
+    def _inverse(self, op: cirq.Operation) -> Any:
+        """The inverse of a constant operation, cached after first use."""
+        if op not in self._inverses:
+            inverse = cirq.inverse(op, None)
+            if inverse is None:
+                inverse = cirq.MatrixGate(
+                        cirq.unitary(op).conj().T).on(*op.qubits)
+            self._inverses[op] = inverse
+        return self._inverses[op]
+
+    def _exponents(self, values: numpy.ndarray) -> numpy.ndarray:
+        """Exponents of the natively handled operations for each setting."""
+        return (values.dot(self._exponent_coefficients.T)
+                + self._exponent_offsets)
+
+    def _resolvers(self, values: numpy.ndarray) -> List[cirq.ParamResolver]:
+        """Resolvers for the fallback operations for each setting."""
+        if not self._needs_resolver:
+            return []
+        return [cirq.ParamResolver(
+                    {str(symbol): value
+                     for symbol, value in zip(self.symbols, row)})
+                for row in values]
+
+    def _apply_steps(self,
+                     state: numpy.ndarray,
+                     buffer: numpy.ndarray,
+                     exponents: numpy.ndarray,
+                     resolvers: Sequence[cirq.ParamResolver],
+                     start: int=0,
+                     stop: Optional[int]=None
+                     ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Apply a range of steps to a batch of states.
+
+        Returns the evolved states and an array that may be used as a buffer.
+        The input arrays may be overwritten.
+        """
+        for step in self._steps[start:stop]:
+            if step[0] == _EIGEN:
+                index, half_turns, projectors, axes = step[1:5]
+                phases = numpy.exp(1j * numpy.pi * numpy.outer(
+                        exponents[:, index], half_turns))
+                matrices = numpy.einsum('bk,kij->bij', phases, projectors)
+                result = _batched_targeted_left_multiply(
+                        matrices, state, axes, out=buffer)
+            elif step[0] == _CONSTANT:
+                _, op, axes = step
+                result = cirq.apply_unitary(
+                        op, cirq.ApplyUnitaryArgs(state, buffer, axes))
+            else:
+                _, op, axes = step
+                unbatched_axes = tuple(axis - 1 for axis in axes)
+                for i, resolver in enumerate(resolvers):
+                    numpy.copyto(buffer[i], cirq.apply_unitary(
+                            cirq.resolve_parameters(op, resolver),
+                            cirq.ApplyUnitaryArgs(state[i], buffer[i],
+                                                  unbatched_axes)))
+                result = buffer
+            if result is buffer:
+                buffer = state
+            state = result
+        return state, buffer
+
+
+_CONSTANT = 'constant'
+_EIGEN = 'eigen'
+_RESOLVE = 'resolve'
+
+
+def _linear_exponent(op: cirq.Operation,
+                     symbol_indices: Dict[str, int]
+                     ) -> Optional[Tuple[numpy.ndarray, float, cirq.EigenGate]]:
+    """Decompose the exponent of an EigenGate operation as an affine function.
+
+    Returns a tuple (row, offset, gate) such that the exponent of the gate
+    equals row.dot(values) + offset, where values are the values of the
+    symbols, and gate is a copy of the gate with a numeric exponent (used only
+    to obtain eigencomponents). Returns None if the operation is not of this
+    form.
+    """
+    gate = getattr(op, 'gate', None)
+    if not isinstance(gate, cirq.EigenGate):
+        return None
+    concrete_gate = gate._with_exponent(1.0)
+    if cirq.is_parameterized(concrete_gate):
+        return None
+
+    exponent = sympy.sympify(gate.exponent)
+    row = numpy.zeros(len(symbol_indices))
+    for symbol in exponent.free_symbols:
+        if str(symbol) not in symbol_indices:
+            return None
+        coefficient = exponent.diff(symbol)
+        if coefficient.free_symbols:
+            return None
+        row[symbol_indices[str(symbol)]] = float(coefficient)
+    offset = float(exponent.subs(
+            {symbol: 0 for symbol in exponent.free_symbols}))
+    return row, offset, concrete_gate
+
+
+def _batched_targeted_left_multiply(matrices: numpy.ndarray,
+                                    target: numpy.ndarray,
+                                    axes: Sequence[int],
+                                    out: numpy.ndarray) -> numpy.ndarray:
+    """Left-multiply axes of each slice of a tensor by a different matrix.
+
+    Axis 0 of `target` indexes slices, and the i-th slice is multiplied by the
+    i-th matrix of `matrices`, which has shape (len(target), 2**k, 2**k) for
+    k = len(axes).
+    """
+    k = len(axes)
+    n = target.ndim
+    input_indices = list(range(n))
+    output_indices = list(range(n))
+    for i, axis in enumerate(axes):
+        output_indices[axis] = n + i
+    matrix_indices = [0] + [n + i for i in range(k)] + list(axes)
+    return numpy.einsum(matrices.reshape((len(target),) + (2,) * (2 * k)),
+                        matrix_indices,
+                        target,
+                        input_indices,
+                        output_indices,
+                        out=out)
+
+
+def _shift_rule(half_turns: numpy.ndarray
+                ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """A parameter-shift rule for the exponent of an EigenGate.
+
+    As a function of the exponent e of a gate whose eigenvalues are
+    exp(i pi e h) for h in `half_turns`, any expectation value is a
+    trigonometric polynomial whose frequencies are the positive differences
+    pi |h - h'|. Returns arrays (shifts, weights) such that the derivative of
+    such a function f at e equals
+
+        sum_j weights[j] * (f(e + shifts[j]) - f(e - shifts[j])).
+    """
+    differences = numpy.abs(numpy.subtract.outer(half_turns, half_turns))
+    frequencies = numpy.pi * numpy.unique(
+            numpy.round(differences[differences > 1e-8], 8))
+    if not len(frequencies):
+        return numpy.zeros(0), numpy.zeros(0)
+    num_frequencies = len(frequencies)
+    base_frequency = frequencies[-1] / num_frequencies
+    shifts = ((2 * numpy.arange(num_frequencies) + 1) * numpy.pi
+              / (2 * num_frequencies * base_frequency))
+    # f(e + s) - f(e - s) = 2 sum_r b_r sin(w_r s) and f'(e) = sum_r w_r b_r
+    odd_part = 2 * numpy.sin(numpy.outer(shifts, frequencies))
+    weights = numpy.linalg.solve(odd_part.T, frequencies)
+    return shifts, weights
@@ -0,0 +1,235 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import numpy
+import pytest
+import sympy
+
+import cirq
+import openfermion
+
+from openfermioncirq.variational.ansatzes import (
+        LowRankTrotterAnsatz,
+        SwapNetworkTrotterAnsatz)
+from openfermioncirq.variational.compiled_circuit import (
+        CompiledCircuit,
+        _shift_rule)
+
+
+def assert_compiled_circuit_matches_resolution(circuit, symbols, qubit_order,
+                                               initial_state=0):
+    compiled_circuit = CompiledCircuit(circuit, symbols, qubit_order,
+                                       initial_state=initial_state)
+    for _ in range(3):
+        values = numpy.random.uniform(-2, 2, len(symbols))
+        resolver = cirq.ParamResolver(
+                {str(symbol): value for symbol, value in zip(symbols, values)})
+        resolved_circuit = cirq.resolve_parameters(circuit, resolver)
+        expected = resolved_circuit.final_wavefunction(
+                initial_state, qubit_order=qubit_order)
+        numpy.testing.assert_allclose(
+                compiled_circuit.final_state(values), expected, atol=1e-7)
+
+
+def test_compiled_circuit_eigen_gates():
+    a, b, c = cirq.LineQubit.range(3)
+    s, t = sympy.Symbol('s'), sympy.Symbol('t')
+    circuit = cirq.Circuit(
+            cirq.H.on_each(a, b, c),
+            cirq.ZPowGate(exponent=s).on(a),
+            cirq.ISwapPowGate(exponent=-t).on(a, b),
+            cirq.PhasedISwapPowGate(exponent=2 * s + 0.5).on(b, c),
+            cirq.CZPowGate(exponent=s - t, global_shift=-0.5).on(a, c),
+            cirq.measure(a, b, c, key='all'))
+
+    numpy.random.seed(13270)
+    compiled_circuit = CompiledCircuit(circuit, [s, t], [c, a, b])
+    assert compiled_circuit.qubits == (c, a, b)
+    assert compiled_circuit.num_parameterized_operations == 4
+    assert_compiled_circuit_matches_resolution(circuit, [s, t], [c, a, b])
+    assert_compiled_circuit_matches_resolution(circuit, [t, s], [a, b, c],
+                                               initial_state=5)
+
+
+def test_compiled_circuit_falls_back_to_resolution():
+    a, b = cirq.LineQubit.range(2)
+    s, t = sympy.Symbol('s'), sympy.Symbol('t')
+    circuit = cirq.Circuit(
+            cirq.H(a),
+            cirq.PhasedXPowGate(phase_exponent=s, exponent=0.3).on(a),
+            cirq.XPowGate(exponent=s * t).on(b),
+            cirq.ISWAP(a, b),
+            cirq.rx(t).on(a))
+
+    numpy.random.seed(60235)
+    compiled_circuit = CompiledCircuit(circuit, [s, t], [a, b])
+    assert compiled_circuit.num_parameterized_operations == 3
+    assert_compiled_circuit_matches_resolution(circuit, [s, t], [a, b])
+
+
+def test_compiled_circuit_ansatzes():
+    numpy.random.seed(31084)
+
+    hubbard_hamiltonian = openfermion.get_diagonal_coulomb_hamiltonian(
+            openfermion.fermi_hubbard(1, 2, 1., 4.))
+    ansatz = SwapNetworkTrotterAnsatz(hubbard_hamiltonian, iterations=2)
+    assert_compiled_circuit_matches_resolution(
+            ansatz.circuit, list(ansatz.params()),
+            ansatz.qubit_permutation(ansatz.qubits), initial_state=0b0101)
+
+    bond_length = 1.45
+    geometry = [('Li', (0., 0., 0.)), ('H', (0., 0., bond_length))]
+    lih_hamiltonian = openfermion.load_molecular_hamiltonian(
+            geometry, 'sto-3g', 1, format(bond_length), 2, 2)
+    ansatz = LowRankTrotterAnsatz(lih_hamiltonian, final_rank=2,
+                                  include_all_cz=True, include_all_z=True)
+    assert_compiled_circuit_matches_resolution(
+            ansatz.circuit, list(ansatz.params()),
+            ansatz.qubit_permutation(ansatz.qubits), initial_state=0b0011)
+
+
+def test_compiled_circuit_final_states():
+    a, b = cirq.LineQubit.range(2)
+    s, t = sympy.Symbol('s'), sympy.Symbol('t')
+    circuit = cirq.Circuit(
+            cirq.H(a),
+            cirq.ISwapPowGate(exponent=t).on(a, b),
+            cirq.PhasedXPowGate(phase_exponent=s, exponent=0.3).on(b),
+            cirq.CZPowGate(exponent=s).on(a, b))
+
+    numpy.random.seed(42297)
+    compiled_circuit = CompiledCircuit(circuit, [s, t], [a, b])
+    values = numpy.random.randn(4, 2)
+    final_states = compiled_circuit.final_states(values).copy()
+    assert final_states.shape == (4, 4)
+    for row, final_state in zip(values, final_states):
+        numpy.testing.assert_allclose(
+                compiled_circuit.final_state(row), final_state, atol=1e-7)
+
+
+def test_compiled_circuit_gradient():
+    a, b, c = cirq.LineQubit.range(3)
+    s, t = sympy.Symbol('s'), sympy.Symbol('t')
+    circuit = cirq.Circuit(
+            cirq.H.on_each(a, b, c),
+            cirq.ZPowGate(exponent=s).on(a),
+            cirq.ISwapPowGate(exponent=-t).on(a, b),
+            cirq.PhasedISwapPowGate(exponent=2 * s + 0.5).on(b, c),
+            cirq.CZPowGate(exponent=s - t, global_shift=-0.5).on(a, c),
+            cirq.rx(t).on(b),
+            cirq.CCZ(a, b, c))
+    compiled_circuit = CompiledCircuit(circuit, [s, t], [a, b, c])
+    assert compiled_circuit.is_differentiable
+
+    numpy.random.seed(50264)
+    hamiltonian = cirq.testing.random_unitary(8)
+    hamiltonian += hamiltonian.conj().T
+    def objective(state):
+        return numpy.vdot(state, hamiltonian.dot(state)).real
+
+    values = numpy.random.randn(2)
+    step_size = 1e-6
+    finite_difference_gradient = [
+            (objective(compiled_circuit.final_state(values + displacement))
+             - objective(compiled_circuit.final_state(values - displacement)))
+            / (2 * step_size)
+            for displacement in step_size * numpy.eye(2)]
+    numpy.testing.assert_allclose(
+            compiled_circuit.gradient(values, objective),
+            finite_difference_gradient, atol=1e-6)
+
+
+def test_compiled_circuit_adjoint_gradient():
+    a, b, c = cirq.LineQubit.range(3)
+    s, t = sympy.Symbol('s'), sympy.Symbol('t')
+    circuit = cirq.Circuit(
+            cirq.H.on_each(a, b, c),
+            cirq.ZPowGate(exponent=s).on(a),
+            cirq.ISwapPowGate(exponent=-t).on(a, b),
+            cirq.PhasedISwapPowGate(exponent=2 * s + 0.5).on(b, c),
+            cirq.CZPowGate(exponent=s - t, global_shift=-0.5).on(a, c),
+            cirq.rx(t).on(b),
+            cirq.MatrixGate(cirq.testing.random_unitary(4)).on(c, a),
+            cirq.CCZ(a, b, c))
+    compiled_circuit = CompiledCircuit(circuit, [s, t], [a, b, c])
+
+    numpy.random.seed(20575)
+    hamiltonian = cirq.testing.random_unitary(8)
+    hamiltonian += hamiltonian.conj().T
+    def objective(state):
+        return numpy.vdot(state, hamiltonian.dot(state)).real
+    def state_gradient(state):
+        return hamiltonian.dot(state)
+
+    values = numpy.random.randn(2)
+    numpy.testing.assert_allclose(
+            compiled_circuit.adjoint_gradient(values, state_gradient),
+            compiled_circuit.gradient(values, objective), atol=1e-8)
+    assert compiled_circuit.adjoint_gradient(
+            values, lambda state: NotImplemented) is NotImplemented
+
+
+def test_compiled_circuit_adjoint_gradient_low_rank_ansatz():
+    bond_length = 1.45
+    geometry = [('Li', (0., 0., 0.)), ('H', (0., 0., bond_length))]
+    lih_hamiltonian = openfermion.load_molecular_hamiltonian(
+            geometry, 'sto-3g', 1, format(bond_length), 2, 2)
+    ansatz = LowRankTrotterAnsatz(lih_hamiltonian, final_rank=2,
+                                  include_all_cz=True, include_all_z=True)
+    compiled_circuit = CompiledCircuit(
+            ansatz.circuit, list(ansatz.params()),
+            ansatz.qubit_permutation(ansatz.qubits), initial_state=0b0011)
+    hamiltonian = openfermion.get_sparse_operator(lih_hamiltonian)
+    def objective(state):
+        return numpy.vdot(state, hamiltonian.dot(state)).real
+
+    numpy.random.seed(73660)
+    values = numpy.random.uniform(-1, 1, len(compiled_circuit.symbols))
+    numpy.testing.assert_allclose(
+            compiled_circuit.adjoint_gradient(values, hamiltonian.dot),
+            compiled_circuit.gradient(values, objective), atol=1e-8)
+
+
+def test_compiled_circuit_gradient_not_differentiable():
+    a = cirq.LineQubit(0)
+    s = sympy.Symbol('s')
+    compiled_circuit = CompiledCircuit(
+            cirq.Circuit(cirq.XPowGate(exponent=s**2).on(a)), [s])
+    assert not compiled_circuit.is_differentiable
+    with pytest.raises(ValueError):
+        _ = compiled_circuit.gradient(numpy.array([0.5]), lambda state: 0.0)
+    with pytest.raises(ValueError):
+        _ = compiled_circuit.adjoint_gradient(numpy.array([0.5]),
+                                              lambda state: state)
+
+
+@pytest.mark.parametrize('half_turns', [
+        [0.0, 1.0], [-0.5, 0.5], [0.0, 0.5, -0.5], [0.0, 0.3, 1.1], [0.0]])
+def test_shift_rule(half_turns):
+    half_turns = numpy.array(half_turns)
+    numpy.random.seed(11309)
+    coefficients = numpy.random.randn(len(half_turns), len(half_turns)) + 0j
+    coefficients += coefficients.conj().T
+    def f(e):
+        phases = numpy.exp(1j * numpy.pi * e * half_turns)
+        return numpy.vdot(phases, coefficients.dot(phases)).real
+    def derivative(e):
+        phases = numpy.exp(1j * numpy.pi * e * half_turns)
+        d_phases = 1j * numpy.pi * half_turns * phases
+        return 2 * numpy.vdot(d_phases, coefficients.dot(phases)).real
+
+    shifts, weights = _shift_rule(half_turns)
+    for e in [0.0, 0.37, -1.2]:
+        numpy.testing.assert_allclose(
+                sum(w * (f(e + s) - f(e - s))
+                    for s, w in zip(shifts, weights)),
+                derivative(e), atol=1e-8)
@@ -12,15 +12,22 @@
 
 """A class for studying variational ansatzes with an associated Hamiltonian."""
 
-from typing import Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import copy
 
 import numpy
+import scipy.sparse
 import scipy.special
 
 import cirq
 import openfermion
 
+from openfermioncirq.variational.matrix_free_hamiltonian import (
+    MatrixFreeHamiltonian)
 from openfermioncirq.variational.objective import VariationalObjective
+from openfermioncirq.variational.shared_csr_matrix import (
+    SharedCSRMatrix, shared_memory_supported)
 
 
 class HamiltonianObjective(VariationalObjective):
@@ -34,6 +41,13 @@ class HamiltonianObjective(VariationalObjective):
     variance is inversely proportional to the number of measurements taken.
     The cost corresponds to the number of measurements performed.
 
+    The objective can also be estimated from actual measurements. The Pauli
+    terms of the Hamiltonian are partitioned into groups of qubit-wise
+    commuting terms, which can be measured simultaneously after rotating each
+    qubit into the measurement basis of the group. `sample` and `sample_state`
+    collect the measurements of every group into a single cirq.TrialResult,
+    from which `value` and `estimate` compute the estimated energy.
+
     Attributes:
         hamiltonian: The Hamiltonian of interest, represented
             as a FermionOperator, QubitOperator, InteractionOperator, or
@@ -44,6 +58,9 @@ class HamiltonianObjective(VariationalObjective):
             This gives an estimate of the variance of an energy measurement
             with a certain measurement strategy; see arXiv:1801.03524 for
             a derivation.
+        measurement_groups: The non-constant Pauli terms of the Jordan-Wigner
+            transformed Hamiltonian, partitioned into QubitOperators whose
+            terms commute qubit-wise.
     """
 
     def __init__(self,
@@ -52,7 +69,8 @@ class HamiltonianObjective(VariationalObjective):
                      openfermion.FermionOperator,
                      openfermion.InteractionOperator,
                      openfermion.QubitOperator],
-                 use_linear_op: bool=False) -> None:
+                 use_linear_op: bool=False,
+                 matrix_free: bool=False) -> None:
         """
         Args:
             hamiltonian: The Hamiltonian.
@@ -60,7 +78,21 @@ class HamiltonianObjective(VariationalObjective):
                 matrix to compute expectation values. Using a LinearOperator
                 is more memory-efficient but results in much slower expectation
                 value computation.
+            matrix_free: Whether to compute expectation values directly from
+                the one- and two-body tensors of the Hamiltonian with a
+                MatrixFreeHamiltonian, which never stores a matrix. Only
+                supported for InteractionOperator and
+                DiagonalCoulombHamiltonian inputs.
+
+        Raises:
+            ValueError: Both use_linear_op and matrix_free were set.
+            TypeError: matrix_free was set but the Hamiltonian is not an
+                InteractionOperator or DiagonalCoulombHamiltonian.
         """
+        if use_linear_op and matrix_free:
+            raise ValueError(
+                    'At most one of use_linear_op and matrix_free can be set.')
+
         self.hamiltonian = hamiltonian
 
         if isinstance(hamiltonian, openfermion.QubitOperator):
@@ -68,7 +100,9 @@ class HamiltonianObjective(VariationalObjective):
         else:
             hamiltonian_qubit_op = openfermion.jordan_wigner(hamiltonian)
 
-        if use_linear_op:
+        if matrix_free:
+            self._hamiltonian_linear_op = MatrixFreeHamiltonian(hamiltonian)
+        elif use_linear_op:
             self._hamiltonian_linear_op = openfermion.LinearQubitOperator(
                     hamiltonian_qubit_op)
         else:
@@ -82,6 +116,12 @@ class HamiltonianObjective(VariationalObjective):
                 - abs(hamiltonian_qubit_op.constant))
         self.variance_bound = one_norm_minus_constant**2
 
+        self._hamiltonian_qubit_op = hamiltonian_qubit_op
+        self._measurement_groups = None  # type: Optional[List[_PauliGroup]]
+
+        self._shared_matrix = None  # type: Optional[SharedCSRMatrix]
+        self._shared_memory_copy = None  # type: Optional[HamiltonianObjective]
+
     def value(self,
               circuit_output: Union[cirq.TrialResult,
                                     cirq.SimulationTrialResult,
@@ -96,11 +136,190 @@ class HamiltonianObjective(VariationalObjective):
             return openfermion.expectation(
                     self._hamiltonian_linear_op,
                     circuit_output.final_state).real
+        elif isinstance(circuit_output, cirq.TrialResult):
+            return self.estimate(circuit_output)[0]
         else:
-            # TODO implement this
             raise NotImplementedError(
-                    "Don't know how to compute the value of a TrialResult that "
-                    "is not an SimulationTrialResult.")
+                    "Don't know how to compute the value of a "
+                    "SimulationTrialResult that is not a "
+                    "WaveFunctionTrialResult.")
+
+    @property
+    def measurement_groups(self) -> List[openfermion.QubitOperator]:
+        """The qubit-wise commuting groups of Pauli terms."""
+        return [group.operator for group in self._groups()]
+
+    def measurement_circuits(self, qubits: Sequence[cirq.Qid]
+                            ) -> List[cirq.Circuit]:
+        """Circuits that measure each group of Pauli terms.
+
+        Each circuit rotates the qubits acted on by a group into the
+        measurement basis of the group and then measures them, with a key
+        identifying the group.
+
+        Args:
+            qubits: The qubits of the circuit, where qubits[i] is the qubit
+                that index i of the Hamiltonian acts on.
+        """
+        return [group.circuit(qubits) for group in self._groups()]
+
+    def sample(self,
+               circuit: cirq.Circuit,
+               qubits: Sequence[cirq.Qid],
+               repetitions: int,
+               sampler: Optional[cirq.Sampler]=None,
+               param_resolver: cirq.ParamResolverOrSimilarType=None
+               ) -> cirq.TrialResult:
+        """Measure every group of Pauli terms on the output of a circuit.
+
+        Each of the measurement circuits is appended to the given circuit,
+        which should not contain measurements, and run with the sampler.
+
+        Args:
+            circuit: The circuit preparing the state to measure.
+            qubits: The qubits of the circuit, where qubits[i] is the qubit
+                that index i of the Hamiltonian acts on.
+            repetitions: The number of measurements to take of each group.
+            sampler: The sampler to use. Defaults to cirq.Simulator().
+            param_resolver: Parameters to run the circuit with.
+
+        Returns:
+            A TrialResult containing the measurements of all groups.
+        """
+        if sampler is None:
+            sampler = cirq.Simulator()
+        measurements = {}  # type: Dict[str, numpy.ndarray]
+        for measurement_circuit in self.measurement_circuits(qubits):
+            result = sampler.run(circuit + measurement_circuit,
+                                 param_resolver=param_resolver,
+                                 repetitions=repetitions)
+            measurements.update(result.measurements)
+        return cirq.TrialResult(
+                params=cirq.ParamResolver(param_resolver),
+                measurements=measurements)
+
+    def sample_state(self,
+                     state: numpy.ndarray,
+                     repetitions: int,
+                     seed: Optional[int]=None) -> cirq.TrialResult:
+        """Measure every group of Pauli terms on a state vector.
+
+        This is equivalent to `sample` with a simulator, but uses a state
+        vector that has already been computed instead of simulating a circuit
+        once per group.
+
+        Args:
+            state: The state vector to measure.
+            repetitions: The number of measurements to take of each group.
+            seed: A seed for the random number generator.
+
+        Returns:
+            A TrialResult containing the measurements of all groups.
+        """
+        prng = numpy.random.RandomState(seed)
+        num_qubits = state.shape[0].bit_length() - 1
+        qubits = cirq.LineQubit.range(num_qubits)
+        measurements = {}  # type: Dict[str, numpy.ndarray]
+        for group in self._groups():
+            rotated_state = cirq.final_wavefunction(
+                    group.rotation_circuit(qubits),
+                    initial_state=state,
+                    qubit_order=qubits,
+                    dtype=numpy.complex128)
+            measurements[group.key] = cirq.sample_state_vector(
+                    rotated_state, group.indices,
+                    repetitions=repetitions, seed=prng)
+        return cirq.TrialResult(params=cirq.ParamResolver({}),
+                                measurements=measurements)
+
+    def estimate(self, trial_result: cirq.TrialResult) -> Tuple[float, float]:
+        """Estimate the objective from measurements of the Pauli groups.
+
+        The measurements of each group are converted to a value of the group
+        for every shot, using the parities of the measured bits on the support
+        of each term. The estimate is the constant term plus the means of
+        these values, and its variance is the sum over groups of the sample
+        variance divided by the number of shots.
+
+        Args:
+            trial_result: A TrialResult containing measurements of all groups,
+                as returned by `sample` or `sample_state`.
+
+        Returns:
+            A tuple (estimate, variance) of the estimated objective value and
+            the estimated variance of the estimate.
+
+        Raises:
+            ValueError: Measurements of some group are missing.
+        """
+        estimate = self._hamiltonian_qubit_op.constant.real
+        variance = 0.0
+        for group in self._groups():
+            if group.key not in trial_result.measurements:
+                raise ValueError(
+                        'The TrialResult is missing the measurements with key '
+                        '{!r}. Use the sample method to obtain all required '
+                        'measurements.'.format(group.key))
+            bits = trial_result.measurements[group.key]
+            values = group.shot_values(bits)
+            estimate += numpy.mean(values)
+            if len(values) > 1:
+                variance += numpy.var(values, ddof=1) / len(values)
+        return estimate, variance
+
+    def _groups(self) -> List['_PauliGroup']:
+        if self._measurement_groups is None:
+            self._measurement_groups = _qubitwise_commuting_groups(
+                    self._hamiltonian_qubit_op)
+        return self._measurement_groups
+
+    def state_gradient(self, state: numpy.ndarray) -> numpy.ndarray:
+        """The costate of a state vector, which is H applied to the state."""
+        return self._hamiltonian_linear_op.dot(state)
+
+    def shared_memory_copy(self) -> 'HamiltonianObjective':
+        """A copy of the objective whose sparse matrix is in shared memory.
+
+        Pickling the copy records only the names of the shared memory blocks
+        holding the CSR arrays of the Hamiltonian, and workers unpickling it
+        attach to them without copying. The blocks are created on the first
+        call and released when this objective is garbage collected. If the
+        objective uses a LinearOperator, or shared memory is not supported,
+        the objective itself is returned.
+        """
+        if (not scipy.sparse.issparse(self._hamiltonian_linear_op) or
+                not shared_memory_supported()):
+            return self
+        if self._shared_memory_copy is None:
+            shared_copy = copy.copy(self)
+            shared_copy._shared_matrix = SharedCSRMatrix(
+                    self._hamiltonian_linear_op)
+            shared_copy._hamiltonian_linear_op = (
+                    shared_copy._shared_matrix.matrix)
+            self._shared_memory_copy = shared_copy
+        return self._shared_memory_copy
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_shared_memory_copy'] = None
+        if state.get('_shared_matrix') is not None:
+            # The matrix is restored from shared memory
+            del state['_hamiltonian_linear_op']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_shared_matrix', None)
+        self.__dict__.setdefault('_shared_memory_copy', None)
+        self.__dict__.setdefault('_measurement_groups', None)
+        if '_hamiltonian_qubit_op' not in self.__dict__:
+            if isinstance(self.hamiltonian, openfermion.QubitOperator):
+                self._hamiltonian_qubit_op = self.hamiltonian
+            else:
+                self._hamiltonian_qubit_op = openfermion.jordan_wigner(
+                        self.hamiltonian)
+        if self._shared_matrix is not None:
+            self._hamiltonian_linear_op = self._shared_matrix.matrix
 
     def noise(self, cost: Optional[float]=None) -> float:
         """A sample from a normal distribution with mean 0.
@@ -140,3 +359,79 @@ class HamiltonianObjective(VariationalObjective):
         sigmas = scipy.special.erfinv(confidence) * numpy.sqrt(2)
         magnitude_bound = sigmas * numpy.sqrt(self.variance_bound / cost)
         return -magnitude_bound, magnitude_bound
+
+
+class _PauliGroup:
+    """A group of qubit-wise commuting Pauli terms measured together."""
+
+    def __init__(self, index: int,
+                 terms: List[Tuple[Tuple[Tuple[int, str], ...], complex]]
+                ) -> None:
+        self.key = 'pauli_group_{}'.format(index)
+        self.operator = openfermion.QubitOperator()
+        basis = {}  # type: Dict[int, str]
+        for term, coefficient in terms:
+            self.operator += openfermion.QubitOperator(term, coefficient)
+            basis.update(term)
+        self.indices = sorted(basis)
+        self.basis = [basis[i] for i in self.indices]
+
+        # parity_masks[j, k] is 1 if term j acts on the k-th measured qubit
+        column = {qubit_index: k for k, qubit_index in enumerate(self.indices)}
+        self.parity_masks = numpy.zeros((len(terms), len(self.indices)),
+                                        dtype=numpy.int64)
+        for j, (term, _) in enumerate(terms):
+            for qubit_index, _ in term:
+                self.parity_masks[j, column[qubit_index]] = 1
+        self.coefficients = numpy.array(
+                [coefficient.real for _, coefficient in terms])
+
+    def rotation_circuit(self, qubits: Sequence[cirq.Qid]) -> cirq.Circuit:
+        """Rotates the measurement basis of each qubit to the Z basis."""
+        circuit = cirq.Circuit()
+        for qubit_index, pauli in zip(self.indices, self.basis):
+            qubit = qubits[qubit_index]
+            if pauli == 'X':
+                circuit.append(cirq.H(qubit))
+            elif pauli == 'Y':
+                circuit.append([cirq.S(qubit)**-1, cirq.H(qubit)])
+        return circuit
+
+    def circuit(self, qubits: Sequence[cirq.Qid]) -> cirq.Circuit:
+        circuit = self.rotation_circuit(qubits)
+        circuit.append(cirq.measure(*[qubits[i] for i in self.indices],
+                                    key=self.key),
+                       strategy=cirq.InsertStrategy.NEW_THEN_INLINE)
+        return circuit
+
+    def shot_values(self, bits: numpy.ndarray) -> numpy.ndarray:
+        """The value of the group's operator for each shot."""
+        parities = bits.astype(numpy.int64).dot(self.parity_masks.T) % 2
+        return (1 - 2 * parities).dot(self.coefficients)
+
+
+def _qubitwise_commuting_groups(operator: openfermion.QubitOperator
+                               ) -> List[_PauliGroup]:
+    """Greedily partition the non-constant terms into commuting groups.
+
+    Terms are considered in order of decreasing coefficient magnitude and
+    added to the first group whose measurement basis they agree with.
+    """
+    terms = sorted(((term, coefficient)
+                    for term, coefficient in operator.terms.items()
+                    if term),
+                   key=lambda item: -abs(item[1]))
+    bases = []  # type: List[Dict[int, str]]
+    members = [
+    ]  # type: List[List[Tuple[Tuple[Tuple[int, str], ...], complex]]]
+    for term, coefficient in terms:
+        for basis, group in zip(bases, members):
+            if all(basis.get(qubit_index, pauli) == pauli
+                   for qubit_index, pauli in term):
+                basis.update(term)
+                group.append((term, coefficient))
+                break
+        else:
+            bases.append(dict(term))
+            members.append([(term, coefficient)])
+    return [_PauliGroup(i, group) for i, group in enumerate(members)]
@@ -10,6 +10,8 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import pickle
+
 import numpy
 import cirq
 import openfermion
@@ -28,6 +30,7 @@ def test_hamiltonian_objective_value():
 
     obj = HamiltonianObjective(test_hamiltonian)
     obj_linear_op = HamiltonianObjective(test_hamiltonian, use_linear_op=True)
+    obj_matrix_free = HamiltonianObjective(test_hamiltonian, matrix_free=True)
     hamiltonian_sparse = openfermion.get_sparse_operator(test_hamiltonian)
 
     simulator = cirq.Simulator()
@@ -47,6 +50,50 @@ def test_hamiltonian_objective_value():
             obj_linear_op.value(result), correct_val, 1e-5)
     numpy.testing.assert_allclose(
             obj_linear_op.value(result.final_state), correct_val, 1e-5)
+    numpy.testing.assert_allclose(
+            obj_matrix_free.value(result), correct_val, 1e-5)
+    numpy.testing.assert_allclose(
+            obj_matrix_free.value(result.final_state), correct_val, 1e-5)
+
+
+@pytest.mark.parametrize('use_linear_op,matrix_free',
+                         [(False, False), (True, False), (False, True)])
+def test_hamiltonian_objective_state_gradient(use_linear_op, matrix_free):
+    obj = HamiltonianObjective(test_hamiltonian,
+                               use_linear_op=use_linear_op,
+                               matrix_free=matrix_free)
+
+    numpy.random.seed(47306)
+    state = cirq.testing.random_superposition(16)
+    direction = cirq.testing.random_superposition(16)
+    step_size = 1e-6
+    finite_difference = (obj.value(state + step_size * direction)
+                         - obj.value(state - step_size * direction)
+                         ) / (2 * step_size)
+    numpy.testing.assert_allclose(
+            2 * numpy.vdot(obj.state_gradient(state), direction).real,
+            finite_difference, atol=1e-6)
+
+
+def test_hamiltonian_objective_shared_memory_copy():
+    obj = HamiltonianObjective(test_hamiltonian)
+    shared_obj = obj.shared_memory_copy()
+    assert shared_obj is not obj
+    assert obj.shared_memory_copy() is shared_obj
+
+    state = openfermion.haar_random_vector(2**4, seed=9120)
+    numpy.testing.assert_allclose(shared_obj.value(state), obj.value(state))
+
+    # Pickling the copy does not copy the matrix
+    shared_data = pickle.dumps(shared_obj)
+    assert len(shared_data) < len(pickle.dumps(obj))
+    assert len(pickle.dumps(obj)) == len(
+            pickle.dumps(HamiltonianObjective(test_hamiltonian)))
+    unpickled = pickle.loads(shared_data)
+    numpy.testing.assert_allclose(unpickled.value(state), obj.value(state))
+
+    obj_linear_op = HamiltonianObjective(test_hamiltonian, use_linear_op=True)
+    assert obj_linear_op.shared_memory_copy() is obj_linear_op
 
 
 def test_hamiltonian_objective_noise():
@@ -87,14 +134,91 @@ def test_hamiltonian_objective_noise_bounds():
 
 
 def test_hamiltonian_objective_value_not_implemented():
+    obj = HamiltonianObjective(test_hamiltonian)
+    qubits = cirq.LineQubit.range(4)
+    density_matrix_result = cirq.DensityMatrixSimulator().simulate(
+            cirq.Circuit(cirq.X.on_each(*qubits)), qubit_order=qubits)
+    with pytest.raises(NotImplementedError):
+        _ = obj.value(density_matrix_result)
+
+
+def test_hamiltonian_objective_value_missing_measurements():
     obj = HamiltonianObjective(test_hamiltonian)
     trial_result = cirq.TrialResult(
             params=cirq.ParamResolver({}),
             measurements={})
-    with pytest.raises(NotImplementedError):
+    with pytest.raises(ValueError):
         _ = obj.value(trial_result)
 
 
+def test_hamiltonian_objective_measurement_groups():
+    obj = HamiltonianObjective(test_hamiltonian)
+    qubit_op = openfermion.jordan_wigner(test_hamiltonian)
+    groups = obj.measurement_groups
+
+    assert len(groups) < len(qubit_op.terms) - 1
+    assert sum(groups, openfermion.QubitOperator((), qubit_op.constant)) == (
+            qubit_op)
+    for group in groups:
+        basis = {}
+        for term in group.terms:
+            for index, pauli in term:
+                assert basis.setdefault(index, pauli) == pauli
+
+    circuits = obj.measurement_circuits(cirq.LineQubit.range(4))
+    assert len(circuits) == len(groups)
+    for circuit in circuits:
+        assert circuit.are_all_measurements_terminal()
+
+
+def test_hamiltonian_objective_sample_deterministic():
+    a, b = cirq.LineQubit.range(2)
+
+    # An eigenstate of X0 Y1 with eigenvalue 1
+    obj = HamiltonianObjective(openfermion.QubitOperator('X0 Y1', 2.0) +
+                               openfermion.QubitOperator((), 0.25))
+    circuit = cirq.Circuit([cirq.H(a), cirq.H(b), cirq.S(b)])
+    result = obj.sample(circuit, [a, b], repetitions=20)
+    assert result.measurements['pauli_group_0'].shape == (20, 2)
+    assert obj.estimate(result) == (2.25, 0.0)
+    assert obj.value(result) == 2.25
+
+    # A computational basis state
+    obj = HamiltonianObjective(openfermion.QubitOperator('Z0', 0.5) +
+                               openfermion.QubitOperator('Z0 Z1', -1.0) +
+                               openfermion.QubitOperator('Z1', 0.125))
+    assert len(obj.measurement_groups) == 1
+    circuit = cirq.Circuit(cirq.X(a))
+    state = circuit.final_wavefunction(qubit_order=[a, b])
+    for result in (obj.sample(circuit, [a, b], repetitions=10),
+                   obj.sample_state(state, repetitions=10, seed=3)):
+        assert obj.estimate(result) == (-0.5 + 1.0 + 0.125, 0.0)
+
+
+def test_hamiltonian_objective_sample_state_matches_value():
+    obj = HamiltonianObjective(test_hamiltonian)
+    qubits = cirq.LineQubit.range(4)
+    circuit = cirq.testing.random_circuit(qubits, 5, 0.8, random_state=2810)
+    state = circuit.final_wavefunction(qubit_order=qubits)
+
+    estimate, variance = obj.estimate(
+            obj.sample_state(state, repetitions=5000, seed=7707))
+    assert abs(estimate - obj.value(state)) < 5 * numpy.sqrt(variance)
+
+    estimate, variance = obj.estimate(
+            obj.sample(circuit, qubits, repetitions=5000))
+    assert abs(estimate - obj.value(state)) < 5 * numpy.sqrt(variance)
+
+
+def test_hamiltonian_objective_matrix_free_invalid_arguments():
+    with pytest.raises(ValueError):
+        _ = HamiltonianObjective(test_hamiltonian,
+                                 use_linear_op=True,
+                                 matrix_free=True)
+    with pytest.raises(TypeError):
+        _ = HamiltonianObjective(test_fermion_op, matrix_free=True)
+
+
 def test_hamiltonian_objective_init_qubit_operator():
 
     obj = HamiltonianObjective(openfermion.QubitOperator((0, 'X')))
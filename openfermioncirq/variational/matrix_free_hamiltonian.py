@@ -0,0 +1,201 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""A fermionic Hamiltonian acting on state vectors without a matrix."""
+
+from typing import Dict, List, Tuple, Union
+
+import numpy
+import scipy.sparse.linalg
+
+import openfermion
+
+
+class MatrixFreeHamiltonian(scipy.sparse.linalg.LinearOperator):
+    """A Hamiltonian that acts on state vectors directly from its tensors.
+
+    The Hamiltonian is applied to a state vector under the Jordan-Wigner
+    transform without building a 2^n x 2^n matrix. The operator is split into
+
+        H = D + T + sum_l s_l A_l B_l
+
+    where D is diagonal in the computational basis, T is a one-body operator
+    with no diagonal part, and A_l, B_l are one-body operators. D contains the
+    one-body occupation terms and the number-number terms of the two-body
+    interaction, and is stored as a vector of length 2^n computed once with
+    vectorized occupation masks. The remaining two-body interaction is
+    factored into the low-rank sum by a singular value decomposition of the
+    N^2 x N^2 matrix of its coefficients in chemist ordering. Each one-body
+    operator is applied by acting on pairs of slices of the state tensor.
+
+    Memory use is a small number of state vectors, and applying the operator
+    takes O(n^2 2^n) time per factor.
+    """
+
+    def __init__(self,
+                 hamiltonian: Union[openfermion.DiagonalCoulombHamiltonian,
+                                    openfermion.InteractionOperator],
+                 tolerance: float=1e-12) -> None:
+        """
+        Args:
+            hamiltonian: The Hamiltonian.
+            tolerance: Singular values of the two-body interaction smaller
+                than this, relative to the largest one, are discarded.
+
+        Raises:
+            TypeError: The Hamiltonian is not an InteractionOperator or
+                DiagonalCoulombHamiltonian.
+        """
+        if isinstance(hamiltonian, openfermion.DiagonalCoulombHamiltonian):
+            one_body = numpy.array(hamiltonian.one_body, dtype=complex)
+            n_modes = one_body.shape[0]
+            number_number = numpy.array(hamiltonian.two_body, dtype=complex)
+            factors = [
+            ]  # type: List[Tuple[complex, numpy.ndarray, numpy.ndarray]]
+        elif isinstance(hamiltonian, openfermion.InteractionOperator):
+            one_body = numpy.array(hamiltonian.one_body_tensor, dtype=complex)
+            n_modes = one_body.shape[0]
+            two_body = numpy.array(hamiltonian.two_body_tensor, dtype=complex)
+            number_number, one_body_correction, factors = (
+                _factor_two_body(two_body, tolerance))
+            one_body += one_body_correction
+        else:
+            raise TypeError('A matrix-free Hamiltonian can only be built from '
+                            'an InteractionOperator or a '
+                            'DiagonalCoulombHamiltonian.')
+
+        super().__init__(dtype=complex, shape=(2**n_modes, 2**n_modes))
+        self.n_modes = n_modes
+        self.num_factors = len(factors)
+        self._constant = complex(hamiltonian.constant)
+        self._one_body = one_body - numpy.diag(numpy.diag(one_body))
+        self._factors = [(weight * left, right)
+                         for weight, left, right in factors]
+        self._parity_signs = {}  # type: Dict[int, numpy.ndarray]
+
+        # Diagonal part: occupation terms and number-number interactions
+        diagonal = numpy.full((2,) * n_modes, self._constant)
+        for p in range(n_modes):
+            diagonal[self._index({p: 1})] += (one_body[p, p] +
+                                              number_number[p, p])
+            for q in range(p + 1, n_modes):
+                diagonal[self._index({p: 1, q: 1})] += (number_number[p, q] +
+                                                        number_number[q, p])
+        if numpy.allclose(diagonal.imag, 0):
+            diagonal = diagonal.real
+        self._diagonal = diagonal.reshape(-1)
+
+    def _matvec(self, x: numpy.ndarray) -> numpy.ndarray:
+        state = numpy.reshape(x, (2,) * self.n_modes)
+        result = (self._diagonal.reshape(state.shape) * state).astype(
+            complex, copy=False)
+        self._add_one_body(result, self._one_body, state)
+        for left, right in self._factors:
+            intermediate = numpy.zeros_like(result)
+            self._add_one_body(intermediate, right, state)
+            self._add_one_body(result, left, intermediate)
+        return result.reshape(x.shape)
+
+    def _adjoint(self) -> 'MatrixFreeHamiltonian':
+        return self
+
+    def diagonal(self) -> numpy.ndarray:
+        """The diagonal of the Hamiltonian in the computational basis."""
+        return self._diagonal
+
+    def _add_one_body(self, out: numpy.ndarray, coefficients: numpy.ndarray,
+                      state: numpy.ndarray) -> None:
+        """Add sum_pq coefficients[p, q] a^dagger_p a_q applied to state."""
+        for p in range(self.n_modes):
+            if coefficients[p, p]:
+                index = self._index({p: 1})
+                out[index] += coefficients[p, p] * state[index]
+            for q in range(p + 1, self.n_modes):
+                forward = coefficients[p, q]
+                backward = coefficients[q, p]
+                if not (forward or backward):
+                    continue
+                # Jordan-Wigner sign from the occupied modes between p and q
+                sign = self._between_signs(p, q)
+                p_empty = self._index({p: 0, q: 1})
+                p_full = self._index({p: 1, q: 0})
+                if forward:
+                    out[p_full] += forward * sign * state[p_empty]
+                if backward:
+                    out[p_empty] += backward * sign * state[p_full]
+
+    def _between_signs(self, p: int, q: int) -> numpy.ndarray:
+        """Parity signs of the modes strictly between p < q.
+
+        The result broadcasts against a slice of the state tensor that fixes
+        the occupations of modes p and q.
+        """
+        num_between = q - p - 1
+        if num_between not in self._parity_signs:
+            signs = numpy.ones(1, dtype=numpy.int8)
+            for _ in range(num_between):
+                signs = numpy.multiply.outer(signs,
+                                             numpy.array([1, -1],
+                                                         dtype=numpy.int8))
+            self._parity_signs[num_between] = signs.reshape(-1)
+        return self._parity_signs[num_between].reshape(
+            (1,) * p + (2,) * num_between + (1,) * (self.n_modes - q - 1))
+
+    def _index(self, occupations: Dict[int, int]) -> Tuple:
+        """An index into the state tensor fixing some mode occupations."""
+        return tuple(occupations.get(mode, slice(None))
+                     for mode in range(self.n_modes))
+
+
+def _factor_two_body(two_body: numpy.ndarray, tolerance: float
+                    ) -> Tuple[numpy.ndarray, numpy.ndarray,
+                               List[Tuple[complex, numpy.ndarray,
+                                          numpy.ndarray]]]:
+    """Split sum_pqrs h_pqrs a^dagger_p a^dagger_q a_r a_s into parts.
+
+    Returns:
+        A tuple (number_number, one_body, factors). number_number[p, q] is the
+        coefficient of n_p n_q, one_body holds the one-body terms produced by
+        normal ordering, and factors is a list of (s, A, B) giving the
+        remaining interaction as sum s (sum_ps A_ps a^dagger_p a_s)
+        (sum_qr B_qr a^dagger_q a_r).
+    """
+    n_modes = two_body.shape[0]
+
+    # a^dagger_p a^dagger_q a_r a_s
+    #     = a^dagger_p a_s a^dagger_q a_r - delta_qs a^dagger_p a_r
+    one_body = -numpy.einsum('pqrq->pr', two_body)
+    chemist = numpy.transpose(two_body, (0, 3, 1, 2)).copy()
+
+    # Terms that are diagonal in the computational basis:
+    # a^dagger_p a_p a^dagger_q a_q = n_p n_q and, for p != s,
+    # a^dagger_p a_s a^dagger_s a_p = n_p - n_p n_s
+    number_number = numpy.zeros((n_modes, n_modes), dtype=complex)
+    for p in range(n_modes):
+        for q in range(n_modes):
+            number_number[p, q] += chemist[p, p, q, q]
+            chemist[p, p, q, q] = 0
+            if p != q:
+                number_number[p, p] += chemist[p, q, q, p]
+                number_number[p, q] -= chemist[p, q, q, p]
+                chemist[p, q, q, p] = 0
+
+    factors = []  # type: List[Tuple[complex, numpy.ndarray, numpy.ndarray]]
+    matrix = chemist.reshape(n_modes**2, n_modes**2)
+    if numpy.any(matrix):
+        left, singular_values, right = numpy.linalg.svd(matrix)
+        for l, value in enumerate(singular_values):
+            if value <= tolerance * singular_values[0]:
+                break
+            factors.append((value, left[:, l].reshape(n_modes, n_modes),
+                            right[l].reshape(n_modes, n_modes)))
+
+    return number_number, one_body, factors
@@ -0,0 +1,70 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import numpy
+import openfermion
+import pytest
+
+from openfermioncirq.variational.matrix_free_hamiltonian import (
+        MatrixFreeHamiltonian)
+
+
+@pytest.mark.parametrize('hamiltonian', [
+    openfermion.random_interaction_operator(4, real=True, seed=53717),
+    openfermion.random_interaction_operator(5, real=False, seed=24371),
+    openfermion.random_diagonal_coulomb_hamiltonian(5, real=False, seed=40),
+    openfermion.get_interaction_operator(
+        openfermion.fermi_hubbard(2, 2, 1., 4., chemical_potential=0.5)),
+    openfermion.get_diagonal_coulomb_hamiltonian(
+        openfermion.fermi_hubbard(1, 3, 1., 2., periodic=False)),
+])
+def test_matrix_free_hamiltonian_matches_sparse_operator(hamiltonian):
+    operator = MatrixFreeHamiltonian(hamiltonian)
+    sparse_operator = openfermion.get_sparse_operator(hamiltonian)
+    assert operator.shape == sparse_operator.shape
+
+    state = openfermion.haar_random_vector(operator.shape[0], seed=31095)
+    numpy.testing.assert_allclose(operator.dot(state),
+                                  sparse_operator.dot(state),
+                                  atol=1e-10)
+    numpy.testing.assert_allclose(
+            openfermion.expectation(operator, state),
+            openfermion.expectation(sparse_operator, state),
+            atol=1e-10)
+    numpy.testing.assert_allclose(operator.diagonal(),
+                                  sparse_operator.diagonal(),
+                                  atol=1e-10)
+    numpy.testing.assert_allclose(operator.adjoint().dot(state),
+                                  sparse_operator.dot(state),
+                                  atol=1e-10)
+
+
+def test_matrix_free_hamiltonian_real_input():
+    hamiltonian = openfermion.random_interaction_operator(3, seed=8)
+    operator = MatrixFreeHamiltonian(hamiltonian)
+    state = numpy.zeros(8)
+    state[5] = 1
+    numpy.testing.assert_allclose(
+            operator.dot(state),
+            openfermion.get_sparse_operator(hamiltonian).dot(state),
+            atol=1e-10)
+
+
+def test_matrix_free_hamiltonian_number_conserving_terms_are_diagonal():
+    hubbard = openfermion.get_interaction_operator(
+            openfermion.fermi_hubbard(2, 2, 1., 4.))
+    assert MatrixFreeHamiltonian(hubbard).num_factors == 0
+
+
+def test_matrix_free_hamiltonian_bad_type():
+    with pytest.raises(TypeError):
+        _ = MatrixFreeHamiltonian(openfermion.FermionOperator('0^ 1'))
@@ -46,6 +46,29 @@ class VariationalObjective(metaclass=abc.ABCMeta):
         possible settings of the parameters.
         """
 
+    def state_gradient(self, state: numpy.ndarray) -> numpy.ndarray:
+        """The costate of a state vector under the evaluation function.
+
+        Returns the vector phi such that a small change d psi of the state
+        vector psi changes `value(psi)` by 2 Re <phi|d psi>. This is used to
+        compute gradients of the value with respect to circuit parameters by
+        adjoint differentiation. Objectives that cannot provide it return
+        NotImplemented.
+        """
+        # Default: not available
+        return NotImplemented
+
+    def shared_memory_copy(self) -> 'VariationalObjective':
+        """A version of the objective to send to worker processes.
+
+        Objectives holding large read-only data may return a copy that keeps
+        the data in shared memory, so that unpickling it in a worker process
+        on the same machine does not copy the data. The copy is only valid
+        while this objective is alive. By default the objective itself is
+        returned.
+        """
+        return self
+
     def noise(self, cost: Optional[float]=None) -> float:
         """Artificial noise that may be added to the true objective value.
 
@@ -42,6 +42,11 @@ def test_variational_objective_noise():
     assert -0.6 < test_objective_noisy.noise(2.0) < 0.6
 
 
+def test_variational_objective_state_gradient_not_implemented():
+    state = numpy.array([1.0, 0.0, 0.0, 0.0])
+    assert test_objective.state_gradient(state) is NotImplemented
+
+
 def test_variational_objective_noise_bounds():
     assert test_objective.noise_bounds(100) == (-numpy.inf, numpy.inf)
 
@@ -0,0 +1,152 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""A sparse matrix whose arrays live in shared memory."""
+
+from typing import List, Tuple
+
+import weakref
+
+import numpy
+import scipy.sparse
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # coverage: ignore
+    # Python < 3.8
+    shared_memory = None  # type: ignore
+
+
+class SharedCSRMatrix:
+    """A CSR matrix stored in shared memory segments.
+
+    The data, indices and indptr arrays of the matrix are copied once into
+    shared memory blocks owned by the SharedCSRMatrix that created them.
+    Pickling a SharedCSRMatrix only records the names of the blocks, and
+    unpickling it in another process on the same machine attaches to the
+    blocks without copying them. The attached arrays are read-only.
+
+    The blocks are released when the owning SharedCSRMatrix is closed or
+    garbage collected, so the owner must outlive any process using them.
+
+    Attributes:
+        matrix: The matrix, as a scipy.sparse.csr_matrix backed by the shared
+            memory blocks.
+    """
+
+    def __init__(self, matrix: scipy.sparse.spmatrix) -> None:
+        """
+        Args:
+            matrix: The sparse matrix to share. It is converted to CSR format
+                if necessary.
+
+        Raises:
+            RuntimeError: Shared memory is not supported by this version of
+                Python.
+        """
+        if shared_memory is None:  # coverage: ignore
+            raise RuntimeError('Shared memory requires Python 3.8 or later.')
+        matrix = scipy.sparse.csr_matrix(matrix)
+
+        blocks = []  # type: List[shared_memory.SharedMemory]
+        arrays = []  # type: List[numpy.ndarray]
+        try:
+            for array in (matrix.data, matrix.indices, matrix.indptr):
+                block = shared_memory.SharedMemory(create=True,
+                                                   size=max(array.nbytes, 1))
+                blocks.append(block)
+                shared_array = numpy.ndarray(
+                        array.shape, dtype=array.dtype,
+                        buffer=block.buf)  # type: numpy.ndarray
+                shared_array[...] = array
+                arrays.append(shared_array)
+        except BaseException:  # coverage: ignore
+            _release(blocks, unlink=True)
+            raise
+
+        self._blocks = blocks
+        self._layout = tuple(
+            (block.name, array.shape, array.dtype.str)
+            for block, array in zip(blocks, arrays)
+        )  # type: Tuple[Tuple[str, Tuple[int, ...], str], ...]
+        self._shape = matrix.shape
+        self.matrix = _csr_from_arrays(arrays, self._shape)
+        self._finalizer = weakref.finalize(self, _release, blocks, True)
+
+    def close(self) -> None:
+        """Release the shared memory blocks.
+
+        For the owner, this also destroys the blocks. The matrix must not be
+        used afterwards.
+        """
+        self.matrix = None
+        self._finalizer()
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """The names of the shared memory blocks."""
+        return tuple(name for name, _, _ in self._layout)
+
+    def __reduce__(self):
+        return _attach, (self._layout, self._shape)
+
+
+def _attach(layout: Tuple[Tuple[str, Tuple[int, ...], str], ...],
+            shape: Tuple[int, int]) -> SharedCSRMatrix:
+    """Attach to the shared memory blocks of a SharedCSRMatrix."""
+    blocks = []  # type: List[shared_memory.SharedMemory]
+    arrays = []  # type: List[numpy.ndarray]
+    for name, array_shape, dtype in layout:
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        array = numpy.ndarray(
+                array_shape, dtype=dtype,
+                buffer=block.buf)  # type: numpy.ndarray
+        array.flags.writeable = False
+        arrays.append(array)
+
+    shared = SharedCSRMatrix.__new__(SharedCSRMatrix)
+    shared._blocks = blocks
+    shared._layout = layout
+    shared._shape = shape
+    shared.matrix = _csr_from_arrays(arrays, shape)
+    shared._finalizer = weakref.finalize(shared, _release, blocks, False)
+    return shared
+
+
+def _csr_from_arrays(arrays: List[numpy.ndarray],
+                     shape: Tuple[int, int]) -> scipy.sparse.csr_matrix:
+    """Wrap data, indices and indptr arrays in a CSR matrix without copying."""
+    data, indices, indptr = arrays
+    matrix = scipy.sparse.csr_matrix(shape, dtype=data.dtype)
+    matrix.data = data
+    matrix.indices = indices
+    matrix.indptr = indptr
+    return matrix
+
+
+def _release(blocks: List['shared_memory.SharedMemory'],
+             unlink: bool) -> None:
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:  # coverage: ignore
+            # An array still refers to the block; the mapping is released
+            # when the process exits
+            pass
+        if unlink:
+            block.unlink()
+
+
+def shared_memory_supported() -> bool:
+    """Whether this version of Python supports SharedCSRMatrix."""
+    return shared_memory is not None
+
@@ -0,0 +1,85 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import multiprocessing
+import pickle
+
+import numpy
+import pytest
+import scipy.sparse
+
+from openfermioncirq.variational.shared_csr_matrix import (
+        SharedCSRMatrix, shared_memory_supported)
+
+
+pytestmark = pytest.mark.skipif(not shared_memory_supported(),
+                                reason='Shared memory is not supported.')
+
+
+def _apply(args):
+    shared, vector = args
+    return shared.matrix.dot(vector)
+
+
+def test_shared_csr_matrix_matches_matrix():
+    matrix = scipy.sparse.random(20, 20, density=0.2, format='csc',
+                                 random_state=3) * (1 + 2j)
+    shared = SharedCSRMatrix(matrix)
+    try:
+        assert scipy.sparse.isspmatrix_csr(shared.matrix)
+        numpy.testing.assert_allclose(shared.matrix.toarray(),
+                                      matrix.toarray())
+    finally:
+        shared.close()
+
+
+def test_shared_csr_matrix_pickle_attaches_without_copy():
+    matrix = scipy.sparse.random(200, 200, density=0.5, format='csr',
+                                 random_state=5)
+    shared = SharedCSRMatrix(matrix)
+    try:
+        data = pickle.dumps(shared)
+        assert len(data) < 1000
+        attached = pickle.loads(data)
+        assert attached.names == shared.names
+        numpy.testing.assert_allclose(attached.matrix.toarray(),
+                                      matrix.toarray())
+        assert not attached.matrix.data.flags.writeable
+
+        # Both views refer to the same memory
+        shared.matrix.data[0] = 17.0
+        assert attached.matrix.data[0] == 17.0
+        attached.close()
+    finally:
+        shared.close()
+
+
+def test_shared_csr_matrix_in_spawned_process():
+    matrix = scipy.sparse.random(64, 64, density=0.1, format='csr',
+                                 random_state=7)
+    vector = numpy.arange(64.0)
+    shared = SharedCSRMatrix(matrix)
+    try:
+        with multiprocessing.get_context('spawn').Pool(1) as pool:
+            result = pool.map(_apply, [(shared, vector)])[0]
+        numpy.testing.assert_allclose(result, matrix.dot(vector))
+    finally:
+        shared.close()
+
+
+def test_shared_csr_matrix_close_releases_memory():
+    shared = SharedCSRMatrix(scipy.sparse.identity(4, format='csr'))
+    data = pickle.dumps(shared)
+    shared.close()
+    assert shared.matrix is None
+    with pytest.raises(FileNotFoundError):
+        _ = pickle.loads(data)
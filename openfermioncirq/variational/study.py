@@ -12,14 +12,18 @@
 """The variational study class."""
 
 from typing import (Any, Dict, Hashable, Iterable, List, Optional, Sequence,
-                    Type, Union, cast)
+                    Tuple, Type, Union, cast)
 
 import collections
+import hashlib
 import itertools
 import multiprocessing
+import multiprocessing.pool
 import os
 import pickle
+import struct
 import time
+import weakref
 
 import numpy
 
@@ -66,6 +70,35 @@ class VariationalStudy:
             optimization runs of the study. Key is the identifier used to
             label the run.
         num_params: The number of parameters in the circuit.
+
+    When multiprocessing is used, the study keeps a pool of worker processes
+    alive between calls. The ansatz, objective, preparation circuit and
+    initial state are sent to each worker once, when the pool starts, and
+    tasks refer to them by a handle. Objectives that support it keep their
+    large read-only data in shared memory (see
+    `VariationalObjective.shared_memory_copy`). The pool is restarted
+    automatically if any of these objects is replaced or a different number
+    of processes is requested. Call `close` to shut the workers down, or use
+    the study as a context manager::
+
+        with VariationalStudy('my_study', ansatz, objective) as study:
+            study.optimize(optimization_params, use_multiprocessing=True)
+
+    The workers are also shut down when the study is garbage collected or
+    the interpreter exits.
+
+    If `checkpoint` is set, the study keeps a checkpoint directory named
+    `<name>.checkpoint` in its data directory. Each OptimizationResult is
+    appended to a log in this directory as soon as it is obtained, so
+    completed repetitions survive if the process is interrupted. Creating a
+    checkpointed study whose directory already exists picks up the results
+    recorded there, and passing `resume=True` to `optimize` or
+    `optimize_sweep` then only runs the repetitions that are missing. The
+    recorded results can be listed with `load_results` without
+    reconstructing the ansatz. Setting `checkpoint` to True on an existing
+    study records the results it already has. A checkpoint directory
+    written by a study with a different ansatz, objective or other
+    arguments is never taken over; a ValueError is raised instead.
     """
 
     def __init__(
@@ -79,7 +112,8 @@ class VariationalStudy:
             black_box_type: Type[
                 variational_black_box.
                 VariationalBlackBox] = variational_black_box.UNITARY_SIMULATE,
-            datadir: Optional[str] = None) -> None:
+            datadir: Optional[str] = None,
+            checkpoint: bool = False) -> None:
         """
         Args:
             name: The name of the study.
@@ -94,6 +128,14 @@ class VariationalStudy:
                 optimization.
             datadir: The directory to use when saving the study. The default
                 behavior is to use the current working directory.
+            checkpoint: Whether to record each optimization result in the
+                study's checkpoint directory as soon as it is obtained.
+                Results already recorded there are added to
+                `trial_results`.
+
+        Raises:
+            ValueError: `checkpoint` is set and the checkpoint directory
+                belongs to a study with different arguments.
         """
         # TODO store results as a pandas DataFrame?
         self.name = name
@@ -109,6 +151,15 @@ class VariationalStudy:
         self._black_box_type = black_box_type
         self.datadir = datadir
 
+        self._pool = None  # type: Optional[multiprocessing.pool.Pool]
+        self._pool_num_processes = None  # type: Optional[int]
+        self._pool_handle = None  # type: Optional[int]
+        self._pool_shared_state = None  # type: Optional[Tuple]
+        self._pool_finalizer = None  # type: Optional[weakref.finalize]
+
+        self._checkpoint = False
+        self.checkpoint = checkpoint
+
     def optimize(self,
                  optimization_params: OptimizationParams,
                  identifier: Optional[Hashable] = None,
@@ -117,7 +168,8 @@ class VariationalStudy:
                  repetitions: int = 1,
                  seeds: Optional[Sequence[int]] = None,
                  use_multiprocessing: bool = False,
-                 num_processes: Optional[int] = None
+                 num_processes: Optional[int] = None,
+                 resume: bool = False
                 ) -> OptimizationTrialResult:
         """Perform an optimization run and save the results.
 
@@ -158,6 +210,11 @@ class VariationalStudy:
             num_processes: The number of processes to use for multiprocessing.
                 The default behavior is to use the output of
                 `multiprocessing.cpu_count()`.
+            resume: Whether to complete an existing result with the same
+                identifier instead of replacing it. Only the repetitions that
+                are missing are run, using the parameters of the existing
+                result. If seeds are given, a repetition is missing if its
+                seed does not appear among the existing results.
 
         Side effects:
             Saves the returned OptimizationTrialResult into the `trial_results`
@@ -167,7 +224,7 @@ class VariationalStudy:
                                    [identifier] if identifier else None,
                                    reevaluate_final_params, save_x_vals,
                                    repetitions, seeds, use_multiprocessing,
-                                   num_processes)[0]
+                                   num_processes, resume)[0]
 
     def optimize_sweep(self,
                        param_sweep: Iterable[OptimizationParams],
@@ -177,7 +234,8 @@ class VariationalStudy:
                        repetitions: int = 1,
                        seeds: Optional[Sequence[int]] = None,
                        use_multiprocessing: bool = False,
-                       num_processes: Optional[int] = None
+                       num_processes: Optional[int] = None,
+                       resume: bool = False
                       ) -> List[OptimizationTrialResult]:
         """Perform multiple optimization runs and save the results.
 
@@ -211,6 +269,11 @@ class VariationalStudy:
             num_processes: The number of processes to use for multiprocessing.
                 The default behavior is to use the output of
                 `multiprocessing.cpu_count()`.
+            resume: Whether to complete an existing result with the same
+                identifier instead of replacing it. Only the repetitions that
+                are missing are run, using the parameters of the existing
+                result. If seeds are given, a repetition is missing if its
+                seed does not appear among the existing results.
 
         Side effects:
             Saves the returned OptimizationTrialResult into the results
@@ -231,7 +294,9 @@ class VariationalStudy:
                 start = 0
             identifiers = itertools.count(cast(int, start))  # type: ignore
 
-        if use_multiprocessing and repetitions == 1:
+        if use_multiprocessing and repetitions == 1 and not resume:
+            param_sweep = list(param_sweep)
+            identifiers = list(itertools.islice(identifiers, len(param_sweep)))
             trial_results = self._get_trial_result_list(
                 param_sweep, identifiers, reevaluate_final_params, save_x_vals,
                 seeds, num_processes)
@@ -242,7 +307,21 @@ class VariationalStudy:
             for identifier, optimization_params in zip(identifiers,
                                                        param_sweep):
 
+                if resume and identifier in self.trial_results:
+                    trial_result = self.trial_results[identifier]
+                    remaining, remaining_seeds = _missing_repetitions(
+                        trial_result, repetitions, seeds)
+                    result_list = self._get_result_list(
+                        trial_result.params, identifier,
+                        reevaluate_final_params, save_x_vals, remaining,
+                        remaining_seeds, use_multiprocessing, num_processes)
+                    trial_result.extend(result_list)
+                    trial_results.append(trial_result)
+                    continue
+
+                self._record((_TRIAL, identifier, optimization_params))
                 result_list = self._get_result_list(optimization_params,
+                                                    identifier,
                                                     reevaluate_final_params,
                                                     save_x_vals, repetitions,
                                                     seeds, use_multiprocessing,
@@ -307,45 +386,44 @@ class VariationalStudy:
 
         optimization_params = self.trial_results[identifier].params
 
-        result_list = self._get_result_list(optimization_params,
+        result_list = self._get_result_list(optimization_params, identifier,
                                             reevaluate_final_params,
                                             save_x_vals, repetitions, seeds,
                                             use_multiprocessing, num_processes)
 
         self.trial_results[identifier].extend(result_list)
 
-    def _get_trial_result_list(self, param_sweep: Iterable[OptimizationParams],
-                               identifiers: Optional[Iterable[Hashable]],
+    def _get_trial_result_list(self, param_sweep: List[OptimizationParams],
+                               identifiers: List[Hashable],
                                reevaluate_final_params: bool, save_x_vals: bool,
                                seeds: Optional[Sequence[int]],
                                num_processes: Optional[int]
                               ) -> List[OptimizationTrialResult]:
 
-        if num_processes is None:
-            # coverage: ignore
-            num_processes = multiprocessing.cpu_count()
-        pool = multiprocessing.Pool(num_processes)
-        try:
-            arg_tuples = ((self.ansatz, self.objective,
-                           self._preparation_circuit, self.initial_state,
-                           optimization_params, reevaluate_final_params,
-                           save_x_vals, seeds[0] if seeds is not None else
-                           numpy.random.randint(2**16),
-                           self.ansatz.default_initial_params(),
-                           self._black_box_type)
-                          for optimization_params in param_sweep)
-            result_list = pool.map(_run_optimization, arg_tuples)
-            trial_results = [
-                OptimizationTrialResult([result], optimization_params)
-                for optimization_params, result in zip(param_sweep, result_list)
-            ]
-        finally:
-            pool.terminate()
+        for identifier, optimization_params in zip(identifiers, param_sweep):
+            self._record((_TRIAL, identifier, optimization_params))
+
+        pool, handle = self._get_pool(num_processes)
+        arg_tuples = ((handle, optimization_params, reevaluate_final_params,
+                       save_x_vals, seeds[0] if seeds is not None else
+                       numpy.random.randint(2**16))
+                      for optimization_params in param_sweep)
+        result_list = []
+        for identifier, result in zip(
+                identifiers, pool.imap(_run_optimization_in_worker,
+                                       arg_tuples)):
+            self._record((_RESULT, identifier, result))
+            result_list.append(result)
+        trial_results = [
+            OptimizationTrialResult([result], optimization_params)
+            for optimization_params, result in zip(param_sweep, result_list)
+        ]
 
         return trial_results
 
     def _get_result_list(self,
                          optimization_params,
+                         identifier: Hashable,
                          reevaluate_final_params: bool,
                          save_x_vals: bool,
                          repetitions: int = 1,
@@ -355,35 +433,90 @@ class VariationalStudy:
                         ) -> List[OptimizationResult]:
 
         if use_multiprocessing:
-            if num_processes is None:
-                num_processes = multiprocessing.cpu_count()
-            pool = multiprocessing.Pool(num_processes)
-            try:
-                arg_tuples = ((self.ansatz, self.objective,
-                               self._preparation_circuit, self.initial_state,
-                               optimization_params, reevaluate_final_params,
-                               save_x_vals, seeds[i] if seeds is not None else
-                               numpy.random.randint(2**16),
-                               self.ansatz.default_initial_params(),
-                               self._black_box_type)
-                              for i in range(repetitions))
-                result_list = pool.map(_run_optimization, arg_tuples)
-            finally:
-                pool.terminate()
+            pool, handle = self._get_pool(num_processes)
+            arg_tuples = ((handle, optimization_params,
+                           reevaluate_final_params, save_x_vals,
+                           seeds[i] if seeds is not None else
+                           numpy.random.randint(2**16))
+                          for i in range(repetitions))
+            results = pool.imap(
+                _run_optimization_in_worker,
+                arg_tuples)  # type: Iterable[OptimizationResult]
         else:
-            result_list = []
-            for i in range(repetitions):
-                result = _run_optimization(
-                    (self.ansatz, self.objective, self._preparation_circuit,
-                     self.initial_state, optimization_params,
-                     reevaluate_final_params, save_x_vals, seeds[i]
-                     if seeds is not None else numpy.random.randint(2**16),
-                     self.ansatz.default_initial_params(),
-                     self._black_box_type))
-                result_list.append(result)
+            shared_state = self._shared_state()
+            results = (_run_optimization(
+                shared_state, optimization_params, reevaluate_final_params,
+                save_x_vals, seeds[i] if seeds is not None else
+                numpy.random.randint(2**16)) for i in range(repetitions))
+
+        result_list = []
+        for result in results:
+            self._record((_RESULT, identifier, result))
+            result_list.append(result)
 
         return result_list
 
+    def _shared_state(self) -> Tuple:
+        """The read-only objects needed to run an optimization."""
+        return (self.ansatz, self.objective, self._preparation_circuit,
+                self.initial_state, self.ansatz.default_initial_params(),
+                self._black_box_type)
+
+    def _get_pool(self, num_processes: Optional[int]
+                 ) -> Tuple[multiprocessing.pool.Pool, int]:
+        """Return the study's worker pool, starting it if necessary.
+
+        Returns:
+            The pool and the handle under which its workers store the shared
+            state of the study.
+        """
+        if num_processes is None:
+            num_processes = multiprocessing.cpu_count()
+        shared_state = self._shared_state()
+        if (self._pool is None or self._pool_num_processes != num_processes or
+                not _same_objects(shared_state, self._pool_shared_state)):
+            self.close()
+            self._pool_handle = next(_pool_handles)
+            # Large read-only data of the objective is placed in shared
+            # memory instead of being copied into every worker
+            worker_state = ((shared_state[0],
+                             shared_state[1].shared_memory_copy()) +
+                            shared_state[2:])
+            self._pool = multiprocessing.Pool(num_processes,
+                                              initializer=_initialize_worker,
+                                              initargs=(self._pool_handle,
+                                                        worker_state))
+            self._pool_finalizer = weakref.finalize(self, _shut_down_pool,
+                                                    self._pool)
+            self._pool_num_processes = num_processes
+            self._pool_shared_state = shared_state
+        return self._pool, cast(int, self._pool_handle)
+
+    def close(self) -> None:
+        """Shut down the worker processes used for multiprocessing, if any."""
+        if self._pool_finalizer is not None:
+            self._pool_finalizer()
+        self._pool = None
+        self._pool_num_processes = None
+        self._pool_handle = None
+        self._pool_shared_state = None
+        self._pool_finalizer = None
+
+    def __enter__(self) -> 'VariationalStudy':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        state['_pool_num_processes'] = None
+        state['_pool_handle'] = None
+        state['_pool_shared_state'] = None
+        state['_pool_finalizer'] = None
+        return state
+
     def __str__(self) -> str:
         header = []  # type: List[str]
         details = []  # type: List[str]
@@ -392,6 +525,11 @@ class VariationalStudy:
 
         for identifier, result in self.trial_results.items():
 
+            if not result.repetitions:
+                details.append('    Identifier: {}'.format(identifier))
+                details.append('        Number of repetitions: 0')
+                continue
+
             result_opt = result.optimal_value
             if result_opt < optimal_value:
                 optimal_value = result_opt
@@ -466,7 +604,8 @@ class VariationalStudy:
             'preparation_circuit': self._preparation_circuit,
             'initial_state': self.initial_state,
             'target': self.target,
-            'black_box_type': self._black_box_type
+            'black_box_type': self._black_box_type,
+            'checkpoint': self.checkpoint
         }
 
     def save(self) -> None:
@@ -484,6 +623,10 @@ class VariationalStudy:
     def load(name: str, datadir: Optional[str] = None) -> 'VariationalStudy':
         """Load a study from disk.
 
+        The study is loaded from the file written by `save` if it exists, and
+        otherwise from the study's checkpoint directory, in which case the
+        loaded study continues checkpointing.
+
         Args:
             name: The name of the study.
             datadir: The directory where the study file is saved.
@@ -494,19 +637,325 @@ class VariationalStudy:
             filename = '{}.study'.format(name)
         if datadir is not None:
             filename = os.path.join(datadir, filename)
+        if not os.path.exists(filename):
+            checkpoint_dir = _checkpoint_dir(name[:-len('.study')]
+                                             if name.endswith('.study') else
+                                             name, datadir)
+            if os.path.isdir(checkpoint_dir):
+                with open(os.path.join(checkpoint_dir, _HEADER_FILENAME),
+                          'rb') as f:
+                    cls, kwargs, _ = pickle.load(f)
+                study = cls(datadir=datadir, **kwargs)
+                study.checkpoint = True
+                return study
         with open(filename, 'rb') as f:
             cls, kwargs, trial_results = pickle.load(f)
         study = cls(datadir=datadir, **kwargs)
+        # Results recorded in the checkpoint log are at least as recent as
+        # those in the study file
         for key, val in trial_results.items():
-            study.trial_results[key] = val
+            if key not in study.trial_results:
+                study.trial_results[key] = val
+                study._record(*_trial_records(key, val))
         return study
 
+    @staticmethod
+    def load_results(name: str, datadir: Optional[str] = None
+                    ) -> Dict[Any, OptimizationTrialResult]:
+        """Load the results recorded in a study's checkpoint directory.
+
+        Only the results are read, so the ansatz and objective of the study
+        are not reconstructed.
+
+        Args:
+            name: The name of the study.
+            datadir: The directory where the study is saved.
+
+        Returns:
+            A dictionary of OptimizationTrialResults, keyed by identifier, in
+            the order in which they were started.
+        """
+        records, _ = _read_checkpoint_log(_checkpoint_dir(name, datadir))
+        return _trial_results_from_records(records)
+
+    @property
+    def checkpoint(self) -> bool:
+        """Whether each optimization result is recorded in the study's
+        checkpoint directory as soon as it is obtained.
+
+        Setting this to True creates the checkpoint directory if necessary,
+        adds the results recorded there to `trial_results` and records the
+        trial results that the study already has.
+
+        Raises:
+            ValueError: The checkpoint directory belongs to a study with
+                different arguments.
+        """
+        return self._checkpoint
+
+    @checkpoint.setter
+    def checkpoint(self, checkpoint: bool) -> None:
+        if checkpoint and not self._checkpoint:
+            self._start_checkpoint()
+        self._checkpoint = checkpoint
+
+    def _start_checkpoint(self) -> None:
+        """Write the header of the checkpoint directory and bring its log
+        and `trial_results` up to date with each other."""
+        checkpoint_dir = _checkpoint_dir(self.name, self.datadir)
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        filename = os.path.join(checkpoint_dir, _HEADER_FILENAME)
+        kwargs = self._init_kwargs()
+        kwargs['checkpoint'] = True
+        # The arguments are compared through fingerprints because their
+        # pickles differ between processes
+        fingerprints = {
+            name: _fingerprint_digest(value)
+            for name, value in kwargs.items() if name != 'checkpoint'
+        }
+        if os.path.exists(filename):
+            with open(filename, 'rb') as f:
+                stored_type, _, stored_fingerprints = pickle.load(f)
+            differing = sorted(
+                name for name in set(stored_fingerprints) | set(fingerprints)
+                if stored_fingerprints.get(name) != fingerprints.get(name))
+            if stored_type is not type(self):
+                differing.insert(0, 'type')
+            if differing:
+                raise ValueError(
+                    'The checkpoint directory {} belongs to a study with '
+                    'different {}.'.format(checkpoint_dir,
+                                           ', '.join(differing)))
+        with open(filename + '.tmp', 'wb') as f:
+            pickle.dump((type(self), kwargs, fingerprints), f)
+        os.replace(filename + '.tmp', filename)
+
+        # An incomplete record at the end of the log, left by an interrupted
+        # write, is discarded
+        records, size = _read_checkpoint_log(checkpoint_dir)
+        log_filename = os.path.join(checkpoint_dir, _LOG_FILENAME)
+        if os.path.exists(log_filename) and os.path.getsize(
+                log_filename) > size:
+            os.truncate(log_filename, size)
+
+        existing_records = [
+            record for identifier, trial_result in self.trial_results.items()
+            for record in _trial_records(identifier, trial_result)
+        ]
+        for identifier, trial_result in _trial_results_from_records(
+                records).items():
+            if identifier not in self.trial_results:
+                self.trial_results[identifier] = trial_result
+        # The records of the existing trial results come after those in the
+        # log, so they take precedence when the log is read
+        self._append_records(existing_records)
+
+    def _record(self, *records: Tuple) -> None:
+        """Append records to the checkpoint log if checkpointing."""
+        if self.checkpoint:
+            self._append_records(records)
+
+    def _append_records(self, records: Iterable[Tuple]) -> None:
+        data = b''.join(
+            _RECORD_SIZE.pack(len(pickled)) + pickled
+            for pickled in (pickle.dumps(record) for record in records))
+        if not data:
+            return
+        filename = os.path.join(_checkpoint_dir(self.name, self.datadir),
+                                _LOG_FILENAME)
+        with open(filename, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+# Checkpoint log records are either (_TRIAL, identifier, OptimizationParams),
+# which starts a new trial result, or (_RESULT, identifier,
+# OptimizationResult), which adds a repetition to it
+_TRIAL = 'trial'
+_RESULT = 'result'
+_RECORD_SIZE = struct.Struct('<Q')
+_HEADER_FILENAME = 'study.pkl'
+_LOG_FILENAME = 'results.log'
+
+
+def _checkpoint_dir(name: str, datadir: Optional[str]) -> str:
+    return os.path.join(datadir or '', '{}.checkpoint'.format(name))
+
+
+def _read_checkpoint_log(checkpoint_dir: str) -> Tuple[List[Tuple], int]:
+    """Read the complete records of a checkpoint log.
+
+    Returns:
+        The records and the number of bytes they occupy.
+    """
+    records = []  # type: List[Tuple]
+    size = 0
+    filename = os.path.join(checkpoint_dir, _LOG_FILENAME)
+    if not os.path.exists(filename):
+        return records, size
+    with open(filename, 'rb') as f:
+        while True:
+            header = f.read(_RECORD_SIZE.size)
+            if len(header) < _RECORD_SIZE.size:
+                break
+            length, = _RECORD_SIZE.unpack(header)
+            data = f.read(length)
+            if len(data) < length:
+                break
+            records.append(pickle.loads(data))
+            size += _RECORD_SIZE.size + length
+    return records, size
+
+
+def _trial_records(identifier: Hashable,
+                   trial_result: OptimizationTrialResult) -> List[Tuple]:
+    """The checkpoint log records that reproduce a trial result."""
+    return [(_TRIAL, identifier, trial_result.params)] + [
+        (_RESULT, identifier, result) for result in trial_result.results
+    ]
+
+
+def _trial_results_from_records(records: Iterable[Tuple]
+                               ) -> Dict[Any, OptimizationTrialResult]:
+    """Rebuild the trial results from checkpoint log records.
+
+    Results of trials that have no trial record are skipped.
+    """
+    params = collections.OrderedDict()  # type: Dict[Any, OptimizationParams]
+    results = {}  # type: Dict[Any, List[OptimizationResult]]
+    for kind, identifier, payload in records:
+        if kind == _TRIAL:
+            params[identifier] = payload
+            results[identifier] = []
+        elif identifier in results:
+            results[identifier].append(payload)
+    return collections.OrderedDict(
+        (identifier, OptimizationTrialResult(results[identifier],
+                                             optimization_params))
+        for identifier, optimization_params in params.items())
+
+
+def _fingerprint_digest(value: Any) -> str:
+    """A digest of a study argument that is the same in every process."""
+    return hashlib.sha256(repr(_fingerprint(value)).encode()).hexdigest()
+
+
+def _fingerprint(value: Any) -> Any:
+    """A representation of a study argument built from builtin values.
+
+    An ansatz is represented by its class, qubits and parameters, and other
+    objects by their class and public attributes, so that caches do not
+    count.
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str)):
+        return value
+    if isinstance(value, numpy.generic):
+        return value.item()
+    if isinstance(value, numpy.ndarray):
+        contents = numpy.ascontiguousarray(value)
+        if contents.dtype == object:
+            return ('ndarray', value.shape,
+                    _fingerprint(contents.ravel().tolist()))
+        return ('ndarray', value.shape, str(value.dtype),
+                hashlib.sha256(contents.tobytes()).hexdigest())
+    if isinstance(value, (list, tuple)):
+        return tuple(_fingerprint(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted(
+            ((_fingerprint(key), _fingerprint(item))
+             for key, item in value.items()),
+            key=repr))
+    if isinstance(value, type):
+        return '{}.{}'.format(value.__module__, value.__qualname__)
+    if isinstance(value, VariationalAnsatz):
+        return (_fingerprint(type(value)),
+                tuple(repr(qubit) for qubit in value.qubits),
+                tuple(str(param) for param in value.params()))
+    if isinstance(value, (cirq.Qid, cirq.Circuit)):
+        return repr(value)
+    if hasattr(value, '__dict__'):
+        return (_fingerprint(type(value)),
+                _fingerprint({name: item
+                              for name, item in vars(value).items()
+                              if not name.startswith('_')}))
+    return repr(value)
+
+
+def _missing_repetitions(trial_result: OptimizationTrialResult,
+                         repetitions: int, seeds: Optional[Sequence[int]]
+                        ) -> Tuple[int, Optional[List[int]]]:
+    """The repetitions of a trial that have not been completed.
+
+    Returns:
+        The number of missing repetitions and, if seeds were given, their
+        seeds.
+    """
+    if seeds is None:
+        return max(repetitions - trial_result.repetitions, 0), None
+    completed = collections.Counter(
+        result.seed for result in trial_result.results)
+    missing_seeds = []
+    for seed in seeds[:repetitions]:
+        if completed[seed]:
+            completed[seed] -= 1
+        else:
+            missing_seeds.append(seed)
+    return len(missing_seeds), missing_seeds
 
-def _run_optimization(args) -> OptimizationResult:
+
+_pool_handles = itertools.count()
+
+# The shared state of the study that started this worker process, keyed by
+# pool handle
+_worker_shared_state = {}  # type: Dict[int, Tuple]
+
+
+def _shut_down_pool(pool: multiprocessing.pool.Pool) -> None:
+    pool.terminate()
+    pool.join()
+
+
+def _initialize_worker(handle: int, shared_state: Tuple) -> None:
+    """Store the shared state of a study in a newly started worker."""
+    _worker_shared_state.clear()
+    _worker_shared_state[handle] = shared_state
+
+
+def _run_optimization_in_worker(args) -> OptimizationResult:
+    """Perform an optimization run using the worker's shared state."""
+    (handle, optimization_params, reevaluate_final_params, save_x_vals,
+     seed) = args
+    return _run_optimization(_worker_shared_state[handle], optimization_params,
+                             reevaluate_final_params, save_x_vals, seed)
+
+
+def _same_objects(first: Optional[Tuple], second: Optional[Tuple]) -> bool:
+    """Whether two tuples contain the same objects.
+
+    Objects are compared by identity, except for numbers and arrays, which are
+    compared by value.
+    """
+    if first is None or second is None or len(first) != len(second):
+        return False
+    for a, b in zip(first, second):
+        if a is b:
+            continue
+        if isinstance(a, numpy.ndarray) and isinstance(b, numpy.ndarray):
+            if not numpy.array_equal(a, b):
+                return False
+        elif not (isinstance(a, (int, float)) and a == b):
+            return False
+    return True
+
+
+def _run_optimization(shared_state: Tuple,
+                      optimization_params: OptimizationParams,
+                      reevaluate_final_params: bool, save_x_vals: bool,
+                      seed: int) -> OptimizationResult:
     """Perform an optimization run and return the result."""
-    (ansatz, objective, preparation_circuit, initial_state, optimization_params,
-     reevaluate_final_params, save_x_vals, seed, default_initial_params,
-     black_box_type) = args
+    (ansatz, objective, preparation_circuit, initial_state,
+     default_initial_params, black_box_type) = shared_state
 
     stateful = issubclass(black_box_type, StatefulBlackBox)
 
@@ -10,13 +10,23 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import gc
 import os
+import pickle
+import subprocess
+import sys
 
 import numpy
 import cirq
+import openfermion
 import pytest
 
-from openfermioncirq import VariationalObjective, VariationalStudy
+import openfermioncirq
+from openfermioncirq import (
+        HamiltonianObjective,
+        SwapNetworkTrotterAnsatz,
+        VariationalObjective,
+        VariationalStudy)
 from openfermioncirq.optimization import (
         OptimizationParams,
         OptimizationTrialResult,
@@ -176,6 +186,77 @@ def test_variational_study_initial_state():
     numpy.testing.assert_allclose(result1.optimal_value, result2.optimal_value)
 
 
+def test_variational_study_reuses_pool():
+    study = VariationalStudy(
+            'study', test_ansatz, test_objective,
+            black_box_type=variational_black_box.UNITARY_SIMULATE_STATEFUL)
+    try:
+        study.optimize(OptimizationParams(LazyAlgorithm()),
+                       repetitions=2,
+                       seeds=[3, 4],
+                       use_multiprocessing=True,
+                       num_processes=2)
+        pool = study._pool
+        assert pool is not None
+
+        study.optimize_sweep([OptimizationParams(LazyAlgorithm()),
+                              OptimizationParams(test_algorithm)],
+                             use_multiprocessing=True,
+                             num_processes=2)
+        study.extend_result(0,
+                            repetitions=2,
+                            seeds=[3, 4],
+                            use_multiprocessing=True,
+                            num_processes=2)
+        assert study._pool is pool
+
+        # Results agree with running in the main process
+        results = study.trial_results[0].results
+        assert results[0].optimal_value == results[2].optimal_value
+        assert results[1].optimal_value == results[3].optimal_value
+        study.extend_result(0, repetitions=1, seeds=[3])
+        assert results[4].optimal_value == results[0].optimal_value
+
+        # Changing the number of processes or the shared state restarts it
+        study.optimize(OptimizationParams(LazyAlgorithm()),
+                       use_multiprocessing=True,
+                       num_processes=1)
+        assert study._pool is not pool
+        pool = study._pool
+        study.initial_state = 1
+        study.optimize(OptimizationParams(LazyAlgorithm()),
+                       use_multiprocessing=True,
+                       num_processes=1)
+        assert study._pool is not pool
+
+        # The pool is not pickled along with the study
+        assert pickle.loads(pickle.dumps(study))._pool is None
+    finally:
+        study.close()
+    assert study._pool is None
+
+
+def test_variational_study_multiprocessing_hamiltonian_objective():
+    hamiltonian = openfermion.get_diagonal_coulomb_hamiltonian(
+            openfermion.fermi_hubbard(1, 2, 1., 4.))
+    ansatz = SwapNetworkTrotterAnsatz(hamiltonian)
+    objective = HamiltonianObjective(hamiltonian)
+    study = VariationalStudy('study', ansatz, objective,
+                             initial_state=0b0101)
+    try:
+        result = study.optimize(OptimizationParams(LazyAlgorithm()),
+                                repetitions=2,
+                                seeds=[0, 1],
+                                use_multiprocessing=True,
+                                num_processes=2)
+        worker_objective = study._pool_shared_state[1].shared_memory_copy()
+        assert worker_objective is objective.shared_memory_copy()
+    finally:
+        study.close()
+    assert result.results[0].optimal_value == study.value_of(
+            ansatz.default_initial_params())
+
+
 def test_variational_study_run_too_few_seeds_raises_error():
     with pytest.raises(ValueError):
         test_study.optimize(OptimizationParams(test_algorithm),
@@ -235,6 +316,99 @@ def test_variational_study_save_load():
     os.rmdir(datadir)
 
 
+def test_variational_study_checkpoint(tmpdir):
+    datadir = str(tmpdir)
+    study = VariationalStudy(
+            'checkpointed', test_ansatz, test_objective,
+            datadir=datadir, checkpoint=True,
+            black_box_type=variational_black_box.UNITARY_SIMULATE_STATEFUL)
+    assert os.path.isdir(os.path.join(datadir, 'checkpointed.checkpoint'))
+    study.optimize_sweep([OptimizationParams(test_algorithm),
+                          OptimizationParams(LazyAlgorithm())],
+                         identifiers=['example', 'lazy'],
+                         repetitions=2,
+                         seeds=[11, 12])
+    study.extend_result('lazy', seeds=[13])
+    study.optimize(OptimizationParams(LazyAlgorithm()), 'parallel',
+                   use_multiprocessing=True, num_processes=1)
+    study.close()
+
+    results = VariationalStudy.load_results('checkpointed', datadir)
+    assert list(results) == ['example', 'lazy', 'parallel']
+    for identifier, result in results.items():
+        expected = study.trial_results[identifier]
+        assert result.repetitions == expected.repetitions
+        assert list(result.data_frame['seed']) == list(
+                expected.data_frame['seed'])
+        assert list(result.data_frame['optimal_value']) == list(
+                expected.data_frame['optimal_value'])
+    assert isinstance(results['lazy'].params.algorithm, LazyAlgorithm)
+    assert list(results['lazy'].data_frame['seed']) == [11, 12, 13]
+
+    loaded_study = VariationalStudy.load('checkpointed', datadir=datadir)
+    assert loaded_study.checkpoint
+    assert str(loaded_study.circuit) == str(study.circuit)
+    assert list(loaded_study.trial_results) == ['example', 'lazy', 'parallel']
+
+    # Rerunning an identifier without resuming replaces its result
+    loaded_study.optimize(OptimizationParams(LazyAlgorithm()), 'lazy')
+    results = VariationalStudy.load_results('checkpointed', datadir)
+    assert results['lazy'].repetitions == 1
+
+
+def test_variational_study_checkpoint_resume(tmpdir):
+    datadir = str(tmpdir)
+    log_filename = os.path.join(datadir, 'resumed.checkpoint', 'results.log')
+    study = VariationalStudy('resumed', test_ansatz, test_objective,
+                             datadir=datadir, checkpoint=True)
+    study.optimize(OptimizationParams(LazyAlgorithm()), 'run',
+                   repetitions=3, seeds=[5, 6, 7])
+    complete_values = list(
+            study.trial_results['run'].data_frame['optimal_value'])
+
+    # Simulate an interruption during the third repetition, in the middle of
+    # writing the result of the second one
+    with open(log_filename, 'rb') as f:
+        data = f.read()
+    sizes = []
+    offset = 0
+    while offset < len(data):
+        size = int.from_bytes(data[offset:offset + 8], 'little') + 8
+        sizes.append(size)
+        offset += size
+    with open(log_filename, 'wb') as f:
+        f.write(data[:sum(sizes[:2]) + 10])
+
+    study = VariationalStudy('resumed', test_ansatz, test_objective,
+                             datadir=datadir, checkpoint=True)
+    assert study.trial_results['run'].repetitions == 1
+    assert os.path.getsize(log_filename) == sum(sizes[:2])
+
+    trial_result = study.optimize(OptimizationParams(LazyAlgorithm()), 'run',
+                                  repetitions=3, seeds=[5, 6, 7], resume=True)
+    assert list(trial_result.data_frame['seed']) == [5, 6, 7]
+    assert list(trial_result.data_frame['optimal_value']) == complete_values
+
+    # Nothing is left to do
+    study.optimize(OptimizationParams(LazyAlgorithm()), 'run',
+                   repetitions=3, seeds=[5, 6, 7], resume=True)
+    study.optimize(OptimizationParams(LazyAlgorithm()), 'run',
+                   repetitions=2, resume=True)
+    results = VariationalStudy.load_results('resumed', datadir)
+    assert list(results['run'].data_frame['seed']) == [5, 6, 7]
+
+    # Resuming without seeds only runs the missing number of repetitions
+    study.optimize(OptimizationParams(LazyAlgorithm()), 'run',
+                   repetitions=4, resume=True)
+    assert VariationalStudy.load_results('resumed',
+                                         datadir)['run'].repetitions == 4
+
+    # Resuming a new identifier starts it
+    study.optimize(OptimizationParams(LazyAlgorithm()), 'new', resume=True)
+    assert study.trial_results['new'].repetitions == 1
+    assert str(study).startswith('This study contains 2 trial results.')
+
+
 def test_variational_black_box_evaluate():
     black_box = UnitarySimulateVariationalBlackBox(test_ansatz, test_objective)
     numpy.testing.assert_allclose(
@@ -257,3 +431,138 @@ def test_variational_black_box_evaluate_with_cost():
     noisy_val = black_box_noisy.evaluate_with_cost(
             numpy.array([0.5, 0.0]), 10.0)
     assert -0.8 < noisy_val < 1.2
+
+
+def test_variational_study_enable_checkpoint(tmpdir):
+    datadir = str(tmpdir)
+    study = VariationalStudy('enabled', test_ansatz, test_objective,
+                             datadir=datadir)
+    study.optimize(OptimizationParams(LazyAlgorithm()), 'before',
+                   repetitions=2, seeds=[1, 2])
+    assert not os.path.exists(os.path.join(datadir, 'enabled.checkpoint'))
+
+    study.checkpoint = True
+    study.extend_result('before', seeds=[3])
+    study.optimize(OptimizationParams(LazyAlgorithm()), 'after')
+    results = VariationalStudy.load_results('enabled', datadir)
+    assert list(results) == ['before', 'after']
+    assert list(results['before'].data_frame['seed']) == [1, 2, 3]
+
+    # Turning checkpointing off and on again does not duplicate results
+    study.checkpoint = False
+    study.checkpoint = True
+    results = VariationalStudy.load_results('enabled', datadir)
+    assert list(results['before'].data_frame['seed']) == [1, 2, 3]
+
+    # The flag survives saving and loading
+    study.save()
+    loaded_study = VariationalStudy.load('enabled', datadir=datadir)
+    assert loaded_study.checkpoint
+    assert list(loaded_study.trial_results) == ['before', 'after']
+    loaded_study.extend_result('after')
+    assert VariationalStudy.load_results(
+            'enabled', datadir)['after'].repetitions == 2
+
+
+def test_variational_study_checkpoint_skips_results_without_trial(tmpdir):
+    datadir = str(tmpdir)
+    study = VariationalStudy('orphans', test_ansatz, test_objective,
+                             datadir=datadir, checkpoint=True)
+    result = study.optimize(OptimizationParams(LazyAlgorithm()),
+                            'run').results[0]
+    study._record(('result', 'unknown', result))
+    assert list(VariationalStudy.load_results('orphans', datadir)) == ['run']
+
+
+def test_variational_study_checkpoint_different_arguments_raises_error(
+        tmpdir):
+    datadir = str(tmpdir)
+    VariationalStudy('guarded', test_ansatz, test_objective,
+                     datadir=datadir, target=1.0, checkpoint=True)
+    VariationalStudy('guarded', test_ansatz, test_objective,
+                     datadir=datadir, target=1.0, checkpoint=True)
+    with pytest.raises(ValueError):
+        VariationalStudy('guarded', test_ansatz, test_objective,
+                         datadir=datadir, target=2.0, checkpoint=True)
+    study = VariationalStudy('guarded', test_ansatz, test_objective_noisy,
+                             datadir=datadir, target=1.0)
+    with pytest.raises(ValueError):
+        study.checkpoint = True
+    assert not study.checkpoint
+
+
+_RESUMED_STUDY_SCRIPT = """
+import sys
+import openfermion
+from openfermioncirq import (HamiltonianObjective, SwapNetworkTrotterAnsatz,
+                             VariationalStudy)
+from openfermioncirq.optimization import OptimizationParams
+from openfermioncirq.testing import LazyAlgorithm
+
+hamiltonian = openfermion.get_diagonal_coulomb_hamiltonian(
+    openfermion.jellium_model(openfermion.Grid(2, 2, 1.0), plane_wave=False))
+study = VariationalStudy('resumed',
+                         SwapNetworkTrotterAnsatz(hamiltonian, iterations=1),
+                         HamiltonianObjective(hamiltonian),
+                         datadir=sys.argv[1],
+                         checkpoint=True)
+if len(sys.argv) == 2:
+    study.optimize(OptimizationParams(LazyAlgorithm()), 'run')
+"""
+
+
+def run_resumed_study_script(datadir, *args):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [os.path.dirname(os.path.dirname(openfermioncirq.__file__))] +
+        [path for path in [env.get('PYTHONPATH')] if path])
+    subprocess.run([sys.executable, '-c', _RESUMED_STUDY_SCRIPT, datadir] +
+                   list(args),
+                   env=env,
+                   check=True)
+
+
+def test_variational_study_checkpoint_resumes_in_new_process(tmpdir):
+    datadir = str(tmpdir)
+    run_resumed_study_script(datadir)
+    run_resumed_study_script(datadir, 'resume')
+
+    hamiltonian = openfermion.get_diagonal_coulomb_hamiltonian(
+        openfermion.jellium_model(openfermion.Grid(2, 2, 1.0),
+                                  plane_wave=False))
+    study = VariationalStudy(
+            'resumed',
+            SwapNetworkTrotterAnsatz(hamiltonian, iterations=1),
+            HamiltonianObjective(hamiltonian),
+            datadir=datadir,
+            checkpoint=True)
+    assert list(study.trial_results) == ['run']
+
+    hamiltonian.constant += 1.0
+    with pytest.raises(ValueError):
+        VariationalStudy(
+                'resumed',
+                SwapNetworkTrotterAnsatz(hamiltonian, iterations=1),
+                HamiltonianObjective(hamiltonian),
+                datadir=datadir,
+                checkpoint=True)
+
+
+def test_variational_study_shuts_down_pool():
+    with VariationalStudy('study', test_ansatz, test_objective) as study:
+        study.optimize(OptimizationParams(LazyAlgorithm()),
+                       use_multiprocessing=True,
+                       num_processes=1)
+        pool = study._pool
+        assert pool is not None
+    assert study._pool is None
+    assert all(not worker.is_alive() for worker in pool._pool)
+
+    study = VariationalStudy('study', test_ansatz, test_objective)
+    study.optimize(OptimizationParams(LazyAlgorithm()),
+                   use_multiprocessing=True,
+                   num_processes=1)
+    workers = list(study._pool._pool)
+    del study
+    gc.collect()
+    assert all(not worker.is_alive() for worker in workers)
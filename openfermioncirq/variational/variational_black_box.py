@@ -21,6 +21,7 @@ import numpy
 import cirq
 
 from openfermioncirq.variational.ansatz import VariationalAnsatz
+from openfermioncirq.variational.compiled_circuit import CompiledCircuit
 from openfermioncirq.variational.objective import VariationalObjective
 from openfermioncirq.optimization import (
         BlackBox,
@@ -64,12 +65,27 @@ class VariationalBlackBox(BlackBox):
                            x: numpy.ndarray) -> float:
         """Evaluate parameters with a noiseless simulation."""
 
+    def evaluate_noiseless_batch(self,
+                                 xs: numpy.ndarray) -> numpy.ndarray:
+        """Evaluate multiple settings of the parameters without noise.
+
+        Each row of xs is one setting of the parameters.
+        """
+        # Default: defer to evaluate_noiseless
+        return numpy.array([self.evaluate_noiseless(x) for x in xs])
+
     def _evaluate(self,
                   x: numpy.ndarray) -> float:
         """Determine the value of some parameters."""
         # Default: defer to evaluate_noiseless
         return self.evaluate_noiseless(x)
 
+    def _evaluate_batch(self,
+                        xs: numpy.ndarray) -> numpy.ndarray:
+        """Determine the values of multiple settings of the parameters."""
+        # Default: defer to evaluate_noiseless_batch
+        return self.evaluate_noiseless_batch(xs)
+
     def _evaluate_with_cost(self,
                             x: numpy.ndarray,
                             cost: float) -> float:
@@ -77,6 +93,29 @@ class VariationalBlackBox(BlackBox):
         # Default: add artifical noise with the specified cost
         return self._evaluate(x) + self.objective.noise(cost)
 
+    def _evaluate_with_cost_batch(self,
+                                  xs: numpy.ndarray,
+                                  cost: float) -> numpy.ndarray:
+        """Evaluate multiple settings of the parameters with a cost."""
+        # Default: add independent artifical noise to each value
+        return self._evaluate_batch(xs) + numpy.array(
+                [self.objective.noise(cost) for _ in range(len(xs))])
+
+    def gradient(self,
+                 x: numpy.ndarray,
+                 step_size: float=1e-5) -> numpy.ndarray:
+        """The gradient of the noiseless objective function.
+
+        By default, the gradient is approximated with central finite
+        differences, evaluating all of the displaced points with a single call
+        to `evaluate_noiseless_batch`.
+        """
+        x = numpy.asarray(x, dtype=float)
+        displacements = step_size * numpy.eye(len(x))
+        vals = self.evaluate_noiseless_batch(
+                numpy.concatenate([x + displacements, x - displacements]))
+        return (vals[:len(x)] - vals[len(x):]) / (2 * step_size)
+
     def noise_bounds(self,
                      cost: float,
                      confidence: Optional[float]=None
@@ -106,5 +145,102 @@ class UnitarySimulateVariationalStatefulBlackBox(
     """A stateful black box encapsulating a variational objective function."""
 
 
+class CompiledUnitarySimulateVariationalBlackBox(VariationalBlackBox):
+    """A black box that simulates a compiled version of the study circuit.
+
+    The preparation circuit followed by the ansatz circuit is analysed once,
+    on the first evaluation, into a CompiledCircuit. Subsequent evaluations
+    only recompute the unitaries of the parameterized gates instead of
+    resolving the parameters of the whole circuit.
+    """
+
+    def __init__(self,
+                 ansatz: VariationalAnsatz,
+                 objective: VariationalObjective,
+                 preparation_circuit: Optional[cirq.Circuit]=None,
+                 initial_state: Union[int, numpy.ndarray]=0,
+                 **kwargs) -> None:
+        self._compiled_circuit = None  # type: Optional[CompiledCircuit]
+        super().__init__(ansatz, objective, preparation_circuit,
+                         initial_state, **kwargs)
+
+    @property
+    def compiled_circuit(self) -> CompiledCircuit:
+        """The compiled preparation circuit followed by the ansatz circuit."""
+        if self._compiled_circuit is None:
+            self._compiled_circuit = CompiledCircuit(
+                    self.preparation_circuit + self.ansatz.circuit,
+                    list(self.ansatz.params()),
+                    qubit_order=self.ansatz.qubit_permutation(
+                        self.ansatz.qubits),
+                    initial_state=self.initial_state)
+        return self._compiled_circuit
+
+    def evaluate_noiseless(self,
+                           x: numpy.ndarray) -> float:
+        """Evaluate parameters with a noiseless simulation."""
+        scale_factors = numpy.fromiter(self.ansatz.param_scale_factors(),
+                                       dtype=float)
+        final_state = self.compiled_circuit.final_state(x * scale_factors)
+        return self.objective.value(final_state)
+
+    def evaluate_noiseless_batch(self,
+                                 xs: numpy.ndarray) -> numpy.ndarray:
+        """Evaluate multiple settings of the parameters without noise.
+
+        The states for all settings are simulated together in one vectorized
+        pass over the compiled circuit.
+        """
+        scale_factors = numpy.fromiter(self.ansatz.param_scale_factors(),
+                                       dtype=float)
+        final_states = self.compiled_circuit.final_states(
+                numpy.asarray(xs) * scale_factors)
+        return numpy.array([self.objective.value(final_state)
+                            for final_state in final_states])
+
+    @property
+    def has_gradient(self) -> bool:
+        """Whether `gradient` returns the exact gradient of the objective.
+
+        This is the case if every parameterized gate of the circuit can be
+        differentiated analytically and evaluations are not noisy.
+        """
+        return (self.cost_of_evaluate is None and
+                self.compiled_circuit.is_differentiable)
+
+    def gradient(self,
+                 x: numpy.ndarray,
+                 step_size: float=1e-5) -> numpy.ndarray:
+        """The gradient of the noiseless objective function.
+
+        If every parameterized gate of the circuit can be differentiated
+        analytically, the exact gradient is computed. Adjoint differentiation
+        is used if the objective provides a `state_gradient`, and
+        parameter-shift rules otherwise. If the circuit can't be
+        differentiated analytically, the gradient is approximated with finite
+        differences of step size `step_size`.
+        """
+        if not self.compiled_circuit.is_differentiable:
+            return super().gradient(x, step_size)
+        scale_factors = numpy.fromiter(self.ansatz.param_scale_factors(),
+                                       dtype=float)
+        values = x * scale_factors
+        gradient = self.compiled_circuit.adjoint_gradient(
+                values, self.objective.state_gradient)
+        if gradient is NotImplemented:
+            gradient = self.compiled_circuit.gradient(
+                    values, self.objective.value)
+        return scale_factors * gradient
+
+
+class CompiledUnitarySimulateVariationalStatefulBlackBox(
+        CompiledUnitarySimulateVariationalBlackBox,
+        StatefulBlackBox):
+    """A stateful black box that simulates a compiled study circuit."""
+
+
 UNITARY_SIMULATE = UnitarySimulateVariationalBlackBox
 UNITARY_SIMULATE_STATEFUL = UnitarySimulateVariationalStatefulBlackBox
+COMPILED_UNITARY_SIMULATE = CompiledUnitarySimulateVariationalBlackBox
+COMPILED_UNITARY_SIMULATE_STATEFUL = (
+        CompiledUnitarySimulateVariationalStatefulBlackBox)
@@ -10,10 +10,20 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import numpy
 import pytest
+import sympy
 
+import cirq
+import openfermion
+
+from openfermioncirq import HamiltonianObjective, prepare_gaussian_state
 from openfermioncirq.testing import ExampleAnsatz, ExampleVariationalObjective
+from openfermioncirq.variational.ansatzes import SwapNetworkTrotterAnsatz
 from openfermioncirq.variational.variational_black_box import (
+        COMPILED_UNITARY_SIMULATE,
+        COMPILED_UNITARY_SIMULATE_STATEFUL,
+        UNITARY_SIMULATE,
         VariationalBlackBox)
 
 
@@ -37,3 +47,134 @@ def test_variational_black_box_is_abstract_can_implement():
 
     assert isinstance(Included(ExampleAnsatz(), ExampleVariationalObjective()),
                       VariationalBlackBox)
+
+
+def test_compiled_unitary_simulate_black_box_matches_uncompiled():
+    numpy.random.seed(18426)
+
+    hubbard_hamiltonian = openfermion.get_diagonal_coulomb_hamiltonian(
+            openfermion.fermi_hubbard(1, 2, 1., 4.))
+    ansatz = SwapNetworkTrotterAnsatz(hubbard_hamiltonian)
+    objective = HamiltonianObjective(hubbard_hamiltonian)
+    preparation_circuit = cirq.Circuit(
+            prepare_gaussian_state(
+                ansatz.qubits,
+                openfermion.QuadraticHamiltonian(hubbard_hamiltonian.one_body),
+                occupied_orbitals=range(2)))
+
+    black_box = UNITARY_SIMULATE(ansatz, objective, preparation_circuit)
+    compiled_black_box = COMPILED_UNITARY_SIMULATE_STATEFUL(
+            ansatz, objective, preparation_circuit)
+    for _ in range(3):
+        x = numpy.random.uniform(-1, 1, black_box.dimension)
+        numpy.testing.assert_allclose(
+                compiled_black_box.evaluate(x), black_box.evaluate(x))
+    assert compiled_black_box.num_evaluations == 3
+
+
+def test_compiled_unitary_simulate_black_box_scale_factors():
+    numpy.random.seed(50193)
+
+    class ScaledAnsatz(ExampleAnsatz):
+        def param_scale_factors(self):
+            yield 0.5
+            yield 3.0
+
+    ansatz = ScaledAnsatz()
+    objective = ExampleVariationalObjective()
+    black_box = UNITARY_SIMULATE(ansatz, objective)
+    compiled_black_box = COMPILED_UNITARY_SIMULATE(ansatz, objective)
+    x = numpy.random.randn(2)
+    numpy.testing.assert_allclose(
+            compiled_black_box.evaluate(x), black_box.evaluate(x))
+
+
+def test_variational_black_box_evaluate_batch():
+    numpy.random.seed(35510)
+
+    hubbard_hamiltonian = openfermion.get_diagonal_coulomb_hamiltonian(
+            openfermion.fermi_hubbard(1, 2, 1., 4.))
+    ansatz = SwapNetworkTrotterAnsatz(hubbard_hamiltonian)
+    objective = HamiltonianObjective(hubbard_hamiltonian)
+
+    black_box = UNITARY_SIMULATE(ansatz, objective, initial_state=0b0101)
+    compiled_black_box = COMPILED_UNITARY_SIMULATE_STATEFUL(
+            ansatz, objective, initial_state=0b0101)
+    xs = numpy.random.uniform(-1, 1, (5, black_box.dimension))
+    expected = [black_box.evaluate(x) for x in xs]
+
+    numpy.testing.assert_allclose(black_box.evaluate_batch(xs), expected)
+    numpy.testing.assert_allclose(
+            compiled_black_box.evaluate_batch(xs), expected)
+    assert compiled_black_box.num_evaluations == 5
+
+    noisy_vals = compiled_black_box.evaluate_with_cost_batch(xs, 1e8)
+    numpy.testing.assert_allclose(noisy_vals, expected, atol=1e-2)
+    assert not numpy.allclose(noisy_vals, expected, atol=1e-8, rtol=0)
+    assert compiled_black_box.num_evaluations == 10
+    assert compiled_black_box.cost_spent == 5e8
+
+
+def test_variational_black_box_gradient():
+    numpy.random.seed(61942)
+
+    hubbard_hamiltonian = openfermion.get_diagonal_coulomb_hamiltonian(
+            openfermion.fermi_hubbard(1, 2, 1., 4.))
+    ansatz = SwapNetworkTrotterAnsatz(hubbard_hamiltonian)
+    objective = HamiltonianObjective(hubbard_hamiltonian)
+
+    black_box = UNITARY_SIMULATE(ansatz, objective, initial_state=0b0101)
+    compiled_black_box = COMPILED_UNITARY_SIMULATE_STATEFUL(
+            ansatz, objective, initial_state=0b0101)
+    assert not black_box.has_gradient
+    assert compiled_black_box.has_gradient
+
+    x = numpy.random.uniform(-1, 1, black_box.dimension)
+    numpy.testing.assert_allclose(
+            compiled_black_box.gradient(x), black_box.gradient(x), atol=1e-5)
+    assert compiled_black_box.num_evaluations == 0
+
+    noisy_black_box = COMPILED_UNITARY_SIMULATE(
+            ansatz, objective, initial_state=0b0101, cost_of_evaluate=1e3)
+    assert not noisy_black_box.has_gradient
+
+
+def test_compiled_black_box_gradient_parameter_shift():
+    numpy.random.seed(39920)
+
+    class NoStateGradientObjective(HamiltonianObjective):
+        def state_gradient(self, state):
+            return NotImplemented
+
+    hubbard_hamiltonian = openfermion.get_diagonal_coulomb_hamiltonian(
+            openfermion.fermi_hubbard(1, 2, 1., 4.))
+    ansatz = SwapNetworkTrotterAnsatz(hubbard_hamiltonian)
+    objective = NoStateGradientObjective(hubbard_hamiltonian)
+    black_box = UNITARY_SIMULATE(ansatz, objective, initial_state=0b0101)
+    compiled_black_box = COMPILED_UNITARY_SIMULATE(
+            ansatz, objective, initial_state=0b0101)
+    assert compiled_black_box.has_gradient
+
+    x = numpy.random.uniform(-1, 1, black_box.dimension)
+    numpy.testing.assert_allclose(
+            compiled_black_box.gradient(x), black_box.gradient(x), atol=1e-5)
+
+
+def test_compiled_black_box_gradient_falls_back_to_finite_differences():
+    numpy.random.seed(80115)
+
+    class SquaredAnsatz(ExampleAnsatz):
+        def operations(self, qubits):
+            a, b = qubits
+            yield cirq.XPowGate(exponent=sympy.Symbol('theta0')**2).on(a)
+            yield cirq.XPowGate(exponent=sympy.Symbol('theta1')).on(b)
+
+    ansatz = SquaredAnsatz()
+    objective = ExampleVariationalObjective()
+    black_box = UNITARY_SIMULATE(ansatz, objective)
+    compiled_black_box = COMPILED_UNITARY_SIMULATE(ansatz, objective)
+    assert not compiled_black_box.has_gradient
+
+    x = numpy.random.randn(2)
+    numpy.testing.assert_allclose(
+            compiled_black_box.gradient(x), black_box.gradient(x), atol=1e-8)